@@ -4,13 +4,16 @@ More reliable data for stock metrics
 """
 import requests
 
+from api_quota import DailyQuota
+
+
+class AlphaVantageAPI(DailyQuota):
+    provider = 'alpha_vantage'
+    max_requests = 500  # Alpha Vantage free tier limit
 
-class AlphaVantageAPI:
     def __init__(self, api_key):
         self.api_key = api_key
         self.base_url = "https://www.alphavantage.co/query"
-        self.requests_today = 0
-        self.max_requests = 500  # Alpha Vantage free tier limit
 
     def get_company_overview(self, ticker):
         """
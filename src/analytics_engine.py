@@ -0,0 +1,240 @@
+"""
+Analytics backends
+The dashboard's aggregates (stats, streaks, hourly, price bands, day of week) can run
+on the in-memory columnar trade store (trade_store.py), or as vectorized columnar SQL
+in DuckDB, either directly against trades.db (through DuckDB's sqlite extension) or
+against a Parquet mirror of the trades table.
+
+Select per deployment with ANALYTICS_ENGINE in config.py or the
+TRADING_ANALYTICS_ENGINE environment variable:
+    'columnar'        - default, NumPy arrays kept in memory and appended on add_trade
+    'pandas'          - pandas frames built from SQLite on every call
+    'duckdb'          - DuckDB attached to the SQLite file
+    'duckdb-parquet'  - DuckDB over a Parquet mirror (needs pyarrow too)
+DuckDB requires: pip install duckdb
+"""
+import os
+import sqlite3
+import threading
+
+ANALYTICS_ENGINES = ('columnar', 'pandas', 'duckdb', 'duckdb-parquet')
+
+WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday')
+
+# (upper bound, label) pairs matching TradingDatabase.get_profits_by_price
+PRICE_BANDS = [
+    (1, 'Sub $1'), (2, '$1'), (3, '$2'), (4, '$3'), (5, '$4'), (6, '$5'), (7, '$6'),
+    (8, '$7'), (9, '$8'), (10, '$9'), (15, '$10-14'), (20, '$15-19'), (None, '$20+'),
+]
+
+
+def get_configured_engine():
+    """Read the analytics engine name from config.py or the environment"""
+    try:
+        from config import ANALYTICS_ENGINE
+    except ImportError:
+        ANALYTICS_ENGINE = None
+    return (ANALYTICS_ENGINE or os.environ.get('TRADING_ANALYTICS_ENGINE') or 'columnar').lower()
+
+
+def create_analytics_backend(db_name, engine=None):
+    """
+    Create the analytics backend for a deployment
+
+    Returns:
+        The process-wide TradeStore for db_name, a DuckDBAnalytics instance, or None
+        for the pandas path (also used as the fallback when duckdb is not installed)
+    """
+    engine = (engine or get_configured_engine()).lower()
+    if engine not in ANALYTICS_ENGINES:
+        print(f"Warning: unknown analytics engine '{engine}', using pandas")
+        return None
+    if engine == 'pandas':
+        return None
+    if engine == 'columnar':
+        from trade_store import get_trade_store
+        return get_trade_store(db_name)
+
+    try:
+        return DuckDBAnalytics(db_name, source='parquet' if engine == 'duckdb-parquet' else 'sqlite')
+    except ImportError:
+        print("Warning: duckdb is not installed (pip install duckdb), using pandas analytics")
+    except Exception as e:
+        print(f"Warning: DuckDB analytics unavailable ({e}), using pandas analytics")
+    return None
+
+
+def sql_string(value):
+    """Escape a value for use inside a single-quoted SQL literal"""
+    return str(value).replace("'", "''")
+
+
+def streak_lengths(flags):
+    """
+    Get (current, best) run lengths of True values
+
+    Args:
+        flags: Iterable of booleans in date order
+
+    Returns:
+        (length of the run ending at the last value, longest run)
+    """
+    current = 0
+    best = 0
+    for flag in flags:
+        current = current + 1 if flag else 0
+        best = max(best, current)
+    return current, best
+
+
+class DuckDBAnalytics:
+    """Dashboard aggregates computed by DuckDB over the trades table"""
+
+    def __init__(self, db_name, source='sqlite', parquet_path=None):
+        import duckdb
+
+        self.db_name = db_name
+        self.source = source
+        self.parquet_path = parquet_path or os.path.splitext(db_name)[0] + '_trades.parquet'
+        self.lock = threading.Lock()
+        self.conn = duckdb.connect(database=':memory:')
+        # Trades version (data_versions) the Parquet mirror was built from
+        self.mirror_version = None
+
+        if source == 'sqlite':
+            self.conn.execute('INSTALL sqlite')
+            self.conn.execute('LOAD sqlite')
+            self.conn.execute(f"ATTACH '{sql_string(db_name)}' AS tdb (TYPE sqlite, READ_ONLY)")
+            self.conn.execute('CREATE VIEW trades AS SELECT * FROM tdb.trades')
+        else:
+            self.refresh_mirror()
+
+    def trades_version(self):
+        conn = self.get_connection()
+        try:
+            row = conn.execute("SELECT version FROM data_versions WHERE name = 'trades'").fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else 0
+
+    def mirror_is_stale(self):
+        """Check whether trades changed since the Parquet mirror was written (writes to other tables do not count)"""
+        return self.mirror_version is None or self.trades_version() != self.mirror_version
+
+    def get_connection(self):
+        """SQLite connection used to rebuild the Parquet mirror"""
+        return sqlite3.connect(self.db_name)
+
+    def refresh_mirror(self):
+        """Rewrite the Parquet mirror from SQLite and point the trades view at it"""
+        from data_export import export_table
+
+        # Read first: a trade written during the export leaves the mirror stale, not marked current
+        version = self.trades_version()
+        temp_path = self.parquet_path + '.tmp'
+        export_table(self, temp_path, 'trades', 'parquet')
+        os.replace(temp_path, self.parquet_path)
+        self.mirror_version = version
+        self.conn.execute(f"CREATE OR REPLACE VIEW trades AS SELECT * FROM read_parquet('{sql_string(self.parquet_path)}')")
+
+    def invalidate(self):
+        """Mark the Parquet mirror stale so the next query rewrites it (nothing is held for the sqlite source)"""
+        with self.lock:
+            self.mirror_version = None
+
+    def query(self, sql, params=None):
+        """Run a query on a per-call cursor and return all rows"""
+        with self.lock:
+            if self.source == 'parquet' and self.mirror_is_stale():
+                self.refresh_mirror()
+            cursor = self.conn.cursor()
+        try:
+            return cursor.execute(sql, params or []).fetchall()
+        finally:
+            cursor.close()
+
+    def get_stats(self):
+        """Same result as TradingDatabase.get_stats, in a single aggregate pass"""
+        row = self.query('''
+                         SELECT COUNT(*),
+                                COUNT(*) FILTER (WHERE is_win = 1),
+                                COUNT(*) FILTER (WHERE is_win = 0),
+                                SUM(profit_loss),
+                                COALESCE(AVG(profit_loss) FILTER (WHERE is_win = 1), 0),
+                                COALESCE(AVG(profit_loss) FILTER (WHERE is_win = 0), 0),
+                                MAX(profit_loss),
+                                MIN(profit_loss)
+                         FROM trades
+                         ''')[0]
+        total, wins, losses, total_profit, avg_win, avg_loss, best, worst = row
+        if total == 0:
+            return None
+
+        return {
+            'total_trades': total,
+            'wins': wins,
+            'losses': losses,
+            'win_rate': (wins / total) * 100,
+            'total_profit': total_profit,
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'best_trade': best,
+            'worst_trade': worst
+        }
+
+    def get_streak(self):
+        """Same result as TradingDatabase.get_streak, from one row per trading day"""
+        rows = self.query('''
+                          SELECT date, SUM(profit_loss) > 0, bool_and(profit_loss > 0)
+                          FROM trades
+                          GROUP BY date
+                          ORDER BY date
+                          ''')
+        net_positive_current, net_positive_best = streak_lengths(row[1] for row in rows)
+        zero_loss_current, zero_loss_best = streak_lengths(row[2] for row in rows)
+
+        return {
+            'net_positive_current': net_positive_current,
+            'net_positive_best': net_positive_best,
+            'zero_loss_current': zero_loss_current,
+            'zero_loss_best': zero_loss_best
+        }
+
+    def get_hourly_performance(self):
+        """Same result as TradingDatabase.get_hourly_performance"""
+        rows = self.query('''
+                          WITH parsed AS (SELECT CAST(split_part(entry_time, ':', 1) AS INTEGER) AS hour,
+                                                 COALESCE(TRY_CAST(split_part(entry_time, ':', 2) AS INTEGER), 0)
+                                                     // 15 * 15                                  AS minute,
+                                                 profit_loss
+                                          FROM trades)
+                          SELECT printf('%02d:%02d', hour, minute), hour * 60 + minute, SUM(profit_loss)
+                          FROM parsed
+                          GROUP BY hour, minute
+                          ORDER BY hour * 60 + minute
+                          ''')
+        return [{'time': label, 'time_value': time_value, 'pnl': pnl} for label, time_value, pnl in rows]
+
+    def get_profits_by_price(self):
+        """Same result as TradingDatabase.get_profits_by_price"""
+        cases = []
+        for order, (upper, label) in enumerate(PRICE_BANDS):
+            condition = f'entry_price < {upper}' if upper is not None else 'TRUE'
+            cases.append(f"WHEN {condition} THEN {order}")
+
+        rows = self.query(f'''
+                          SELECT CASE {' '.join(cases)} END AS band, SUM(profit_loss)
+                          FROM trades
+                          GROUP BY band
+                          ORDER BY band
+                          ''')
+        return [{'price_band': PRICE_BANDS[band][1], 'pnl': pnl} for band, pnl in rows]
+
+    def get_win_rate_by_day(self):
+        """Same result as TradingDatabase.get_win_rate_by_day"""
+        rows = dict((day, (win_rate, trades)) for day, win_rate, trades in self.query('''
+                          SELECT day_of_week, AVG(is_win) * 100, COUNT(*)
+                          FROM trades
+                          GROUP BY day_of_week
+                          '''))
+        return [{'day': day, 'win_rate': rows[day][0], 'trades': rows[day][1]} for day in WEEKDAYS if day in rows]
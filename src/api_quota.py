@@ -0,0 +1,33 @@
+"""
+Daily API request counts
+Callbacks create a new API client for every call, so a per-instance counter always
+starts at 0. DailyQuota keeps requests_today per provider for the whole process instead,
+resetting when the date changes; the clients keep using self.requests_today as before.
+"""
+import threading
+from datetime import date
+
+# provider -> (date, requests made that day)
+daily_requests = {}
+lock = threading.Lock()
+
+
+def requests_today(provider):
+    """Requests made to provider today by this process"""
+    day, count = daily_requests.get(provider, (None, 0))
+    return count if day == date.today() else 0
+
+
+class DailyQuota:
+    """Mixin for API clients: shared daily request counter against max_requests"""
+    provider = None
+    max_requests = None
+
+    @property
+    def requests_today(self):
+        return requests_today(self.provider)
+
+    @requests_today.setter
+    def requests_today(self, value):
+        with lock:
+            daily_requests[self.provider] = (date.today(), value)
@@ -1,5 +1,4 @@
 import sys
-from pickle import FALSE
 
 if sys.version_info >= (3, 12):
     import pkgutil
@@ -7,23 +6,35 @@ if sys.version_info >= (3, 12):
 
     pkgutil.find_loader = lambda name: importlib.util.find_spec(name)
 
+import threading
+import time
+import webbrowser
+import uuid
+
 import dash
 from dash import dcc, html, Input, Output, State, dash_table
-from components import render_hourly_chart, render_calendar, render_settings, render_profits_by_price
 import plotly.graph_objs as go
-import plotly.express as px
 from datetime import datetime
-import sys
-from config import FMP_API_KEY
 import re
 
-# Add src to path if needed
-sys.path.insert(0, 'src')
-
 from database import TradingDatabase
-from components import render_hourly_chart, render_calendar, render_settings
-from components.add_trade_form import render_add_trade_form
-from components.analyze import render_analyze
+from components import render_hourly_chart, render_calendar, render_settings, render_profits_by_price
+from components import render_search_box, render_equity_curve
+from components.query_inspector import render_query_plan, DASHBOARD_QUERIES
+from components.tax_scenarios import render_tax_scenarios
+from components.wash_sales_report import render_wash_sales
+from components.returns_table import render_returns
+from components.metrics_panel import render_metrics_panel
+from components.rolling_chart import render_rolling_metrics
+from components.monte_carlo_panel import render_monte_carlo
+from components.callback_metrics_panel import render_callback_metrics, render_profile_reports
+from callback_metrics import CallbackMetrics
+from callback_profiler import CallbackProfiler, PROFILE_MODES, REPORT_NAME_PATTERN, get_configured_profile_dir
+from callbacks import (register_analyze_callbacks, register_logs_callbacks, register_search_callbacks,
+                       register_performance_callbacks)
+from flask import Response, abort, jsonify, request, send_from_directory
+from prometheus_metrics import CONTENT_TYPE, generate_metrics
+from tax_engine import FILING_STATUS_LABELS
 
 # Import config for API
 try:
@@ -32,15 +43,8 @@ except ImportError:
     FMP_API_KEY = None
     print("Warning: config.py not found or FMP_API_KEY not set")
 
-# Initialize the database
-db = TradingDatabase()
-
-# Initialize the Dash app
-app = dash.Dash(__name__)
-app.title = "Trading Dashboard"
-
-# Add custom CSS
-app.index_string = '''
+# Page template with the custom CSS
+INDEX_STRING = '''
 <!DOCTYPE html>
 <html>
     <head>
@@ -224,66 +228,44 @@ app.index_string = '''
 </html>
 '''
 
-# Define the layout
-app.layout = html.Div([
-    html.Div([
-        html.H1("Road to $100K", style={'color': '#1f2937'}),
-    ], style={'padding': '20px', 'backgroundColor': 'white', 'marginBottom': '20px', 'borderRadius': '8px',
-              'boxShadow': '0 1px 3px rgba(0,0,0,0.1)'}),
-
-    # Store for unread count
-    dcc.Store(id='unread-logs-count', data=0),
-
-    html.Div([
-        dcc.Tabs(id='tabs', value='dashboard', children=[
-            dcc.Tab(label='Dashboard', value='dashboard'),
-            dcc.Tab(label='Add Trade', value='add_trade'),
-            dcc.Tab(label='Analyze', value='analyze'),
-            dcc.Tab(label='Capital', value='capital'),
-            dcc.Tab(label='Tax Calculator', value='taxes'),
-            dcc.Tab(label='Logs', value='logs'),
-            dcc.Tab(label='Maintenance', value='maintenance'),
-            dcc.Tab(label='Settings', value='settings'),
-        ]),
-        # Badge overlay for Logs tab
-        html.Div(id='logs-badge-overlay', style={'position': 'relative'}),
-    ], style={'position': 'relative'}),
-
-    html.Div(id='tab-content', style={'marginTop': '20px', 'border-radius': '25px'}),
-
-    # Hidden div for triggering updates
-    dcc.Interval(id='interval-component', interval=5000, n_intervals=0),
-
-], style={'backgroundColor': '#f9fafb', 'minHeight': '100vh', 'padding': '20px'})
-
-
-# Callback for tab content
-@app.callback(
-    Output('tab-content', 'children'),
-    Input('tabs', 'value')
-)
-def render_tab_content(tab):
-    if tab == 'dashboard':
-        return render_dashboard()
-    elif tab == 'add_trade':
-        return render_add_trade()
-    elif tab == 'analyze':
-        from components.analyze import render_analyze
-        return render_analyze()
-    elif tab == 'capital':
-        return render_capital()
-    elif tab == 'taxes':
-        return render_taxes()
-    elif tab == 'logs':  # ADD THIS
-        from components.logs import render_logs
-        return render_logs(db)
-    elif tab == 'maintenance':
-        return render_maintenance()
-    elif tab == 'settings':
-        return render_settings(db)
-
-
-def render_dashboard():
+def render_layout():
+    """Top-level layout: header, tabs and the tab content area"""
+    return html.Div([
+        html.Div([
+            html.H1("Road to $100K", style={'color': '#1f2937'}),
+        ], style={'padding': '20px', 'backgroundColor': 'white', 'marginBottom': '20px', 'borderRadius': '8px',
+                  'boxShadow': '0 1px 3px rgba(0,0,0,0.1)'}),
+
+        # Store for unread count
+        dcc.Store(id='unread-logs-count', data=0),
+
+        html.Div([
+            dcc.Tabs(id='tabs', value='dashboard', children=[
+                dcc.Tab(label='Dashboard', value='dashboard'),
+                dcc.Tab(label='Add Trade', value='add_trade'),
+                dcc.Tab(label='Analyze', value='analyze'),
+                dcc.Tab(label='Capital', value='capital'),
+                dcc.Tab(label='Tax Calculator', value='taxes'),
+                dcc.Tab(label='Logs', value='logs'),
+                dcc.Tab(label='Maintenance', value='maintenance'),
+                dcc.Tab(label='Settings', value='settings'),
+            ]),
+            # Badge overlay for Logs tab
+            html.Div(id='logs-badge-overlay', style={'position': 'relative'}),
+        ], style={'position': 'relative'}),
+
+        html.Div(id='tab-content', style={'marginTop': '20px', 'border-radius': '25px'}),
+
+        # Hidden div for triggering updates
+        dcc.Interval(id='interval-component', interval=5000, n_intervals=0),
+
+    ], style={'backgroundColor': '#f9fafb', 'minHeight': '100vh', 'padding': '20px'})
+
+
+RECENT_TRADES_SHOWN = 50
+
+
+def render_dashboard(db):
     stats = db.get_stats()
     streak_data = db.get_streak()
 
@@ -295,7 +277,8 @@ def render_dashboard():
             ], style={'padding': '60px', 'backgroundColor': 'white', 'borderRadius': '8px', 'marginTop': '20px'})
         ])
 
-    df = db.get_all_trades()
+    df = db.get_trades(['date', 'ticker', 'entry_price', 'exit_price', 'hold_duration', 'profit_loss',
+                        'profit_loss_percent', 'is_win'], limit=RECENT_TRADES_SHOWN)
 
     # Capital card
     capital = db.get_current_capital()
@@ -316,6 +299,15 @@ def render_dashboard():
 
     zero_loss_color = get_streak_color(streak_data['zero_loss_current'])
 
+    # Bootstrap confidence intervals for the headline stats
+    intervals = db.get_bootstrap_intervals()
+
+    def ci_text(stat, fmt):
+        low, high = intervals['stats'][stat] if intervals else (None, None)
+        if low is None:
+            return None
+        return f"{intervals['confidence']}% CI: {fmt.format(low)} to {fmt.format(high)}"
+
     # Stats cards
     stats_cards = html.Div([
 
@@ -344,6 +336,8 @@ def render_dashboard():
             html.H2(f"{stats['win_rate']:.1f}%", style={'color': '#3b82f6', 'margin': '0'}),
             html.P(f"{stats['wins']}W / {stats['losses']}L",
                    style={'fontSize': '12px', 'color': '#9ca3af', 'marginTop': '4px'}),
+            html.P(ci_text('win_rate', '{:.1f}%'),
+                   style={'fontSize': '11px', 'color': '#9ca3af', 'margin': '0'}),
         ], style={'padding': '20px', 'backgroundColor': 'white', 'borderRadius': '8px',
                   'boxShadow': '0 1px 3px rgba(0,0,0,0.1)', 'width': '10vw', 'height': '9vh',
                   'display': 'flex', 'flexDirection': 'column', 'justifyContent': 'center'}),
@@ -368,8 +362,10 @@ def render_dashboard():
 
         html.Div([
             html.P("Avg Win / Loss", style={'fontSize': '14px', 'color': '#6b7280', 'marginBottom': '8px'}),
-            html.H3(f"${stats['avg_win']:.2f}", style={'color': '#10b981', 'margin': '5px 0', 'fontSize': '20px'}),
-            html.H3(f"${stats['avg_loss']:.2f}", style={'color': '#ef4444', 'margin': '5px 0', 'fontSize': '20px'}),
+            html.H3(f"${stats['avg_win']:.2f}", title=ci_text('avg_win', '${:,.2f}'),
+                    style={'color': '#10b981', 'margin': '5px 0', 'fontSize': '20px'}),
+            html.H3(f"${stats['avg_loss']:.2f}", title=ci_text('avg_loss', '${:,.2f}'),
+                    style={'color': '#ef4444', 'margin': '5px 0', 'fontSize': '20px'}),
         ], style={'padding': '20px', 'backgroundColor': 'white', 'borderRadius': '8px',
                   'boxShadow': '0 1px 3px rgba(0,0,0,0.1)', 'width': '10vw', 'height': '9vh',
                   'display': 'flex', 'flexDirection': 'column', 'justifyContent': 'center'}),
@@ -392,18 +388,12 @@ def render_dashboard():
     hourly_chart = render_hourly_chart(db)
 
     # Win rate by day
-    win_rate_by_day = df.groupby('day_of_week').agg({
-        'is_win': 'mean',
-        'id': 'count'
-    }).reset_index()
-    win_rate_by_day['win_rate'] = win_rate_by_day['is_win'] * 100
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']
-    win_rate_by_day = win_rate_by_day[win_rate_by_day['day_of_week'].isin(day_order)]
+    win_rate_by_day = db.get_win_rate_by_day()
 
     day_chart = dcc.Graph(
         figure=go.Figure(
-            data=[go.Bar(x=win_rate_by_day['day_of_week'],
-                         y=win_rate_by_day['win_rate'],
+            data=[go.Bar(x=[d['day'] for d in win_rate_by_day],
+                         y=[d['win_rate'] for d in win_rate_by_day],
                          marker_color='#10b981')],
             layout=go.Layout(title='Win Rate by Day', xaxis_title='Day', yaxis_title='Win Rate (%)',
                              template='plotly_white')
@@ -428,7 +418,7 @@ def render_dashboard():
 
         # Table body
         rows = []
-        for _, trade in df.sort_values('date', ascending=False).iterrows():
+        for _, trade in df.iterrows():
             row_class = 'win-row' if trade['is_win'] == 1 else 'loss-row'
 
             row = html.Tr([
@@ -468,6 +458,8 @@ def render_dashboard():
 
     return html.Div([
         stats_cards,
+        render_metrics_panel(db.get_trade_metrics(), intervals),
+        render_search_box(),
         html.Div([
             # Calendar - 50% width
             html.Div([calendar_component],
@@ -482,6 +474,9 @@ def render_dashboard():
             html.Div([render_profits_by_price(db)],
                      style={'width': '24.5%', 'display': 'inline-block', 'verticalAlign': 'top'}),
         ], style={'marginBottom': '20px'}),
+        render_equity_curve(db),
+        render_monte_carlo(db.get_monte_carlo()),
+        render_rolling_metrics(db.get_rolling_metrics()),
         trade_table_section
     ])
 
@@ -491,54 +486,38 @@ def render_add_trade():
     return render_add_trade_form()
 
 
-@app.callback(
-    Output('save-trade-output', 'children'),
-    Input('save-trade-btn', 'n_clicks'),
-    State('trade-date', 'value'),
-    State('trade-ticker', 'value'),
-    State('trade-sector', 'value'),
-    State('trade-news', 'value'),
-    State('trade-entry-price', 'value'),
-    State('trade-entry-time', 'value'),
-    State('trade-exit-price', 'value'),
-    State('trade-exit-time', 'value'),
-    State('trade-shares', 'value'),
-    State('trade-notes', 'value'),
-    prevent_initial_call=True
-)
-def save_trade(n_clicks, date, ticker, sector, news, entry_price, entry_time, exit_price, exit_time, shares, notes):
-    if not all([ticker, entry_price, entry_time, exit_price, exit_time, shares]):
-        return "Please fill all required fields"
-
-    trade_data = {
-        'date': date,
-        'ticker': ticker.upper(),
-        'sector': sector,
-        'news_type': news,
-        'entry_price': entry_price,
-        'entry_time': entry_time,
-        'exit_price': exit_price,
-        'exit_time': exit_time,
-        'shares': shares,
-        'notes': notes or ''
-    }
-
-    db.add_trade(trade_data)
-
-    # ADD LOG
-    profit_loss = (float(exit_price) - float(entry_price)) * int(shares)
-    db.add_log(
-        action_type='ADD_TRADE',
-        action_category='TRADE',
-        description=f'Added trade: {ticker.upper()} - ${profit_loss:.2f} P/L',
-        details=f'Entry: ${entry_price}, Exit: ${exit_price}, Shares: {shares}, Date: {date}'
-    )
+WASH_SALES_SHOWN = 20
 
-    return f"✓ Trade saved successfully! ({ticker})"
 
+def render_taxes(db):
+    years = db.get_tax_years()
 
-def render_taxes():
-    tax_data = db.calculate_taxes_simple()
+    return html.Div([
+        html.Div([
+            html.Label("Tax Year", style={'fontSize': '14px', 'fontWeight': '500', 'marginRight': '10px'}),
+            dcc.Dropdown(
+                id='tax-year-select',
+                options=[{'label': str(year), 'value': year} for year in years],
+                value=years[0],
+                clearable=False,
+                style={'width': '140px'}
+            ),
+        ], style={'display': 'flex', 'alignItems': 'center', 'justifyContent': 'flex-end',
+                  'marginBottom': '20px'}),
+        html.Div(render_tax_year(db, years[0]), id='tax-year-content'),
+    ], style={'maxWidth': '1000px', 'margin': '0 auto'})
+
+
+def render_tax_year(db, year):
+    return render_tax_report(db.calculate_taxes_simple(year), db.get_tax_scenarios(year),
+                             db.get_wash_sales(year, limit=WASH_SALES_SHOWN))
+
+
+def render_tax_report(tax_data, scenarios, wash_sales):
+    if tax_data['next_deadline']:
+        next_payment_text = f"Next due: {tax_data['next_deadline']['deadline']} (Q{tax_data['current_quarter']})"
+    else:
+        next_payment_text = f"Tax year {tax_data['year']}"
 
     return html.Div([
         # Big tax owed number
@@ -646,7 +625,7 @@ def render_taxes():
                 html.Span("📅 ", style={'fontSize': '28px', 'marginRight': '15px'}),
                 html.Div([
                     html.H3("Quarterly Estimated Payment", style={'margin': '0 0 5px 0', 'fontSize': '18px'}),
-                    html.P(f"Next due: {tax_data['next_deadline']['deadline']} (Q{tax_data['current_quarter']})",
+                    html.P(next_payment_text,
                            style={'margin': '0', 'fontSize': '14px', 'color': '#6b7280'}),
                 ]),
             ], style={'display': 'flex', 'alignItems': 'center', 'flex': '1'}),
@@ -660,7 +639,7 @@ def render_taxes():
 
         # Payment schedule
         html.Div([
-            html.H3("2025 Quarterly Payment Schedule", style={'marginBottom': '20px'}),
+            html.H3(f"{tax_data['year']} Quarterly Payment Schedule", style={'marginBottom': '20px'}),
             html.Div([
                 html.Div([
                     html.Div([
@@ -672,6 +651,9 @@ def render_taxes():
                         html.P(q['deadline'], style={'margin': '0 0 12px 0', 'fontSize': '14px', 'fontWeight': '500'}),
                         html.P(f"${tax_data['quarterly_estimate']:,.2f}",
                                style={'margin': '0', 'fontSize': '20px', 'fontWeight': '700', 'color': '#1f2937'}),
+                        html.P(f"Period net: ${q['net']:,.2f}",
+                               style={'margin': '8px 0 0 0', 'fontSize': '12px',
+                                      'color': '#10b981' if q['net'] >= 0 else '#ef4444'}),
                     ], style={'padding': '20px', 'textAlign': 'center', 'borderRadius': '8px',
                               'backgroundColor': '#fef3c7' if q['quarter'] == tax_data[
                                   'current_quarter'] else '#f9fafb',
@@ -682,13 +664,21 @@ def render_taxes():
         ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px',
                   'marginBottom': '20px'}),
 
+        # Disallowed losses
+        render_wash_sales(tax_data, wash_sales),
+
+        # What-if sensitivity tables
+        render_tax_scenarios(scenarios),
+
         # Simple note
         html.Div([
             html.H3("💡 How This Works", style={'marginBottom': '15px', 'color': '#1f2937'}),
             html.Ul([
                 html.Li("This calculates taxes ONLY on your trading profits",
                         style={'marginBottom': '8px', 'color': '#4b5563'}),
-                html.Li("Rate used: 24% Federal + 5.49% Georgia = 29.49% total",
+                html.Li(f"Rates: {tax_data['federal_rate']:.1f}% Federal + {tax_data['ga_rate']:.2f}% Georgia, "
+                        f"from the {FILING_STATUS_LABELS[tax_data['filing_status']]} brackets on top of "
+                        f"${tax_data['w2_income']:,.0f} W-2 income",
                         style={'marginBottom': '8px', 'color': '#4b5563'}),
                 html.Li("Make quarterly payments to avoid penalties",
                         style={'marginBottom': '8px', 'color': '#4b5563'}),
@@ -700,7 +690,7 @@ def render_taxes():
         ], style={'backgroundColor': '#f0f9ff', 'padding': '25px', 'borderRadius': '8px',
                   'border': '1px solid #bfdbfe'}),
 
-    ], style={'maxWidth': '1000px', 'margin': '0 auto'})
+    ])
 
 
 # --- Function to open the browser ---
@@ -711,7 +701,7 @@ def open_browser():
     webbrowser.open_new_tab('http://127.0.0.1:8050/')
 
 
-def render_capital():
+def render_capital(db):
     capital = db.get_current_capital()
     transactions = db.get_capital_transactions()
 
@@ -737,6 +727,9 @@ def render_capital():
             ], style={'marginTop': '20px', 'paddingTop': '20px', 'borderTop': '1px solid #e5e7eb'}),
         ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px', 'marginBottom': '20px'}),
 
+        # Returns net of deposits and withdrawals
+        render_returns(db.get_returns()),
+
         # Deposit form
         html.Div([
             html.H3("Add Deposit", style={'marginBottom': '20px', 'color': '#10b981'}),
@@ -820,57 +813,7 @@ def render_capital():
     ])
 
 
-@app.callback(
-    Output('deposit-output', 'children'),
-    Input('add-deposit-btn', 'n_clicks'),
-    State('deposit-date', 'value'),
-    State('deposit-amount', 'value'),
-    State('deposit-notes', 'value'),
-    prevent_initial_call=True
-)
-def add_deposit(n_clicks, date, amount, notes):
-    if not amount or float(amount) <= 0:
-        return "Please enter a valid amount"
-
-    db.add_capital_transaction(date, 'deposit', float(amount), notes or '')
-
-    # ADD LOG
-    db.add_log(
-        action_type='ADD_DEPOSIT',
-        action_category='CAPITAL',
-        description=f'Deposit added: ${float(amount):.2f}',
-        details=f'Date: {date}, Notes: {notes or "None"}'
-    )
-
-    return f"✓ Deposit of ${float(amount):.2f} added successfully!"
-
-
-@app.callback(
-    Output('withdrawal-output', 'children'),
-    Input('add-withdrawal-btn', 'n_clicks'),
-    State('withdrawal-date', 'value'),
-    State('withdrawal-amount', 'value'),
-    State('withdrawal-notes', 'value'),
-    prevent_initial_call=True
-)
-def add_withdrawal(n_clicks, date, amount, notes):
-    if not amount or float(amount) <= 0:
-        return "Please enter a valid amount"
-
-    db.add_capital_transaction(date, 'withdrawal', float(amount), notes or '')
-
-    # ADD LOG
-    db.add_log(
-        action_type='ADD_WITHDRAWAL',
-        action_category='CAPITAL',
-        description=f'Withdrawal added: ${float(amount):.2f}',
-        details=f'Date: {date}, Notes: {notes or "None"}'
-    )
-
-    return f"✓ Withdrawal of ${float(amount):.2f} added successfully!"
-
-
-def render_maintenance():
+def render_maintenance(db, callback_metrics):
     return html.Div([
         html.Div([
             html.H2("Database Maintenance", style={'marginBottom': '10px', 'color': '#ef4444'}),
@@ -899,6 +842,14 @@ def render_maintenance():
                                        'backgroundColor': '#10b981', 'color': 'white', 'border': 'none',
                                        'borderRadius': '6px', 'cursor': 'pointer', 'fontSize': '13px'}),
                 ]),
+                html.P("Dashboard queries (load one, then click Explain to check index usage):",
+                       style={'fontSize': '13px', 'color': '#6b7280', 'margin': '5px 0 8px 0'}),
+                dcc.Dropdown(
+                    id='dashboard-query-select',
+                    options=[{'label': name, 'value': name} for name in DASHBOARD_QUERIES],
+                    placeholder='Select a dashboard query',
+                    style={'maxWidth': '400px'}
+                ),
             ], style={'marginBottom': '25px', 'padding': '15px', 'backgroundColor': '#f9fafb',
                       'borderRadius': '6px', 'border': '1px solid #e5e7eb'}),
 
@@ -913,501 +864,820 @@ def render_maintenance():
                            'border': '1px solid #d1d5db', 'borderRadius': '6px',
                            'marginBottom': '15px'}
                 ),
+                html.Div([
+                    html.Label("Row limit:", style={'fontSize': '13px', 'color': '#6b7280', 'marginRight': '8px'}),
+                    dcc.Input(id='query-row-limit', type='number', min=1, max=db.QUERY_MAX_ROWS_LIMIT, step=1,
+                              value=db.QUERY_MAX_ROWS,
+                              style={'width': '90px', 'padding': '6px', 'border': '1px solid #d1d5db',
+                                     'borderRadius': '6px', 'marginRight': '15px'}),
+                    html.Span(f"Queries are stopped after {db.QUERY_TIMEOUT_SECONDS}s. "
+                              "SELECT / WITH / EXPLAIN run on a read-only connection.",
+                              style={'fontSize': '12px', 'color': '#9ca3af'}),
+                ], style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '15px'}),
                 html.Div([
                     html.Button('Execute Query', id='execute-query-btn', n_clicks=0,
                                 style={'backgroundColor': '#ef4444', 'color': 'white', 'padding': '10px 20px',
                                        'border': 'none', 'borderRadius': '6px', 'cursor': 'pointer',
                                        'fontSize': '14px', 'fontWeight': '500', 'marginRight': '10px'}),
+                    html.Button('Explain', id='explain-query-btn', n_clicks=0,
+                                style={'backgroundColor': '#3b82f6', 'color': 'white', 'padding': '10px 20px',
+                                       'border': 'none', 'borderRadius': '6px', 'cursor': 'pointer',
+                                       'fontSize': '14px', 'fontWeight': '500', 'marginRight': '10px'}),
+                    html.Button('Cancel', id='cancel-query-btn', n_clicks=0,
+                                style={'backgroundColor': '#f59e0b', 'color': 'white', 'padding': '10px 20px',
+                                       'border': 'none', 'borderRadius': '6px', 'cursor': 'pointer',
+                                       'fontSize': '14px', 'marginRight': '10px'}),
                     html.Button('Clear', id='clear-query-btn', n_clicks=0,
                                 style={'backgroundColor': '#6b7280', 'color': 'white', 'padding': '10px 20px',
                                        'border': 'none', 'borderRadius': '6px', 'cursor': 'pointer',
                                        'fontSize': '14px'}),
+                    html.Span(id='cancel-query-status', style={'marginLeft': '15px', 'fontSize': '13px',
+                                                               'color': '#f59e0b'}),
                 ]),
             ], style={'marginBottom': '20px'}),
 
+            # Current page of the last read query, and the id the Cancel button interrupts this console's query by
+            dcc.Store(id='query-page', data=0),
+            dcc.Store(id='query-console-id', data=uuid.uuid4().hex),
+            html.Div([
+                html.Button('◀ Prev', id='query-prev-btn', n_clicks=0,
+                            style={'padding': '6px 14px', 'border': '1px solid #d1d5db', 'borderRadius': '6px',
+                                   'backgroundColor': 'white', 'cursor': 'pointer', 'marginRight': '8px'}),
+                html.Button('Next ▶', id='query-next-btn', n_clicks=0,
+                            style={'padding': '6px 14px', 'border': '1px solid #d1d5db', 'borderRadius': '6px',
+                                   'backgroundColor': 'white', 'cursor': 'pointer'}),
+            ], style={'marginBottom': '10px'}),
+
             html.Div(id='query-output', style={'marginTop': '20px'}),
 
-        ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px', 'maxWidth': '900px'})
+        ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px', 'maxWidth': '900px'}),
+
+        html.Div([
+            html.Div([
+                html.H3("Callback Performance", style={'margin': '0', 'fontSize': '16px', 'flex': '1'}),
+                html.Button('Refresh', id='refresh-callback-metrics-btn', n_clicks=0,
+                            style={'padding': '6px 14px', 'border': '1px solid #d1d5db', 'borderRadius': '6px',
+                                   'backgroundColor': 'white', 'cursor': 'pointer', 'marginRight': '8px'}),
+                html.Button('Reset', id='reset-callback-metrics-btn', n_clicks=0,
+                            style={'padding': '6px 14px', 'border': 'none', 'borderRadius': '6px',
+                                   'backgroundColor': '#6b7280', 'color': 'white', 'cursor': 'pointer'}),
+            ], style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '10px'}),
+            html.Div(render_callback_metrics(callback_metrics.summaries(), callback_metrics.started,
+                                             callback_metrics.persist),
+                     id='callback-metrics-panel'),
+        ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px', 'marginTop': '20px'}),
+
+        html.Div([
+            html.H3("Callback Profiles", style={'margin': '0 0 10px 0', 'fontSize': '16px'}),
+            html.Div(render_profile_reports(callback_metrics.profiler.list_reports(),
+                                            callback_metrics.profiler.status()),
+                     id='profile-reports-panel'),
+        ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px', 'marginTop': '20px'}),
     ])
 
 
-@app.callback(
-    Output('query-output', 'children', allow_duplicate=True),
-    Input('fetch-stock-data-btn', 'n_clicks'),
-    prevent_initial_call=True
-)
-def fetch_stock_data_callback(n_clicks):
-    # Run the fetch function
-    # This is a simplified version - the full version is in fetch_stock_data.py
+# Callback for query execution
+
+def render_query_result(result):
+    """Render the status line and result rows of a console query"""
+    if not result['success']:
+        return html.Div([
+            html.P(f"✗ {result['message']}",
+                   style={'color': '#ef4444', 'padding': '15px', 'backgroundColor': '#fee2e2',
+                          'borderRadius': '6px', 'fontFamily': 'monospace', 'fontSize': '13px'})
+        ])
+
+    stats = (f"Elapsed: {result['elapsed_ms']:,.1f} ms · Rows read: {result['rows_read']:,}"
+             f" · VM steps (≈): {result['vm_steps']:,}")
+    status = html.Div([
+        html.P(f"✓ {result['message']}", style={'margin': '0 0 4px 0', 'fontWeight': '500'}),
+        html.P(stats, style={'margin': '0', 'fontSize': '12px', 'color': '#6b7280'}),
+    ], style={'color': '#10b981', 'padding': '15px', 'backgroundColor': '#d1fae5', 'borderRadius': '6px',
+              'marginBottom': '15px'})
+
+    if result['type'] != 'select':
+        return html.Div([status])
+
+    # Column ids are positional because joins can return duplicate column names
+    columns = [{'name': name, 'id': f'c{i}'} for i, name in enumerate(result['columns'])]
+    data = [
+        {f'c{i}': value if not isinstance(value, bytes) else f'<{len(value)} bytes>' for i, value in enumerate(row)}
+        for row in result['rows']
+    ]
+
     return html.Div([
-        html.P("Stock data fetching started! Check terminal for progress.",
-               style={'color': '#10b981', 'padding': '15px', 'backgroundColor': '#d1fae5', 'borderRadius': '6px'})
+        status,
+        dash_table.DataTable(
+            data=data,
+            columns=columns,
+            page_action='none',
+            style_table={'overflowX': 'auto', 'maxHeight': '500px', 'overflowY': 'auto'},
+            style_cell={'textAlign': 'left', 'padding': '8px', 'fontSize': '12px', 'fontFamily': 'monospace'},
+            style_header={'backgroundColor': '#f3f4f6', 'fontWeight': 'bold'},
+        ) if data else html.P("No rows returned", style={'color': '#9ca3af'})
     ])
 
 
-# Callback for quick action buttons
-@app.callback(
-    Output('sql-query-input', 'value'),
-    Input('quick-view-trades', 'n_clicks'),
-    Input('quick-view-capital', 'n_clicks'),
-    Input('quick-count', 'n_clicks'),
-    Input('clear-query-btn', 'n_clicks'),
-    prevent_initial_call=True
-)
-def set_quick_query(view_trades, view_capital, count, clear):
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        return ''
+# Call backs for Validation
+
+# ==================== VALIDATION CALLBACKS ====================
+
+
+# ==================== API FETCH CALLBACK ====================
+
+
+def register_app_callbacks(app, db, callback_metrics):
+    """Register the callbacks for the tabs defined in this module, serving db"""
+
+    # Callback for tab content
+    @app.callback(
+        Output('tab-content', 'children'),
+        Input('tabs', 'value')
+    )
+    def render_tab_content(tab):
+        if tab == 'dashboard':
+            return render_dashboard(db)
+        elif tab == 'add_trade':
+            return render_add_trade()
+        elif tab == 'analyze':
+            from components.analyze import render_analyze
+            return render_analyze()
+        elif tab == 'capital':
+            return render_capital(db)
+        elif tab == 'taxes':
+            return render_taxes(db)
+        elif tab == 'logs':  # ADD THIS
+            from components.logs import render_logs
+            return render_logs(db)
+        elif tab == 'maintenance':
+            return render_maintenance(db, callback_metrics)
+        elif tab == 'settings':
+            return render_settings(db, callback_metrics.names)
+
+    @app.callback(
+        Output('save-trade-output', 'children'),
+        Input('save-trade-btn', 'n_clicks'),
+        State('trade-date', 'value'),
+        State('trade-ticker', 'value'),
+        State('trade-sector', 'value'),
+        State('trade-news', 'value'),
+        State('trade-entry-price', 'value'),
+        State('trade-entry-time', 'value'),
+        State('trade-exit-price', 'value'),
+        State('trade-exit-time', 'value'),
+        State('trade-shares', 'value'),
+        State('trade-notes', 'value'),
+        prevent_initial_call=True
+    )
+    def save_trade(n_clicks, date, ticker, sector, news, entry_price, entry_time, exit_price, exit_time, shares, notes):
+        if not all([ticker, entry_price, entry_time, exit_price, exit_time, shares]):
+            return "Please fill all required fields"
+
+        trade_data = {
+            'date': date,
+            'ticker': ticker.upper(),
+            'sector': sector,
+            'news_type': news,
+            'entry_price': entry_price,
+            'entry_time': entry_time,
+            'exit_price': exit_price,
+            'exit_time': exit_time,
+            'shares': shares,
+            'notes': notes or ''
+        }
+
+        db.add_trade(trade_data)
+
+        # ADD LOG
+        profit_loss = (float(exit_price) - float(entry_price)) * int(shares)
+        db.add_log(
+            action_type='ADD_TRADE',
+            action_category='TRADE',
+            description=f'Added trade: {ticker.upper()} - ${profit_loss:.2f} P/L',
+            details=f'Entry: ${entry_price}, Exit: ${exit_price}, Shares: {shares}, Date: {date}'
+        )
+
+        return f"✓ Trade saved successfully! ({ticker})"
+
+    @app.callback(
+        Output('tax-year-content', 'children'),
+        Input('tax-year-select', 'value'),
+        prevent_initial_call=True
+    )
+    def update_tax_year(year):
+        return render_tax_year(db, year)
+
+    @app.callback(
+        Output('deposit-output', 'children'),
+        Input('add-deposit-btn', 'n_clicks'),
+        State('deposit-date', 'value'),
+        State('deposit-amount', 'value'),
+        State('deposit-notes', 'value'),
+        prevent_initial_call=True
+    )
+    def add_deposit(n_clicks, date, amount, notes):
+        if not amount or float(amount) <= 0:
+            return "Please enter a valid amount"
+
+        db.add_capital_transaction(date, 'deposit', float(amount), notes or '')
+
+        # ADD LOG
+        db.add_log(
+            action_type='ADD_DEPOSIT',
+            action_category='CAPITAL',
+            description=f'Deposit added: ${float(amount):.2f}',
+            details=f'Date: {date}, Notes: {notes or "None"}'
+        )
+
+        return f"✓ Deposit of ${float(amount):.2f} added successfully!"
+
+    @app.callback(
+        Output('withdrawal-output', 'children'),
+        Input('add-withdrawal-btn', 'n_clicks'),
+        State('withdrawal-date', 'value'),
+        State('withdrawal-amount', 'value'),
+        State('withdrawal-notes', 'value'),
+        prevent_initial_call=True
+    )
+    def add_withdrawal(n_clicks, date, amount, notes):
+        if not amount or float(amount) <= 0:
+            return "Please enter a valid amount"
+
+        db.add_capital_transaction(date, 'withdrawal', float(amount), notes or '')
+
+        # ADD LOG
+        db.add_log(
+            action_type='ADD_WITHDRAWAL',
+            action_category='CAPITAL',
+            description=f'Withdrawal added: ${float(amount):.2f}',
+            details=f'Date: {date}, Notes: {notes or "None"}'
+        )
+
+        return f"✓ Withdrawal of ${float(amount):.2f} added successfully!"
+
+    @app.callback(
+        Output('query-output', 'children', allow_duplicate=True),
+        Input('fetch-stock-data-btn', 'n_clicks'),
+        prevent_initial_call=True
+    )
+    def fetch_stock_data_callback(n_clicks):
+        # Run the fetch function
+        # This is a simplified version - the full version is in fetch_stock_data.py
+        return html.Div([
+            html.P("Stock data fetching started! Check terminal for progress.",
+                   style={'color': '#10b981', 'padding': '15px', 'backgroundColor': '#d1fae5', 'borderRadius': '6px'})
+        ])
 
-    button_id = ctx.triggered[0]['prop_id'].split('.')[0]
+    # Callback for quick action buttons
+    @app.callback(
+        Output('sql-query-input', 'value'),
+        Input('quick-view-trades', 'n_clicks'),
+        Input('quick-view-capital', 'n_clicks'),
+        Input('quick-count', 'n_clicks'),
+        Input('clear-query-btn', 'n_clicks'),
+        Input('dashboard-query-select', 'value'),
+        prevent_initial_call=True
+    )
+    def set_quick_query(view_trades, view_capital, count, clear, dashboard_query):
+        ctx = dash.callback_context
+        if not ctx.triggered:
+            return ''
+
+        button_id = ctx.triggered[0]['prop_id'].split('.')[0]
+
+        if button_id == 'quick-view-trades':
+            return 'SELECT * FROM trades ORDER BY date DESC LIMIT 20;'
+        elif button_id == 'quick-view-capital':
+            return 'SELECT * FROM capital_transactions ORDER BY date DESC;'
+        elif button_id == 'quick-count':
+            return 'SELECT COUNT(*) as total_trades FROM trades;'
+        elif button_id == 'clear-query-btn':
+            return ''
+        elif button_id == 'dashboard-query-select' and dashboard_query:
+            return DASHBOARD_QUERIES[dashboard_query]
 
-    if button_id == 'quick-view-trades':
-        return 'SELECT * FROM trades ORDER BY date DESC LIMIT 20;'
-    elif button_id == 'quick-view-capital':
-        return 'SELECT * FROM capital_transactions ORDER BY date DESC;'
-    elif button_id == 'quick-count':
-        return 'SELECT COUNT(*) as total_trades FROM trades;'
-    elif button_id == 'clear-query-btn':
         return ''
 
-    return ''
+    @app.callback(
+        [Output('query-output', 'children'),
+         Output('query-page', 'data')],
+        [Input('execute-query-btn', 'n_clicks'),
+         Input('query-prev-btn', 'n_clicks'),
+         Input('query-next-btn', 'n_clicks')],
+        [State('sql-query-input', 'value'),
+         State('query-row-limit', 'value'),
+         State('query-page', 'data'),
+         State('query-console-id', 'data')],
+        prevent_initial_call=True
+    )
+    def execute_sql_query(n_clicks, prev_clicks, next_clicks, query, row_limit, page, console_id):
+        if not query or not query.strip():
+            return html.Div([
+                html.P("⚠️ Please enter a query", style={'color': '#f59e0b', 'padding': '15px',
+                                                         'backgroundColor': '#fef3c7', 'borderRadius': '6px'})
+            ]), 0
+
+        button_id = dash.callback_context.triggered[0]['prop_id'].split('.')[0]
+        paging = button_id in ('query-prev-btn', 'query-next-btn')
+
+        if paging:
+            # Never re-run a write just to turn a page
+            if not db.is_read_query(query):
+                return dash.no_update, dash.no_update
+            page = max((page or 0) + (1 if button_id == 'query-next-btn' else -1), 0)
+        else:
+            page = 0
+
+        result = db.execute_query(query, max_rows=row_limit, page=page, query_id=console_id)
+
+        # ADD LOG
+        if result['success'] and not paging:
+            db.add_log(
+                action_type='SQL_QUERY',
+                action_category='DATABASE',
+                description=f'SQL query executed: {result["type"]}',
+                details=f'Query: {query[:100]}... | Rows affected/returned: {result.get("rows_affected", len(result.get("rows", [])))}'
+                        f' | {result["elapsed_ms"]:.1f} ms'
+            )
 
+        return render_query_result(result), page
 
-# Callback for query execution
+    @app.callback(
+        Output('query-output', 'children', allow_duplicate=True),
+        Input('explain-query-btn', 'n_clicks'),
+        State('sql-query-input', 'value'),
+        State('query-row-limit', 'value'),
+        State('query-console-id', 'data'),
+        prevent_initial_call=True
+    )
+    def explain_sql_query(n_clicks, query, row_limit, console_id):
+        if not query or not query.strip():
+            return html.Div([
+                html.P("⚠️ Please enter a query", style={'color': '#f59e0b', 'padding': '15px',
+                                                         'backgroundColor': '#fef3c7', 'borderRadius': '6px'})
+            ])
+
+        plan_result = db.explain_query(query)
+
+        # Time the query too, but only when running it cannot change data
+        run_result = None
+        if plan_result['success'] and db.is_read_query(query):
+            run_result = db.execute_query(query, max_rows=row_limit, query_id=console_id)
+
+        return render_query_plan(plan_result, run_result)
+
+    @app.callback(
+        Output('cancel-query-status', 'children'),
+        Input('cancel-query-btn', 'n_clicks'),
+        State('query-console-id', 'data'),
+        prevent_initial_call=True
+    )
+    def cancel_sql_query(n_clicks, console_id):
+        return "Cancel requested" if db.cancel_query(console_id) else "No query running"
+
+    # Update color hex displays
+    @app.callback(
+        [Output('color-profit-primary-hex', 'children'),
+         Output('color-profit-secondary-hex', 'children'),
+         Output('color-loss-primary-hex', 'children'),
+         Output('color-loss-secondary-hex', 'children'),
+         Output('color-accent-primary-hex', 'children')],
+        [Input('color-profit-primary', 'value'),
+         Input('color-profit-secondary', 'value'),
+         Input('color-loss-primary', 'value'),
+         Input('color-loss-secondary', 'value'),
+         Input('color-accent-primary', 'value')]
+    )
+    def update_hex_displays(c1, c2, c3, c4, c5):
+        return c1, c2, c3, c4, c5
+
+    # Save settings
+    @app.callback(
+        Output('settings-save-status', 'children'),
+        Input('save-settings-btn', 'n_clicks'),
+        [State('color-profit-primary', 'value'),
+         State('color-profit-secondary', 'value'),
+         State('color-loss-primary', 'value'),
+         State('color-loss-secondary', 'value'),
+         State('color-accent-primary', 'value')],
+        prevent_initial_call=True
+    )
+    def save_settings(n_clicks, profit_pri, profit_sec, loss_pri, loss_sec, accent):
+        db.save_setting('color_profit_primary', profit_pri)
+        db.save_setting('color_profit_secondary', profit_sec)
+        db.save_setting('color_loss_primary', loss_pri)
+        db.save_setting('color_loss_secondary', loss_sec)
+        db.save_setting('color_accent_primary', accent)
 
-@app.callback(
-    Output('query-output', 'children'),
-    Input('execute-query-btn', 'n_clicks'),
-    State('sql-query-input', 'value'),
-    prevent_initial_call=True
-)
-def execute_sql_query(n_clicks, query):
-    if not query or not query.strip():
         return html.Div([
-            html.P("⚠️ Please enter a query", style={'color': '#f59e0b', 'padding': '15px',
-                                                     'backgroundColor': '#fef3c7', 'borderRadius': '6px'})
+            html.P("✓ Settings saved! Refresh the page to see changes.",
+                   style={'color': '#10b981', 'fontWeight': '500', 'backgroundColor': '#d1fae5',
+                          'padding': '10px 15px', 'borderRadius': '6px', 'marginTop': '10px'})
         ])
 
-    result = db.execute_query(query)
+    # Reset settings
+    @app.callback(
+        Output('settings-save-status', 'children', allow_duplicate=True),
+        Input('reset-settings-btn', 'n_clicks'),
+        prevent_initial_call=True
+    )
+    def reset_settings(n_clicks):
+        db.reset_settings()
+        return html.Div([
+            html.P("✓ Settings reset to defaults! Refresh the page.",
+                   style={'color': '#3b82f6', 'fontWeight': '500', 'backgroundColor': '#dbeafe',
+                          'padding': '10px 15px', 'borderRadius': '6px', 'marginTop': '10px'})
+        ])
 
-    # ADD LOG
-    if result['success']:
-        db.add_log(
-            action_type='SQL_QUERY',
-            action_category='DATABASE',
-            description=f'SQL query executed: {result["type"]}',
-            details=f'Query: {query[:100]}... | Rows affected/returned: {result.get("rows_affected", len(result.get("rows", [])))}'
-        )
+    @app.callback(
+        [Output('icon-date', 'children'),
+         Output('icon-date', 'style')],
+        Input('trade-date', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_date(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
+
+        if not value or value == '':
+            return "●", {**base_style, 'color': '#9ca3af'}
+
+        # Check if it's a valid date format YYYY-MM-DD
+        if re.match(r'^\d{4}-\d{2}-\d{2}$', value):
+            try:
+                datetime.strptime(value, '%Y-%m-%d')
+                return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
+            except:
+                return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
+        else:
+            return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
 
-    # ... rest of the existing code ...
-
-
-# Update color hex displays
-@app.callback(
-    [Output('color-profit-primary-hex', 'children'),
-     Output('color-profit-secondary-hex', 'children'),
-     Output('color-loss-primary-hex', 'children'),
-     Output('color-loss-secondary-hex', 'children'),
-     Output('color-accent-primary-hex', 'children')],
-    [Input('color-profit-primary', 'value'),
-     Input('color-profit-secondary', 'value'),
-     Input('color-loss-primary', 'value'),
-     Input('color-loss-secondary', 'value'),
-     Input('color-accent-primary', 'value')]
-)
-def update_hex_displays(c1, c2, c3, c4, c5):
-    return c1, c2, c3, c4, c5
-
-
-# Save settings
-@app.callback(
-    Output('settings-save-status', 'children'),
-    Input('save-settings-btn', 'n_clicks'),
-    [State('color-profit-primary', 'value'),
-     State('color-profit-secondary', 'value'),
-     State('color-loss-primary', 'value'),
-     State('color-loss-secondary', 'value'),
-     State('color-accent-primary', 'value')],
-    prevent_initial_call=True
-)
-def save_settings(n_clicks, profit_pri, profit_sec, loss_pri, loss_sec, accent):
-    db.save_setting('color_profit_primary', profit_pri)
-    db.save_setting('color_profit_secondary', profit_sec)
-    db.save_setting('color_loss_primary', loss_pri)
-    db.save_setting('color_loss_secondary', loss_sec)
-    db.save_setting('color_accent_primary', accent)
+    @app.callback(
+        [Output('icon-ticker', 'children'),
+         Output('icon-ticker', 'style')],
+        Input('trade-ticker', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_ticker(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
 
-    return html.Div([
-        html.P("✓ Settings saved! Refresh the page to see changes.",
-               style={'color': '#10b981', 'fontWeight': '500', 'backgroundColor': '#d1fae5',
-                      'padding': '10px 15px', 'borderRadius': '6px', 'marginTop': '10px'})
-    ])
+        if not value or value == '':
+            return "●", {**base_style, 'color': '#9ca3af'}
 
+        # Check if it's letters only, 1-5 characters
+        if value.replace(' ', '').isalpha() and 1 <= len(value.replace(' ', '')) <= 5:
+            return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
+        else:
+            return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
 
-# Reset settings
-@app.callback(
-    Output('settings-save-status', 'children', allow_duplicate=True),
-    Input('reset-settings-btn', 'n_clicks'),
-    prevent_initial_call=True
-)
-def reset_settings(n_clicks):
-    db.reset_settings()
-    return html.Div([
-        html.P("✓ Settings reset to defaults! Refresh the page.",
-               style={'color': '#3b82f6', 'fontWeight': '500', 'backgroundColor': '#dbeafe',
-                      'padding': '10px 15px', 'borderRadius': '6px', 'marginTop': '10px'})
-    ])
+    @app.callback(
+        [Output('icon-sector', 'children'),
+         Output('icon-sector', 'style')],
+        Input('trade-sector', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_sector(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
 
+        # Since it's now auto-filled, just check if it has a value
+        if not value or value == '':
+            return "●", {**base_style, 'color': '#9ca3af'}
+        return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
 
-# Call backs for Validation
+    @app.callback(
+        [Output('icon-news', 'children'),
+         Output('icon-news', 'style')],
+        Input('trade-news', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_news(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
 
-# ==================== VALIDATION CALLBACKS ====================
+        if not value:
+            return "●", {**base_style, 'color': '#9ca3af'}
+        return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
 
-@app.callback(
-    [Output('icon-date', 'children'),
-     Output('icon-date', 'style')],
-    Input('trade-date', 'value'),
-    prevent_initial_call=False
-)
-def validate_date(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
+    @app.callback(
+        [Output('icon-entry-price', 'children'),
+         Output('icon-entry-price', 'style')],
+        Input('trade-entry-price', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_entry_price(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
 
-    if not value or value == '':
-        return "●", {**base_style, 'color': '#9ca3af'}
+        if not value or value == '':
+            return "●", {**base_style, 'color': '#9ca3af'}
 
-    # Check if it's a valid date format YYYY-MM-DD
-    if re.match(r'^\d{4}-\d{2}-\d{2}$', value):
         try:
-            datetime.strptime(value, '%Y-%m-%d')
-            return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
+            price = float(value)
+            if price > 0:
+                return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
+            else:
+                return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
         except:
             return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
-    else:
-        return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
 
+    @app.callback(
+        [Output('icon-exit-price', 'children'),
+         Output('icon-exit-price', 'style')],
+        Input('trade-exit-price', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_exit_price(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
+
+        if not value or value == '':
+            return "●", {**base_style, 'color': '#9ca3af'}
 
-@app.callback(
-    [Output('icon-ticker', 'children'),
-     Output('icon-ticker', 'style')],
-    Input('trade-ticker', 'value'),
-    prevent_initial_call=False
-)
-def validate_ticker(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
+        try:
+            price = float(value)
+            if price > 0:
+                return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
+            else:
+                return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
+        except:
+            return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
 
-    if not value or value == '':
-        return "●", {**base_style, 'color': '#9ca3af'}
+    @app.callback(
+        [Output('icon-entry-time', 'children'),
+         Output('icon-entry-time', 'style')],
+        Input('trade-entry-time', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_entry_time(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
 
-    # Check if it's letters only, 1-5 characters
-    if value.replace(' ', '').isalpha() and 1 <= len(value.replace(' ', '')) <= 5:
+        if not value or value == '':
+            return "●", {**base_style, 'color': '#9ca3af'}
         return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
-    else:
-        return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
-
-
-@app.callback(
-    [Output('icon-sector', 'children'),
-     Output('icon-sector', 'style')],
-    Input('trade-sector', 'value'),
-    prevent_initial_call=False
-)
-def validate_sector(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
-
-    # Since it's now auto-filled, just check if it has a value
-    if not value or value == '':
-        return "●", {**base_style, 'color': '#9ca3af'}
-    return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
-
-
-@app.callback(
-    [Output('icon-news', 'children'),
-     Output('icon-news', 'style')],
-    Input('trade-news', 'value'),
-    prevent_initial_call=False
-)
-def validate_news(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
-
-    if not value:
-        return "●", {**base_style, 'color': '#9ca3af'}
-    return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
-
-
-@app.callback(
-    [Output('icon-entry-price', 'children'),
-     Output('icon-entry-price', 'style')],
-    Input('trade-entry-price', 'value'),
-    prevent_initial_call=False
-)
-def validate_entry_price(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
-
-    if not value or value == '':
-        return "●", {**base_style, 'color': '#9ca3af'}
-
-    try:
-        price = float(value)
-        if price > 0:
-            return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
-        else:
-            return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
-    except:
-        return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
 
+    @app.callback(
+        [Output('icon-exit-time', 'children'),
+         Output('icon-exit-time', 'style')],
+        Input('trade-exit-time', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_exit_time(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
 
-@app.callback(
-    [Output('icon-exit-price', 'children'),
-     Output('icon-exit-price', 'style')],
-    Input('trade-exit-price', 'value'),
-    prevent_initial_call=False
-)
-def validate_exit_price(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
+        if not value or value == '':
+            return "●", {**base_style, 'color': '#9ca3af'}
+        return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
 
-    if not value or value == '':
-        return "●", {**base_style, 'color': '#9ca3af'}
+    @app.callback(
+        [Output('icon-shares', 'children'),
+         Output('icon-shares', 'style')],
+        Input('trade-shares', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_shares(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
 
-    try:
-        price = float(value)
-        if price > 0:
-            return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
-        else:
-            return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
-    except:
-        return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
-
-
-@app.callback(
-    [Output('icon-entry-time', 'children'),
-     Output('icon-entry-time', 'style')],
-    Input('trade-entry-time', 'value'),
-    prevent_initial_call=False
-)
-def validate_entry_time(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
-
-    if not value or value == '':
-        return "●", {**base_style, 'color': '#9ca3af'}
-    return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
-
-
-@app.callback(
-    [Output('icon-exit-time', 'children'),
-     Output('icon-exit-time', 'style')],
-    Input('trade-exit-time', 'value'),
-    prevent_initial_call=False
-)
-def validate_exit_time(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
-
-    if not value or value == '':
-        return "●", {**base_style, 'color': '#9ca3af'}
-    return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
-
-
-@app.callback(
-    [Output('icon-shares', 'children'),
-     Output('icon-shares', 'style')],
-    Input('trade-shares', 'value'),
-    prevent_initial_call=False
-)
-def validate_shares(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
-
-    if not value or value == '':
-        return "●", {**base_style, 'color': '#9ca3af'}
-
-    try:
-        shares = int(value)
-        if shares > 0:
-            return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
-        else:
+        if not value or value == '':
+            return "●", {**base_style, 'color': '#9ca3af'}
+
+        try:
+            shares = int(value)
+            if shares > 0:
+                return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
+            else:
+                return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
+        except:
             return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
-    except:
-        return "✗", {**base_style, 'color': '#ef4444', 'fontWeight': 'bold'}
-
-
-# Non-required field validations (always show gray or green, never red)
-@app.callback(
-    [Output('icon-industry', 'children'),
-     Output('icon-industry', 'style')],
-    Input('trade-industry', 'value'),
-    prevent_initial_call=False
-)
-def validate_industry(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
-
-    if not value or value == '':
-        return "●", {**base_style, 'color': '#9ca3af'}
-    return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
-
-
-@app.callback(
-    [Output('icon-volume', 'children'),
-     Output('icon-volume', 'style')],
-    Input('trade-volume', 'value'),
-    prevent_initial_call=False
-)
-def validate_volume(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
-
-    if not value or value == '':
-        return "●", {**base_style, 'color': '#9ca3af'}
-    return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
-
-
-@app.callback(
-    [Output('icon-avg-volume', 'children'),
-     Output('icon-avg-volume', 'style')],
-    Input('trade-avg-volume', 'value'),
-    prevent_initial_call=False
-)
-def validate_avg_volume(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
-
-    if not value or value == '':
-        return "●", {**base_style, 'color': '#9ca3af'}
-    return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
-
-
-@app.callback(
-    [Output('icon-float', 'children'),
-     Output('icon-float', 'style')],
-    Input('trade-float', 'value'),
-    prevent_initial_call=False
-)
-def validate_float(value):
-    base_style = {'fontSize': '18px', 'marginLeft': '8px'}
-
-    if not value or value == '':
-        return "●", {**base_style, 'color': '#9ca3af'}
-    return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
 
+    # Non-required field validations (always show gray or green, never red)
+    @app.callback(
+        [Output('icon-industry', 'children'),
+         Output('icon-industry', 'style')],
+        Input('trade-industry', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_industry(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
+
+        if not value or value == '':
+            return "●", {**base_style, 'color': '#9ca3af'}
+        return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
 
-# ==================== API FETCH CALLBACK ====================
+    @app.callback(
+        [Output('icon-volume', 'children'),
+         Output('icon-volume', 'style')],
+        Input('trade-volume', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_volume(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
 
-@app.callback(
-    [Output('trade-sector', 'value'),
-     Output('trade-industry', 'value'),
-     Output('trade-volume', 'value'),
-     Output('trade-avg-volume', 'value'),
-     Output('trade-float', 'value'),
-     Output('api-fetch-status', 'children')],
-    Input('fetch-stock-api-btn', 'n_clicks'),
-    State('trade-ticker', 'value'),
-    prevent_initial_call=True
-)
-def fetch_stock_data_for_form(n_clicks, ticker):
-    if not ticker or ticker.strip() == '':
-        return None, None, None, None, html.Div([
-            html.P("⚠️ Please enter a ticker first",
-                   style={'color': '#f59e0b', 'padding': '10px', 'backgroundColor': '#fef3c7',
-                          'borderRadius': '6px', 'fontSize': '13px'})
-        ])
+        if not value or value == '':
+            return "●", {**base_style, 'color': '#9ca3af'}
+        return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
 
-    if not FMP_API_KEY or FMP_API_KEY == 'YOUR_API_KEY_HERE':
-        return None, None, None, None, html.Div([
-            html.P("⚠️ API key not configured. Please add your FMP API key to src/config.py",
-                   style={'color': '#f59e0b', 'padding': '10px', 'backgroundColor': '#fef3c7',
-                          'borderRadius': '6px', 'fontSize': '13px'})
-        ])
+    @app.callback(
+        [Output('icon-avg-volume', 'children'),
+         Output('icon-avg-volume', 'style')],
+        Input('trade-avg-volume', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_avg_volume(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
 
-    try:
-        from stock_data_api import StockDataAPI
-        api = StockDataAPI(api_key=FMP_API_KEY)
-
-        data = api.get_complete_stock_data(ticker.upper().strip())
-
-        if data.get('success'):
-            volume = f"{int(data.get('volume', 0)):,}" if data.get('volume') else None
-            avg_vol = f"{int(data.get('averageVolume', 0)):,}" if data.get('averageVolume') else None
-            # Float is returned in millions, convert to full number
-            float_raw = data.get('freeFloat', 0)
-            float_val = f"{int(float_raw * 1_000_000):,}" if float_raw else None
-
-            return (
-                data.get('sector', ''),
-                data.get('industry', ''),
-                volume,
-                avg_vol,
-                float_val,
-                html.Div([
-                    html.P(f"✓ Data fetched for {ticker.upper()}!",
-                           style={'color': '#10b981', 'padding': '10px', 'backgroundColor': '#d1fae5',
-                                  'borderRadius': '6px', 'fontSize': '13px', 'fontWeight': '500'})
+        if not value or value == '':
+            return "●", {**base_style, 'color': '#9ca3af'}
+        return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
+
+    @app.callback(
+        [Output('icon-float', 'children'),
+         Output('icon-float', 'style')],
+        Input('trade-float', 'value'),
+        prevent_initial_call=False
+    )
+    def validate_float(value):
+        base_style = {'fontSize': '18px', 'marginLeft': '8px'}
+
+        if not value or value == '':
+            return "●", {**base_style, 'color': '#9ca3af'}
+        return "✓", {**base_style, 'color': '#10b981', 'fontWeight': 'bold'}
+
+    @app.callback(
+        [Output('trade-sector', 'value'),
+         Output('trade-industry', 'value'),
+         Output('trade-volume', 'value'),
+         Output('trade-avg-volume', 'value'),
+         Output('trade-float', 'value'),
+         Output('api-fetch-status', 'children')],
+        Input('fetch-stock-api-btn', 'n_clicks'),
+        State('trade-ticker', 'value'),
+        prevent_initial_call=True
+    )
+    def fetch_stock_data_for_form(n_clicks, ticker):
+        if not ticker or ticker.strip() == '':
+            return None, None, None, None, html.Div([
+                html.P("⚠️ Please enter a ticker first",
+                       style={'color': '#f59e0b', 'padding': '10px', 'backgroundColor': '#fef3c7',
+                              'borderRadius': '6px', 'fontSize': '13px'})
+            ])
+
+        if not FMP_API_KEY or FMP_API_KEY == 'YOUR_API_KEY_HERE':
+            return None, None, None, None, html.Div([
+                html.P("⚠️ API key not configured. Please add your FMP API key to src/config.py",
+                       style={'color': '#f59e0b', 'padding': '10px', 'backgroundColor': '#fef3c7',
+                              'borderRadius': '6px', 'fontSize': '13px'})
+            ])
+
+        try:
+            from stock_data_api import StockDataAPI
+            api = StockDataAPI(api_key=FMP_API_KEY)
+
+            data = api.get_complete_stock_data(ticker.upper().strip())
+
+            if data.get('success'):
+                volume = f"{int(data.get('volume', 0)):,}" if data.get('volume') else None
+                avg_vol = f"{int(data.get('averageVolume', 0)):,}" if data.get('averageVolume') else None
+                # Float is returned in millions, convert to full number
+                float_raw = data.get('freeFloat', 0)
+                float_val = f"{int(float_raw * 1_000_000):,}" if float_raw else None
+
+                return (
+                    data.get('sector', ''),
+                    data.get('industry', ''),
+                    volume,
+                    avg_vol,
+                    float_val,
+                    html.Div([
+                        html.P(f"✓ Data fetched for {ticker.upper()}!",
+                               style={'color': '#10b981', 'padding': '10px', 'backgroundColor': '#d1fae5',
+                                      'borderRadius': '6px', 'fontSize': '13px', 'fontWeight': '500'})
+                    ])
+                )
+            else:
+                return None, None, None, None, html.Div([
+                    html.P(f"✗ Failed to fetch data: {data.get('error', 'Unknown error')}",
+                           style={'color': '#ef4444', 'padding': '10px', 'backgroundColor': '#fee2e2',
+                                  'borderRadius': '6px', 'fontSize': '13px'})
                 ])
-            )
-        else:
+        except Exception as e:
             return None, None, None, None, html.Div([
-                html.P(f"✗ Failed to fetch data: {data.get('error', 'Unknown error')}",
+                html.P(f"✗ Error: {str(e)}",
                        style={'color': '#ef4444', 'padding': '10px', 'backgroundColor': '#fee2e2',
                               'borderRadius': '6px', 'fontSize': '13px'})
             ])
-    except Exception as e:
-        return None, None, None, None, html.Div([
-            html.P(f"✗ Error: {str(e)}",
-                   style={'color': '#ef4444', 'padding': '10px', 'backgroundColor': '#fee2e2',
-                          'borderRadius': '6px', 'fontSize': '13px'})
-        ])
 
-
-# Analyze Callbacks
-# Register analyze callbacks
-from callbacks.analyze_callbacks import register_analyze_callbacks
-
-register_analyze_callbacks(app)
-
-# Logs callbacks
-from callbacks.analyze_callbacks import register_analyze_callbacks
-from callbacks.logs_callbacks import register_logs_callbacks
-
-register_analyze_callbacks(app)
-register_logs_callbacks(app, db)
-
-
-# Simple badge overlay that doesn't break tabs
-@app.callback(
-    Output('logs-badge-overlay', 'children'),
-    [Input('save-trade-btn', 'n_clicks'),
-     Input('add-deposit-btn', 'n_clicks'),
-     Input('add-withdrawal-btn', 'n_clicks'),
-     Input('execute-query-btn', 'n_clicks'),
-     Input('tabs', 'value')],
-    prevent_initial_call=False
-)
-def update_badge_overlay(trade_clicks, deposit_clicks, withdrawal_clicks, query_clicks, current_tab):
-    from dash import callback_context
-
-    # If user is on logs tab, mark all as read
-    if current_tab == 'logs':
-        db.mark_logs_as_read()
-
-    # Get unread count
-    unread_count = db.get_unread_logs_count()
-
-    if unread_count > 0 and current_tab != 'logs':
-        return html.Div(
-            str(unread_count),
-            style={
-                'position': 'absolute',
-                'top': '-45px',
-                'left': '620px',  # Adjust this value to position over Logs tab
-                'backgroundColor': '#ef4444',
-                'color': 'white',
-                'fontSize': '11px',
-                'fontWeight': '700',
-                'padding': '3px 7px',
-                'borderRadius': '10px',
-                'minWidth': '20px',
-                'textAlign': 'center',
-                'zIndex': '1000',
-                'animation': 'pulse 2s infinite'
-            }
-        )
-    return html.Div()
+    # Simple badge overlay that doesn't break tabs
+    @app.callback(
+        Output('logs-badge-overlay', 'children'),
+        [Input('save-trade-btn', 'n_clicks'),
+         Input('add-deposit-btn', 'n_clicks'),
+         Input('add-withdrawal-btn', 'n_clicks'),
+         Input('execute-query-btn', 'n_clicks'),
+         Input('tabs', 'value')],
+        prevent_initial_call=False
+    )
+    def update_badge_overlay(trade_clicks, deposit_clicks, withdrawal_clicks, query_clicks, current_tab):
+        from dash import callback_context
+
+        # If user is on logs tab, mark all as read
+        if current_tab == 'logs':
+            db.mark_logs_as_read()
+
+        # Get unread count
+        unread_count = db.get_unread_logs_count()
+
+        if unread_count > 0 and current_tab != 'logs':
+            return html.Div(
+                str(unread_count),
+                style={
+                    'position': 'absolute',
+                    'top': '-45px',
+                    'left': '620px',  # Adjust this value to position over Logs tab
+                    'backgroundColor': '#ef4444',
+                    'color': 'white',
+                    'fontSize': '11px',
+                    'fontWeight': '700',
+                    'padding': '3px 7px',
+                    'borderRadius': '10px',
+                    'minWidth': '20px',
+                    'textAlign': 'center',
+                    'zIndex': '1000',
+                    'animation': 'pulse 2s infinite'
+                }
+            )
+        return html.Div()
+
+
+def register_routes(app, db, callback_metrics):
+    """Register the Flask routes and request hooks next to the Dash app"""
+
+    # JSON API for the rolling edge metrics (same data as the dashboard chart)
+    @app.server.route('/api/rolling-metrics')
+    def rolling_metrics_api():
+        return jsonify(db.get_rolling_metrics())
+
+    # Prometheus scrape endpoint: callback latency, SQL time, cache hits, API quota, DB size, RSS
+    @app.server.route('/metrics')
+    def prometheus_metrics_endpoint():
+        return Response(generate_metrics(db, callback_metrics), content_type=CONTENT_TYPE)
+
+    # Saved callback profiles (listed on the Maintenance tab)
+    @app.server.route('/profiles/<name>')
+    def callback_profile_report(name):
+        if not REPORT_NAME_PATTERN.match(name):
+            abort(404)
+        return send_from_directory(callback_metrics.profiler.profile_dir, name, as_attachment=True)
+
+    # Opening the dashboard with ?profile=N[&profile_mode=deterministic] profiles the next N callbacks
+    @app.server.before_request
+    def arm_profiler_from_query():
+        count = request.args.get('profile', type=int)
+        if request.path == '/' and count:
+            mode = request.args.get('profile_mode', 'sampling')
+            callback_metrics.profiler.arm(count, mode if mode in PROFILE_MODES else 'sampling',
+                                          request.args.get('profile_callback'))
+
+
+def create_app(config=None, db_handle=None):
+    """
+    Create the dashboard app
+
+    One app per process: gunicorn/waitress workers each call this (see wsgi.py), so every
+    worker gets its own database handle, and results cached by one worker are shared with
+    the others through the database's shared cache when enabled.
+
+    Args:
+        config: Optional dict overriding config.py: DB_NAME (default 'trades.db'),
+                ANALYTICS_ENGINE, SHARED_CACHE, CALLBACK_METRICS_PERSIST
+        db_handle: Existing TradingDatabase to serve instead of opening DB_NAME
+
+    Returns:
+        dash.Dash app; app.server is the WSGI application
+    """
+    config = config or {}
+
+    db = db_handle or TradingDatabase(config.get('DB_NAME', 'trades.db'), config.get('ANALYTICS_ENGINE'),
+                                      config.get('SHARED_CACHE'))
+
+    # Per-callback latency stats, shown on the Maintenance tab
+    callback_metrics = CallbackMetrics(db, config.get('CALLBACK_METRICS_PERSIST'))
+    # Opt-in profiling of the next N callbacks (Settings tab or ?profile=N)
+    callback_metrics.profiler = CallbackProfiler(get_configured_profile_dir(db.db_name))
+
+    app = dash.Dash(__name__)
+    app.title = "Trading Dashboard"
+    app.index_string = INDEX_STRING
+    app.layout = render_layout()
+
+    register_app_callbacks(app, db, callback_metrics)
+    register_analyze_callbacks(app)
+    register_logs_callbacks(app, db)
+    register_search_callbacks(app, db)
+    register_performance_callbacks(app, callback_metrics)
+    register_routes(app, db, callback_metrics)
+
+    # Time every callback registered above
+    callback_metrics.instrument(app)
+    return app
 
 
 if __name__ == '__main__':
-    app.run(debug=False)
-    threading.Thread(target=open_browser).start()
+    # Development server; use wsgi.py with gunicorn or waitress for several concurrent users
+    threading.Thread(target=open_browser, daemon=True).start()
+    create_app().run(debug=False)
@@ -0,0 +1,322 @@
+"""
+TradingDatabase and dashboard benchmarks
+Times every TradingDatabase read method and the dashboard renderers against synthetic
+histories (see synthetic_data.py) at several scales, and writes the results to a JSON
+baseline that later runs are compared against.
+
+Each benchmark is timed three ways:
+    first - the first call on a freshly generated database (lazy tables such as the
+            equity curve and wash sales are built here)
+    cold  - median over repeats with the in-process result cache cleared and the analytics
+            backend (columnar trade store or DuckDB Parquet mirror) reloaded
+    warm  - median over repeats with the cache left in place
+plus the peak memory allocated by one cold call (tracemalloc). Renderer timings include
+serializing the component tree the way Dash sends it.
+
+Usage:
+    python src/benchmarks.py --scales 1k,10k,100k --output benchmarks.json
+    python src/benchmarks.py --scales 10k --compare benchmarks.json
+"""
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from synthetic_data import DEFAULT_SEED, SCALES, parse_scale, populate_database
+
+DEFAULT_SCALES = ('1k', '10k', '100k', '1m')
+DEFAULT_REPEAT = 5
+
+# A benchmark regresses when its cold median is this much slower than the baseline...
+REGRESSION_TOLERANCE = 0.25
+# ...and slower by at least this many milliseconds (ignores noise on sub-millisecond calls)
+REGRESSION_MIN_MS = 2.0
+# Allocation regressions likewise need to grow the peak by at least this many KB
+REGRESSION_MIN_KB = 256
+
+
+def read_benchmarks(db):
+    """
+    {name: callable} for every TradingDatabase read method
+
+    Arguments come from the data itself (latest year, month, date and ticker).
+    """
+    conn = db.get_connection()
+    last_date, ticker = conn.execute(
+        'SELECT date, ticker FROM trades ORDER BY date DESC, entry_time DESC LIMIT 1').fetchone()
+    conn.close()
+    year, month = int(last_date[:4]), int(last_date[5:7])
+
+    return {
+        'get_all_trades': lambda: db.get_all_trades(),
+        'get_trades': lambda: db.get_trades(['date', 'ticker', 'entry_price', 'shares', 'profit_loss']),
+        'get_stats': lambda: db.get_stats(),
+        'get_trade_metrics': lambda: db.get_trade_metrics(),
+        'get_rolling_metrics': lambda: db.get_rolling_metrics(),
+        'get_monte_carlo': lambda: db.get_monte_carlo(),
+        'get_bootstrap_intervals': lambda: db.get_bootstrap_intervals(),
+        'get_streak': lambda: db.get_streak(),
+        'get_win_rate_by_day': lambda: db.get_win_rate_by_day(),
+        'get_capital_transactions': lambda: db.get_capital_transactions(),
+        'get_current_capital': lambda: db.get_current_capital(),
+        'get_equity_curve': lambda: db.get_equity_curve(),
+        'get_returns': lambda: db.get_returns(),
+        'get_drawdown_summary': lambda: db.get_drawdown_summary(),
+        'get_monthly_calendar': lambda: db.get_monthly_calendar(year, month),
+        'get_hourly_performance': lambda: db.get_hourly_performance(),
+        'get_profits_by_price': lambda: db.get_profits_by_price(),
+        'get_tax_settings': lambda: db.get_tax_settings(),
+        'get_tax_years': lambda: db.get_tax_years(),
+        'get_tax_breakdown': lambda: db.get_tax_breakdown(),
+        'calculate_taxes_simple': lambda: db.calculate_taxes_simple(year),
+        'get_tax_scenarios': lambda: db.get_tax_scenarios(year),
+        'get_wash_sales': lambda: db.get_wash_sales(year),
+        'get_settings': lambda: db.get_settings(),
+        'get_trades_without_stock_data': lambda: db.get_trades_without_stock_data(),
+        'get_unique_tickers_for_date': lambda: db.get_unique_tickers_for_date(last_date),
+        'get_all_logs': lambda: db.get_all_logs(),
+        'get_logs_page': lambda: db.get_logs_page(),
+        'get_logs_page_filtered': lambda: db.get_logs_page(category='TRADE', search=ticker),
+        'get_log_filter_options': lambda: db.get_log_filter_options(),
+        'get_unread_logs_count': lambda: db.get_unread_logs_count(),
+        'search_trades': lambda: db.search_trades('pullback'),
+        'search_logs': lambda: db.search_logs(ticker),
+        'execute_query': lambda: db.execute_query('SELECT ticker, SUM(profit_loss) FROM trades GROUP BY ticker',
+                                                  max_rows=100),
+        'explain_query': lambda: db.explain_query(f"SELECT * FROM trades WHERE date >= '{year}-01-01'"),
+    }
+
+
+def render_benchmarks(db):
+    """{name: callable} for the dashboard renderers"""
+    from app import render_dashboard
+    from components import render_calendar, render_hourly_chart, render_profits_by_price
+    from components.logs import render_logs
+
+    return {
+        'render_dashboard': lambda: render_dashboard(db),
+        'render_calendar': lambda: render_calendar(db),
+        'render_hourly_chart': lambda: render_hourly_chart(db),
+        'render_profits_by_price': lambda: render_profits_by_price(db),
+        'render_logs': lambda: render_logs(db),
+    }
+
+
+def serialized(render):
+    """Wrap a renderer so its timing includes JSON serialization, as Dash does when sending it"""
+    from plotly.utils import PlotlyJSONEncoder
+
+    def run():
+        return len(json.dumps(render(), cls=PlotlyJSONEncoder))
+    return run
+
+
+def time_call(fn):
+    """(elapsed ms, result)"""
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def clear_caches(db):
+    """Clear the result cache and make the analytics backend reload its data on the next call"""
+    db.cache.clear()
+    if db.analytics is not None:
+        db.analytics.invalidate()
+
+
+def peak_allocation_kb(db, fn):
+    """Peak memory (KB) allocated by one cold call, traced separately so timings stay clean"""
+    clear_caches(db)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def time_benchmark(db, fn, repeat):
+    """First, cold (caches cleared) and warm timings and the cold peak allocation of one benchmark"""
+    first_ms, _ = time_call(fn)
+    cold, warm = [], []
+    for _ in range(repeat):
+        clear_caches(db)
+        cold.append(time_call(fn)[0])
+        warm.append(time_call(fn)[0])
+    return {
+        'first_ms': round(first_ms, 3),
+        'cold_ms': round(statistics.median(cold), 3),
+        'warm_ms': round(statistics.median(warm), 3),
+        'min_ms': round(min(cold + warm), 3),
+        'peak_kb': round(peak_allocation_kb(db, fn), 1),
+    }
+
+
+def run_scale(scale, workdir, repeat=DEFAULT_REPEAT, seed=DEFAULT_SEED, end_date=None, only=None,
+              renderers=True, log=print):
+    """
+    Generate a synthetic database for one scale and time every benchmark on it
+
+    Args:
+        scale: Scale name or trade count
+        workdir: Directory for the generated database
+        only: Optional substring; only benchmarks whose name contains it are run
+        renderers: Include the Dash renderers (needs the app's dependencies)
+
+    Returns:
+        {'trades': n, 'generate_s': seconds, 'benchmarks': {name: timings}}
+    """
+    from database import TradingDatabase
+
+    n_trades = parse_scale(scale)
+    end_date = end_date or date.today().isoformat()
+    db_name = os.path.join(workdir, f'synthetic_{scale}.db')
+    if os.path.exists(db_name):
+        os.remove(db_name)
+
+    started = time.perf_counter()
+    counts = populate_database(db_name, n_trades, seed, end_date)
+    generate_s = time.perf_counter() - started
+    log(f"[{scale}] generated {counts['trades']:,} trades in {generate_s:.1f}s")
+
+    db = TradingDatabase(db_name, shared_cache=False)
+    benchmarks = {f'db.{name}': fn for name, fn in read_benchmarks(db).items()}
+    if renderers:
+        benchmarks.update({f'ui.{name}': serialized(fn) for name, fn in render_benchmarks(db).items()})
+
+    results = {}
+    for name, fn in benchmarks.items():
+        if only and only not in name:
+            continue
+        results[name] = time_benchmark(db, fn, repeat)
+        log(f"[{scale}] {name:<36} first {results[name]['first_ms']:>10.1f} ms  "
+            f"cold {results[name]['cold_ms']:>10.1f} ms  warm {results[name]['warm_ms']:>10.1f} ms  "
+            f"peak {results[name]['peak_kb']:>10,.0f} KB")
+
+    os.remove(db_name)
+    return {'trades': counts['trades'], 'generate_s': round(generate_s, 3), 'benchmarks': results}
+
+
+def environment():
+    """Versions that matter when comparing timings across machines"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'sqlite': sqlite3.sqlite_version,
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def run_benchmarks(scales=DEFAULT_SCALES, repeat=DEFAULT_REPEAT, seed=DEFAULT_SEED, end_date=None, only=None,
+                   renderers=True, log=print):
+    """
+    Run the suite at every scale
+
+    Returns:
+        Baseline dict: {'created', 'seed', 'end_date', 'repeat', 'environment', 'scales': {scale: run_scale(...)}}
+    """
+    end_date = end_date or date.today().isoformat()
+    with tempfile.TemporaryDirectory(prefix='tdash-bench-') as workdir:
+        return {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'seed': seed,
+            'end_date': end_date,
+            'repeat': repeat,
+            'environment': environment(),
+            'scales': {scale: run_scale(scale, workdir, repeat, seed, end_date, only, renderers, log)
+                       for scale in scales},
+        }
+
+
+def write_baseline(results, path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(baseline, results, tolerance=REGRESSION_TOLERANCE, min_ms=REGRESSION_MIN_MS, key='cold_ms'):
+    """
+    Compare a run against a baseline
+
+    Args:
+        key: Measurement to compare ('cold_ms', 'warm_ms', ... or 'peak_kb' with min_ms=REGRESSION_MIN_KB)
+
+    Returns:
+        List of {'scale', 'benchmark', 'baseline', 'current', 'change'} (baseline and current in
+        key's unit) for benchmarks worse than the baseline by more than tolerance (fraction) and
+        min_ms, worst first
+    """
+    regressions = []
+    for scale, run in results['scales'].items():
+        baseline_run = baseline.get('scales', {}).get(scale)
+        if not baseline_run:
+            continue
+        for name, timings in run['benchmarks'].items():
+            before = baseline_run['benchmarks'].get(name)
+            if not before or key not in before:
+                continue
+            slower = timings[key] - before[key]
+            if slower > min_ms and slower > before[key] * tolerance:
+                regressions.append({'scale': scale, 'benchmark': name, 'baseline': before[key],
+                                    'current': timings[key], 'change': slower / max(before[key], 1e-9)})
+    return sorted(regressions, key=lambda r: r['change'], reverse=True)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark TradingDatabase reads and dashboard renderers')
+    parser.add_argument('--scales', default=','.join(DEFAULT_SCALES),
+                        help=f"Comma-separated scales: {', '.join(SCALES)} or trade counts")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--end-date', help='Last synthetic trading day (default: today, so current-month views have data)')
+    parser.add_argument('--only', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--no-render', action='store_true', help='Skip the Dash renderers')
+    parser.add_argument('--output', help='Write results to this JSON baseline')
+    parser.add_argument('--compare', help='Compare against this JSON baseline; exit 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE,
+                        help='Allowed slowdown as a fraction (default: %(default)s)')
+    args = parser.parse_args()
+
+    scales = [s.strip() for s in args.scales.split(',') if s.strip()]
+    results = run_benchmarks(scales, args.repeat, args.seed, args.end_date, args.only, not args.no_render)
+
+    if args.output:
+        write_baseline(results, args.output)
+        print(f"✓ Wrote baseline to {args.output}")
+
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        if baseline.get('seed') != results['seed']:
+            print(f"⚠ Baseline used seed {baseline.get('seed')}, this run used {results['seed']}")
+        regressions = compare_results(baseline, results, args.tolerance)
+        for r in regressions:
+            print(f"✗ [{r['scale']}] {r['benchmark']}: {r['baseline']:.1f} ms -> {r['current']:.1f} ms "
+                  f"(+{r['change']:.0%})")
+        memory_regressions = compare_results(baseline, results, args.tolerance, REGRESSION_MIN_KB, 'peak_kb')
+        for r in memory_regressions:
+            print(f"✗ [{r['scale']}] {r['benchmark']}: peak {r['baseline']:,.0f} KB -> {r['current']:,.0f} KB "
+                  f"(+{r['change']:.0%})")
+        regressions += memory_regressions
+        if regressions:
+            sys.exit(1)
+        print(f"✓ No regressions against {args.compare}")
@@ -0,0 +1,90 @@
+"""
+Bootstrap confidence intervals
+How much the headline numbers could move by luck alone: trades are resampled with
+replacement and every statistic is recomputed on each resample.
+
+Resamples are drawn as index matrices (resamples x trades) in batches capped at
+MAX_BATCH_ELEMENTS, and every statistic - including per-bucket P/L sums, via one
+offset bincount per batch - is computed for the whole batch at once.
+"""
+import numpy as np
+
+DEFAULT_RESAMPLES = 1000
+CONFIDENCE = 95
+
+# Upper bound on resample matrix size per batch (elements), to keep memory flat
+MAX_BATCH_ELEMENTS = 125_000
+
+# Large histories use fewer resamples (but at least MIN_RESAMPLES) to bound total work
+MAX_RESAMPLED_TRADES = 20_000_000
+MIN_RESAMPLES = 200
+
+TRADE_STATS = ('win_rate', 'avg_win', 'avg_loss', 'expectancy')
+
+
+def resample_batches(n, n_resamples, rng, max_elements=MAX_BATCH_ELEMENTS):
+    """Yield (batch, n) index matrices covering n_resamples resamples"""
+    batch = max(1, min(n_resamples, max_elements // max(n, 1)))
+    for start in range(0, n_resamples, batch):
+        yield rng.integers(0, n, size=(min(batch, n_resamples - start), n))
+
+
+def bootstrap_intervals(pnl, is_win, buckets=None, n_resamples=DEFAULT_RESAMPLES, confidence=CONFIDENCE, seed=0):
+    """
+    Confidence intervals for trade statistics and per-bucket P/L sums
+
+    Args:
+        pnl: Per-trade P/L
+        is_win: Per-trade win flags (losses are the non-wins, as in get_stats)
+        buckets: Optional {name: (per-trade bucket codes 0..K-1, K)}
+        n_resamples: Bootstrap resamples (reduced for very large histories, see MAX_RESAMPLED_TRADES)
+        confidence: Interval width in percent
+        seed: Random seed (results are deterministic per seed)
+
+    Returns:
+        {'stats': {stat: (low, high)}, name: [(low, high) per bucket code], ...}
+        Bounds are None where a statistic is undefined in most resamples (e.g. no wins).
+    """
+    pnl = np.asarray(pnl, dtype=float)
+    is_win = np.asarray(is_win, dtype=bool)
+    buckets = buckets or {}
+    n = len(pnl)
+    n_resamples = min(n_resamples, max(MIN_RESAMPLES, MAX_RESAMPLED_TRADES // max(n, 1)))
+    rng = np.random.default_rng(seed)
+
+    samples = {stat: [] for stat in TRADE_STATS}
+    bucket_samples = {name: [] for name in buckets}
+
+    for idx in resample_batches(n, n_resamples, rng):
+        values = pnl[idx]
+        wins = is_win[idx]
+        win_count = np.count_nonzero(wins, axis=1)
+        total = values.sum(axis=1)
+        win_total = (values * wins).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            samples['win_rate'].append(win_count / n * 100)
+            samples['avg_win'].append(win_total / win_count)
+            samples['avg_loss'].append((total - win_total) / (n - win_count))
+        samples['expectancy'].append(total / n)
+
+        rows = np.arange(len(idx))[:, np.newaxis]
+        for name, (codes, n_buckets) in buckets.items():
+            flat = (np.asarray(codes)[idx] + rows * n_buckets).ravel()
+            sums = np.bincount(flat, weights=values.ravel(), minlength=len(idx) * n_buckets)
+            bucket_samples[name].append(sums.reshape(len(idx), n_buckets))
+
+    tail = (100 - confidence) / 2
+    percentiles = (tail, 100 - tail)
+
+    def interval(values):
+        values = values[np.isfinite(values)]
+        if len(values) < n_resamples / 2:
+            return None, None
+        low, high = np.percentile(values, percentiles)
+        return float(low), float(high)
+
+    result = {'stats': {stat: interval(np.concatenate(parts)) for stat, parts in samples.items()}}
+    for name, parts in bucket_samples.items():
+        bounds = np.percentile(np.concatenate(parts), percentiles, axis=0)
+        result[name] = [(float(low), float(high)) for low, high in bounds.T]
+    return result
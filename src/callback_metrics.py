@@ -0,0 +1,281 @@
+"""
+Callback latency metrics
+Times every registered Dash callback and keeps, per callback: invocation, error and
+PreventUpdate counts, total/max latency, response payload sizes, an all-time latency
+histogram (fixed buckets) and a window of recent latencies for p50/p95/p99.
+
+instrument(app) wraps the functions in app.callback_map, so callbacks registered with
+@app.callback anywhere (app.py or the register_*_callbacks modules) are covered without
+touching them; timed() does the same for any other function. While a CallbackProfiler is attached and
+armed (callback_profiler.py), timed() runs invocations through it.
+
+Everything is kept in memory, per process. With persistence on, the counts recorded
+since the last flush are added to the callback_metrics table every
+PERSIST_INTERVAL_SECONDS, so several workers flushing into one database sum up rather
+than overwrite each other; the totals are read back at startup and shown on top of this
+process's numbers, so all-time numbers survive restarts. Enable it with
+CALLBACK_METRICS_PERSIST = True in config.py or TRADING_CALLBACK_METRICS_PERSIST=1 in
+the environment. Flushes due while recording run on a background thread, and a failed
+flush keeps its counts for the next one, so persistence never fails or delays a callback.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# Histogram bucket upper bounds (ms); the last bucket is everything slower
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+PERCENTILES = (50, 95, 99)
+
+# Recent latencies kept per callback for the percentiles
+WINDOW_SIZE = 1000
+
+PERSIST_INTERVAL_SECONDS = 60
+
+
+def get_configured_persistence():
+    """Read the persistence switch from config.py or the environment"""
+    try:
+        from config import CALLBACK_METRICS_PERSIST
+    except ImportError:
+        CALLBACK_METRICS_PERSIST = None
+    if CALLBACK_METRICS_PERSIST is not None:
+        return bool(CALLBACK_METRICS_PERSIST)
+    return os.environ.get('TRADING_CALLBACK_METRICS_PERSIST', '').lower() in ('1', 'true', 'yes')
+
+
+def payload_size(response):
+    """Size in bytes of a callback response (Dash returns it already serialized)"""
+    if response is None:
+        return 0
+    if isinstance(response, bytes):
+        return len(response)
+    if isinstance(response, str):
+        return len(response.encode())
+    from plotly.utils import PlotlyJSONEncoder
+    return len(json.dumps(response, cls=PlotlyJSONEncoder).encode())
+
+
+class CallbackStats:
+    """Counters, histogram and recent window for one callback"""
+
+    def __init__(self, name, outputs='', window=WINDOW_SIZE):
+        self.name = name
+        self.outputs = outputs
+        self.count = 0
+        self.errors = 0
+        self.prevented = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.payload_bytes = 0
+        self.max_payload_bytes = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.recent = deque(maxlen=window)
+
+    def record(self, elapsed_ms, payload=0, outcome='ok'):
+        self.count += 1
+        self.errors += outcome == 'error'
+        self.prevented += outcome == 'prevented'
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.payload_bytes += payload
+        self.max_payload_bytes = max(self.max_payload_bytes, payload)
+        self.buckets[int(np.searchsorted(LATENCY_BUCKETS_MS, elapsed_ms))] += 1
+        self.recent.append(elapsed_ms)
+
+    def merge(self, row):
+        """Add another set of counters (a summary() or get_callback_metrics row) to these"""
+        self.count += row['count']
+        self.errors += row['errors']
+        self.prevented += row['prevented']
+        self.total_ms += row['total_ms']
+        self.max_ms = max(self.max_ms, row['max_ms'])
+        self.payload_bytes += row['payload_bytes']
+        self.max_payload_bytes = max(self.max_payload_bytes, row['max_payload_bytes'])
+        if len(row['buckets']) == len(self.buckets):
+            self.buckets = [a + b for a, b in zip(self.buckets, row['buckets'])]
+
+    def summary(self, base=None):
+        """Summary of these counters, plus base's (CallbackStats) if given; percentiles are from recent only"""
+        if base is not None:
+            combined = CallbackStats(self.name, self.outputs, window=0)
+            combined.merge(base.summary())
+            combined.merge(self.summary())
+            combined.recent = self.recent
+            return combined.summary()
+
+        recent = np.fromiter(self.recent, dtype=float)
+        percentiles = np.percentile(recent, PERCENTILES) if len(recent) else [None] * len(PERCENTILES)
+        return {
+            'name': self.name,
+            'outputs': self.outputs,
+            'count': self.count,
+            'errors': self.errors,
+            'prevented': self.prevented,
+            'total_ms': self.total_ms,
+            'avg_ms': self.total_ms / self.count if self.count else None,
+            'max_ms': self.max_ms,
+            **{f'p{p}_ms': None if v is None else float(v) for p, v in zip(PERCENTILES, percentiles)},
+            'recent_count': len(recent),
+            'avg_payload_bytes': self.payload_bytes / self.count if self.count else None,
+            'payload_bytes': self.payload_bytes,
+            'max_payload_bytes': self.max_payload_bytes,
+            'buckets': list(self.buckets),
+        }
+
+
+class CallbackMetrics:
+    """Registry of per-callback stats, safe to record into from concurrent requests"""
+
+    def __init__(self, db=None, persist=None):
+        self.db = db
+        self.persist = get_configured_persistence() if persist is None else persist
+        self.stats = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.last_flush = time.monotonic()
+        self.flushing = False
+        self.instrumented = set()
+        self.names = set()
+        self.profiler = None
+        # Counts recorded since the last flush, and the totals persisted before this process started
+        self.pending = {}
+        self.persisted = {}
+
+        if self.persist and db is not None:
+            for row in db.get_callback_metrics():
+                self.get(row['name'], row['outputs'])
+                self.persisted[row['name']] = CallbackStats(row['name'], row['outputs'], window=0)
+                self.persisted[row['name']].merge(row)
+
+    def get(self, name, outputs=''):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = CallbackStats(name, outputs)
+        return stats
+
+    def get_pending(self, name, outputs=''):
+        stats = self.pending.get(name)
+        if stats is None:
+            stats = self.pending[name] = CallbackStats(name, outputs, window=0)
+        return stats
+
+    def record(self, name, elapsed_ms, payload=0, outcome='ok', outputs=''):
+        with self.lock:
+            self.get(name, outputs).record(elapsed_ms, payload, outcome)
+            if self.persist:
+                self.get_pending(name, outputs).record(elapsed_ms, payload, outcome)
+            flush_due = (self.persist and not self.flushing
+                         and time.monotonic() - self.last_flush > PERSIST_INTERVAL_SECONDS)
+            if flush_due:
+                self.flushing = True
+        if flush_due:
+            # Off the request path: the callback's response never waits on the writer queue
+            threading.Thread(target=self.background_flush, name='callback-metrics-flush', daemon=True).start()
+
+    def background_flush(self):
+        try:
+            self.flush()
+        finally:
+            self.flushing = False
+
+    def timed(self, name, func, outputs=''):
+        """Wrap func so every call is recorded under name"""
+        from dash.exceptions import PreventUpdate
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            mode = self.profiler.claim(name) if self.profiler is not None else None
+            started = time.perf_counter()
+            try:
+                if mode:
+                    response = self.profiler.profile(name, mode, func, *args, **kwargs)
+                else:
+                    response = func(*args, **kwargs)
+            except PreventUpdate:
+                self.record(name, (time.perf_counter() - started) * 1000, 0, 'prevented', outputs)
+                raise
+            except Exception:
+                self.record(name, (time.perf_counter() - started) * 1000, 0, 'error', outputs)
+                raise
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.record(name, elapsed_ms, payload_size(response), 'ok', outputs)
+            return response
+
+        wrapper.callback_metrics_wrapped = True
+        return wrapper
+
+    def instrument(self, app):
+        """
+        Time every callback registered on app
+
+        Safe to call repeatedly; callbacks already wrapped are skipped. Also re-checks the
+        callback map before each request, so callbacks registered later are picked up.
+        """
+        self.instrument_callbacks(app)
+        if not getattr(app.server, 'callback_metrics_hooked', False):
+            app.server.before_request(lambda: self.instrument_callbacks(app))
+            app.server.callback_metrics_hooked = True
+
+    def instrument_callbacks(self, app):
+        if len(self.instrumented) == len(app.callback_map):
+            return
+        for callback_id, callback in app.callback_map.items():
+            func = callback.get('callback')
+            if func is None or getattr(func, 'callback_metrics_wrapped', False):
+                self.instrumented.add(callback_id)
+                continue
+            name = getattr(func, '__name__', callback_id)
+            # allow_duplicate outputs carry a hash suffix; show the plain component ids
+            outputs = ', '.join(part.split('@')[0] for part in callback_id.strip('.').split('...'))
+            callback['callback'] = self.timed(name, func, outputs)
+            self.instrumented.add(callback_id)
+            self.names.add(name)
+
+    def summaries(self, sort_by='total_ms', all_time=True):
+        """
+        Per-callback summaries, slowest in total first
+
+        all_time adds the persisted totals read at startup (earlier runs and other workers) to
+        this process's counts; without it only this process's invocations are counted.
+        """
+        with self.lock:
+            summaries = [stats.summary(self.persisted.get(name) if all_time else None)
+                         for name, stats in self.stats.items()]
+        return sorted(summaries, key=lambda s: s[sort_by] or 0, reverse=True)
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+            self.pending = {}
+            self.persisted = {}
+            self.started = time.time()
+        if self.persist and self.db is not None:
+            self.db.clear_callback_metrics()
+
+    def flush(self):
+        """
+        Add the counts recorded since the last flush to the database (no-op without persistence)
+
+        Returns False if the write failed; the counts are kept for the next flush.
+        """
+        if not self.persist or self.db is None:
+            return True
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.last_flush = time.monotonic()
+        if not pending:
+            return True
+        try:
+            self.db.save_callback_metrics([stats.summary() for stats in pending.values()])
+        except Exception as e:
+            print(f"Warning: callback metrics not saved ({e}), retrying at the next flush")
+            with self.lock:
+                for name, stats in pending.items():
+                    self.get_pending(name, stats.outputs).merge(stats.summary())
+            return False
+        return True
@@ -0,0 +1,194 @@
+"""
+On-demand callback profiler
+Armed from the Settings tab (or by opening the app with ?profile=N), it runs the next N
+Dash callback invocations - optionally only those of one callback - under a profiler
+and saves one report per invocation to PROFILE_DIR:
+
+    sampling       - a background thread samples the callback thread's stack every
+                     SAMPLE_INTERVAL seconds and writes collapsed stacks (.folded):
+                     one "root;...;leaf count" line per stack, the input format of
+                     flamegraph.pl, speedscope and inferno
+    deterministic  - cProfile; writes the pstats dump (.prof, for snakeviz/speedscope)
+                     and a text report sorted by cumulative time (.txt)
+
+Callback metrics (callback_metrics.py) hand invocations to the profiler while it is
+armed; nothing is profiled otherwise. Arming is per process: under a multi-worker
+server only the worker that handled the arming request profiles its next invocations. Report names carry the time, callback and
+duration, so the Maintenance tab lists them without an index file.
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+PROFILE_MODES = ('sampling', 'deterministic')
+
+# Sampling period; the effective rate is also bounded by the interpreter's switch interval
+SAMPLE_INTERVAL = 0.001
+
+# Reports kept on disk (oldest deleted first) and the most invocations one arming may cover
+PROFILE_KEEP = 60
+MAX_PROFILED_CALLS = 20
+
+# Rows in the deterministic text report
+REPORT_ROWS = 60
+
+REPORT_NAME_PATTERN = re.compile(r'^(\d{8}-\d{6}-\d{3})_(.+)_(\d+)ms_(sampling|deterministic)\.(folded|prof|txt)$')
+
+
+def get_configured_profile_dir(db_name):
+    """PROFILE_DIR from config.py or the environment, else a profiles folder next to the database"""
+    try:
+        from config import PROFILE_DIR
+    except ImportError:
+        PROFILE_DIR = None
+    return (PROFILE_DIR or os.environ.get('TRADING_PROFILE_DIR')
+            or os.path.join(os.path.dirname(os.path.abspath(db_name)), 'profiles'))
+
+
+def frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's stack until stopped, counting collapsed stacks"""
+
+    def __init__(self, thread_id, root_frame, interval=SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.root_frame = root_frame
+        self.interval = interval
+        self.stacks = Counter()
+        self.done = threading.Event()
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            # Walk up to (not including) the profiler's own frame
+            while frame is not None and frame is not self.root_frame:
+                labels.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                self.stacks[';'.join(reversed(labels))] += 1
+
+    def stop(self):
+        self.done.set()
+        self.join()
+
+
+class CallbackProfiler:
+    """Profiles the next N callback invocations once armed"""
+
+    def __init__(self, profile_dir):
+        self.profile_dir = profile_dir
+        self.remaining = 0
+        self.mode = 'sampling'
+        self.target = None
+        self.lock = threading.Lock()
+
+    def arm(self, count, mode='sampling', target=None):
+        """Profile the next count invocations (of target only, if given); 0 disarms"""
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        with self.lock:
+            self.remaining = max(0, min(int(count), MAX_PROFILED_CALLS))
+            self.mode = mode
+            self.target = target or None
+
+    def claim(self, name):
+        """Take one profiling slot for a callback invocation; returns the mode or None"""
+        if not self.remaining:
+            return None
+        with self.lock:
+            if not self.remaining or (self.target and self.target != name):
+                return None
+            self.remaining -= 1
+            return self.mode
+
+    def status(self):
+        return {'remaining': self.remaining, 'mode': self.mode, 'target': self.target}
+
+    def profile(self, name, mode, func, *args, **kwargs):
+        """Run func under the profiler and save the report; exceptions propagate after saving"""
+        started = time.perf_counter()
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')[:-3]
+        if mode == 'deterministic':
+            profiler = cProfile.Profile()
+            try:
+                return profiler.runcall(func, *args, **kwargs)
+            finally:
+                self.save_deterministic(profiler, name, stamp, time.perf_counter() - started)
+
+        sampler = StackSampler(threading.get_ident(), sys._getframe())
+        sampler.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sampler.stop()
+            self.save_sampling(sampler.stacks, name, stamp, time.perf_counter() - started)
+
+    def report_path(self, name, stamp, elapsed, mode, extension):
+        safe_name = re.sub(r'[^A-Za-z0-9_]+', '-', name)
+        os.makedirs(self.profile_dir, exist_ok=True)
+        return os.path.join(self.profile_dir, f"{stamp}_{safe_name}_{int(elapsed * 1000)}ms_{mode}{extension}")
+
+    def save_sampling(self, stacks, name, stamp, elapsed):
+        with open(self.report_path(name, stamp, elapsed, 'sampling', '.folded'), 'w') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        self.prune()
+
+    def save_deterministic(self, profiler, name, stamp, elapsed):
+        profiler.dump_stats(self.report_path(name, stamp, elapsed, 'deterministic', '.prof'))
+        text = io.StringIO()
+        pstats.Stats(profiler, stream=text).sort_stats('cumulative').print_stats(REPORT_ROWS)
+        with open(self.report_path(name, stamp, elapsed, 'deterministic', '.txt'), 'w') as f:
+            f.write(text.getvalue())
+        self.prune()
+
+    def list_reports(self):
+        """
+        Saved reports, newest first
+
+        Returns:
+            List of {'file', 'time', 'callback', 'duration_ms', 'mode', 'size'}
+        """
+        if not os.path.isdir(self.profile_dir):
+            return []
+        reports = []
+        for filename in os.listdir(self.profile_dir):
+            match = REPORT_NAME_PATTERN.match(filename)
+            if not match:
+                continue
+            stamp, callback, duration_ms, mode, _ = match.groups()
+            try:
+                size = os.path.getsize(os.path.join(self.profile_dir, filename))
+            except FileNotFoundError:
+                # Pruned since the listing
+                continue
+            reports.append({
+                'file': filename,
+                'time': datetime.strptime(stamp, '%Y%m%d-%H%M%S-%f').strftime('%Y-%m-%d %H:%M:%S'),
+                'stamp': stamp,
+                'callback': callback,
+                'duration_ms': int(duration_ms),
+                'mode': mode,
+                'size': size,
+            })
+        return sorted(reports, key=lambda r: (r['stamp'], r['file']), reverse=True)
+
+    def prune(self, keep=PROFILE_KEEP):
+        """Delete the oldest reports beyond keep"""
+        for report in self.list_reports()[keep:]:
+            try:
+                os.remove(os.path.join(self.profile_dir, report['file']))
+            except FileNotFoundError:
+                # Already pruned by another thread or worker
+                pass
@@ -1,4 +1,7 @@
 from .analyze_callbacks import register_analyze_callbacks
 from .logs_callbacks import register_logs_callbacks
+from .performance_callbacks import register_performance_callbacks
+from .search_callbacks import register_search_callbacks
 
-__all__ = ['register_analyze_callbacks', 'register_logs_callbacks']
\ No newline at end of file
+__all__ = ['register_analyze_callbacks', 'register_logs_callbacks', 'register_performance_callbacks',
+           'register_search_callbacks']
\ No newline at end of file
@@ -2,9 +2,13 @@
 Callbacks for the Analyze tab
 """
 from dash import Output, Input, State, html
-from config import ALPHA_VANTAGE_API_KEY
 from datetime import datetime, timedelta
 
+try:
+    from config import ALPHA_VANTAGE_API_KEY
+except ImportError:
+    ALPHA_VANTAGE_API_KEY = None
+
 
 def register_analyze_callbacks(app):
     """Register all analyze tab callbacks"""
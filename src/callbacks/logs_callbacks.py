@@ -1,12 +1,78 @@
 """
 Callbacks for the Logs tab
 """
-from dash import Output, Input, html
+import math
+
+from dash import Output, Input, State, html
 
 
 def register_logs_callbacks(app, db):
     """Register all logs tab callbacks"""
 
+    @app.callback(
+        [Output('logs-table', 'data'),
+         Output('logs-table', 'page_count'),
+         Output('logs-table', 'page_current'),
+         Output('logs-total-count', 'children')],
+        [Input('logs-table', 'page_current'),
+         Input('logs-table', 'sort_by'),
+         Input('logs-filter-category', 'value'),
+         Input('logs-filter-action', 'value'),
+         Input('logs-filter-dates', 'start_date'),
+         Input('logs-filter-dates', 'end_date'),
+         Input('logs-filter-search', 'value')],
+        State('logs-table', 'page_size'),
+    )
+    def update_logs_table(page_current, sort_by, category, action_type, start_date, end_date, search, page_size):
+        """Load one page of logs with sorting and filtering pushed into SQL"""
+        from dash import callback_context
+
+        # Any filter or sort change starts again from the first page
+        triggered = [t['prop_id'] for t in callback_context.triggered]
+        page = page_current or 0
+        if any(not prop_id.startswith('logs-table.page_current') for prop_id in triggered):
+            page = 0
+
+        logs_df, total = db.get_logs_page(
+            page=page,
+            page_size=page_size,
+            sort_by=sort_by,
+            category=category,
+            action_type=action_type,
+            start_date=start_date[:10] if start_date else None,
+            end_date=end_date[:10] if end_date else None,
+            search=search,
+        )
+
+        page_count = max(math.ceil(total / page_size), 1)
+        total_text = f"Total entries: {total:,}"
+
+        return logs_df.to_dict('records'), page_count, page, total_text
+
+    @app.callback(
+        Output('logs-search-hits', 'children'),
+        Input('logs-filter-search', 'value'),
+        prevent_initial_call=True
+    )
+    def search_logs(query):
+        """Show ranked full-text hits with snippets for the logs search box"""
+        from components.search import render_search_results
+
+        return render_search_results(query, log_hits=db.search_logs(query))
+
+    @app.callback(
+        Output('slow-queries-panel', 'children'),
+        Input('clear-slow-queries-btn', 'n_clicks'),
+        prevent_initial_call=True
+    )
+    def clear_slow_queries(n_clicks):
+        """Empty the slow query log and reset the per-statement totals"""
+        from components.logs import SLOW_QUERY_STATEMENTS, render_slow_queries
+
+        db.clear_slow_queries()
+        return render_slow_queries(db.get_slow_queries(), db.get_statement_stats(SLOW_QUERY_STATEMENTS),
+                                   db.sql_tracer.slow_ms)
+
     @app.callback(
         [Output('logs-status-message', 'children'),
          Output('tab-content', 'children', allow_duplicate=True)],
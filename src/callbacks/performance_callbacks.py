@@ -0,0 +1,55 @@
+"""
+Callbacks for the Maintenance tab performance panel and the Settings profiling controls
+"""
+import os
+
+from dash import html, Output, Input, State, callback_context
+
+from components.callback_metrics_panel import render_callback_metrics, render_profile_reports
+
+
+def register_performance_callbacks(app, metrics):
+    """Register the callback metrics panel and profiling callbacks"""
+
+    @app.callback(
+        Output('callback-metrics-panel', 'children'),
+        [Input('refresh-callback-metrics-btn', 'n_clicks'),
+         Input('reset-callback-metrics-btn', 'n_clicks')],
+        prevent_initial_call=True
+    )
+    def update_callback_metrics(refresh_clicks, reset_clicks):
+        """Re-render the latency table, clearing the stats first on Reset"""
+        if callback_context.triggered and callback_context.triggered[0]['prop_id'].startswith('reset-'):
+            metrics.reset()
+        else:
+            metrics.flush()
+        return render_callback_metrics(metrics.summaries(), metrics.started, metrics.persist)
+
+    @app.callback(
+        Output('profile-reports-panel', 'children'),
+        Input('refresh-callback-metrics-btn', 'n_clicks'),
+        prevent_initial_call=True
+    )
+    def update_profile_reports(n_clicks):
+        """Re-list saved profiles"""
+        profiler = metrics.profiler
+        return render_profile_reports(profiler.list_reports(), profiler.status())
+
+    @app.callback(
+        Output('profile-status', 'children'),
+        Input('start-profiling-btn', 'n_clicks'),
+        [State('profile-count', 'value'),
+         State('profile-mode', 'value'),
+         State('profile-callback', 'value')],
+        prevent_initial_call=True
+    )
+    def start_profiling(n_clicks, count, mode, target):
+        """Arm the profiler for the next invocations"""
+        if not count or count < 1:
+            return html.Div("Enter how many invocations to profile.", style={'color': '#ef4444'})
+        metrics.profiler.arm(count, mode, target)
+        status = metrics.profiler.status()
+        return html.Div(f"Profiling the next {status['remaining']} invocation(s) of {target or 'any callback'} "
+                        f"handled by this worker process (pid {os.getpid()}) with the {mode} profiler. "
+                        f"Reports appear on the Maintenance tab.",
+                        style={'color': '#10b981'})
@@ -0,0 +1,18 @@
+"""
+Callbacks for full-text search
+"""
+from dash import Output, Input
+
+
+def register_search_callbacks(app, db):
+    """Register all search callbacks"""
+
+    @app.callback(
+        Output('journal-search-results', 'children'),
+        Input('journal-search-input', 'value'),
+        prevent_initial_call=True
+    )
+    def search_journal(query):
+        from components.search import render_search_results
+
+        return render_search_results(query, db.search_trades(query), db.search_logs(query))
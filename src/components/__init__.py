@@ -5,6 +5,9 @@ from .add_trade_form import render_add_trade_form
 from .analyze import render_analyze
 from .profits_by_price import render_profits_by_price
 from .logs import render_logs
+from .search import render_search_box
+from .equity_chart import render_equity_curve
 
 __all__ = ['render_hourly_chart', 'render_calendar', 'render_settings', 'render_add_trade_form',
-           'render_analyze', 'render_profits_by_price', 'logs']
\ No newline at end of file
+           'render_analyze', 'render_profits_by_price', 'logs', 'render_search_box',
+           'render_equity_curve']
\ No newline at end of file
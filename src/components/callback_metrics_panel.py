@@ -0,0 +1,149 @@
+"""
+Callback Metrics Panel Component
+Per-callback latency percentiles, call counts and payload sizes for the Maintenance tab
+"""
+import os
+from datetime import datetime
+
+from dash import html
+
+from callback_metrics import LATENCY_BUCKETS_MS
+
+CELL_STYLE = {'padding': '6px 8px', 'fontSize': '13px', 'textAlign': 'right', 'borderBottom': '1px solid #f3f4f6'}
+HEADER_STYLE = {'padding': '6px 8px', 'fontSize': '12px', 'backgroundColor': '#f3f4f6', 'fontWeight': '600',
+                'textAlign': 'right'}
+
+# Latency colors: fine, noticeable, slow
+SLOW_MS = (100, 500)
+
+
+def format_ms(value):
+    if value is None:
+        return '—'
+    return f"{value:,.0f} ms" if value >= 100 else f"{value:.1f} ms"
+
+
+def latency_color(value):
+    if value is None or value < SLOW_MS[0]:
+        return '#1f2937'
+    return '#f59e0b' if value < SLOW_MS[1] else '#ef4444'
+
+
+def format_bytes(value):
+    if value is None:
+        return '—'
+    for unit in ('B', 'KB', 'MB'):
+        if value < 1024:
+            return f"{value:,.0f} {unit}"
+        value /= 1024
+    return f"{value:,.1f} GB"
+
+
+def render_histogram(buckets):
+    """Tiny bar chart of the all-time latency histogram"""
+    peak = max(buckets) or 1
+    labels = [f"≤ {bound:g} ms" for bound in LATENCY_BUCKETS_MS] + [f"> {LATENCY_BUCKETS_MS[-1]:g} ms"]
+    return html.Div([
+        html.Div(title=f"{label}: {count:,}",
+                 style={'width': '5px', 'height': f"{max(count / peak * 100, 4 if count else 0)}%",
+                        'backgroundColor': '#3b82f6' if i < len(buckets) - 1 else '#ef4444',
+                        'marginRight': '1px', 'alignSelf': 'flex-end'})
+        for i, (label, count) in enumerate(zip(labels, buckets))
+    ], style={'display': 'flex', 'height': '24px', 'justifyContent': 'flex-end'})
+
+
+def render_callback_metrics(summaries, started=None, persisted=False):
+    """
+    Render the callback latency table
+
+    Args:
+        summaries: Result of CallbackMetrics.summaries
+        started: Epoch seconds the in-memory stats start from
+        persisted: Whether all-time counters include earlier runs
+
+    Returns:
+        Dash HTML component
+    """
+    since = datetime.fromtimestamp(started).strftime('%Y-%m-%d %H:%M') if started else None
+    note = (f"Percentiles over the last calls since {since}" if since else "Percentiles over the last calls") + \
+        ("; counts and histograms include earlier runs." if persisted else ".")
+
+    if not summaries:
+        return html.Div([
+            html.P("No callbacks recorded yet.", style={'color': '#9ca3af', 'fontSize': '13px'}),
+        ])
+
+    header = html.Tr([html.Th("Callback", style={**HEADER_STYLE, 'textAlign': 'left'})] +
+                     [html.Th(label, style=HEADER_STYLE) for label in
+                      ("Calls", "Errors", "p50", "p95", "p99", "Max", "Avg Payload", "Total", "Histogram")])
+    rows = [
+        html.Tr([
+            html.Td([
+                html.Div(s['name'], style={'fontWeight': '600'}),
+                html.Div(s['outputs'], style={'fontSize': '11px', 'color': '#9ca3af'}),
+            ], style={**CELL_STYLE, 'textAlign': 'left'}),
+            html.Td(f"{s['count']:,}", style=CELL_STYLE),
+            html.Td(f"{s['errors']:,}", style={**CELL_STYLE, 'color': '#ef4444' if s['errors'] else '#9ca3af'}),
+            html.Td(format_ms(s['p50_ms']), style={**CELL_STYLE, 'color': latency_color(s['p50_ms'])}),
+            html.Td(format_ms(s['p95_ms']), style={**CELL_STYLE, 'color': latency_color(s['p95_ms'])}),
+            html.Td(format_ms(s['p99_ms']), style={**CELL_STYLE, 'color': latency_color(s['p99_ms'])}),
+            html.Td(format_ms(s['max_ms']), style={**CELL_STYLE, 'color': latency_color(s['max_ms'])}),
+            html.Td(format_bytes(s['avg_payload_bytes']), style=CELL_STYLE),
+            html.Td(format_ms(s['total_ms']), style=CELL_STYLE),
+            html.Td(render_histogram(s['buckets']), style=CELL_STYLE),
+        ])
+        for s in summaries
+    ]
+
+    return html.Div([
+        html.P(note, style={'fontSize': '12px', 'color': '#9ca3af', 'margin': '0 0 10px 0'}),
+        html.Table([html.Thead(header), html.Tbody(rows)], style={'width': '100%', 'borderCollapse': 'collapse'}),
+    ])
+
+
+def render_profile_reports(reports, status=None):
+    """
+    Render the list of saved callback profiles
+
+    Args:
+        reports: Result of CallbackProfiler.list_reports
+        status: Result of CallbackProfiler.status (shows pending invocations)
+
+    Returns:
+        Dash HTML component
+    """
+    note = None
+    if status and status['remaining']:
+        note = html.P(f"Profiling the next {status['remaining']} invocation(s) of "
+                      f"{status['target'] or 'any callback'} in worker process {os.getpid()} ({status['mode']}).",
+                      style={'fontSize': '12px', 'color': '#3b82f6', 'margin': '0 0 10px 0'})
+
+    if not reports:
+        return html.Div([
+            note,
+            html.P("No profiles saved yet. Start one from the Settings tab.",
+                   style={'color': '#9ca3af', 'fontSize': '13px'}),
+        ])
+
+    header = html.Tr([html.Th(label, style={**HEADER_STYLE, 'textAlign': 'left'}) for label in
+                      ("Time", "Callback", "Profiler", "Duration", "Size", "Report")])
+    rows = [
+        html.Tr([
+            html.Td(r['time'], style={**CELL_STYLE, 'textAlign': 'left'}),
+            html.Td(r['callback'], style={**CELL_STYLE, 'textAlign': 'left', 'fontWeight': '600'}),
+            html.Td(r['mode'], style={**CELL_STYLE, 'textAlign': 'left'}),
+            html.Td(format_ms(r['duration_ms']), style={**CELL_STYLE, 'textAlign': 'left',
+                                                        'color': latency_color(r['duration_ms'])}),
+            html.Td(format_bytes(r['size']), style={**CELL_STYLE, 'textAlign': 'left'}),
+            html.Td(html.A(r['file'].rsplit('.', 1)[-1], href=f"/profiles/{r['file']}", target='_blank'),
+                    style={**CELL_STYLE, 'textAlign': 'left'}),
+        ])
+        for r in reports
+    ]
+
+    return html.Div([
+        note,
+        html.P(".folded files are collapsed stacks for flamegraph.pl or speedscope; .prof files open in "
+               "snakeviz or speedscope.", style={'fontSize': '12px', 'color': '#9ca3af', 'margin': '0 0 10px 0'}),
+        html.Table([html.Thead(header), html.Tbody(rows)], style={'width': '100%', 'borderCollapse': 'collapse'}),
+    ])
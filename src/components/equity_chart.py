@@ -0,0 +1,61 @@
+"""
+Equity Curve Component
+Shows the daily account balance with its drawdown from the running peak
+"""
+from dash import html, dcc
+import plotly.graph_objs as go
+from plotly.subplots import make_subplots
+
+
+def render_equity_curve(db):
+    """
+    Render the equity curve and drawdown chart
+
+    Args:
+        db: TradingDatabase instance
+
+    Returns:
+        Dash HTML component
+    """
+    curve = db.get_equity_curve()
+
+    if len(curve) == 0:
+        return html.Div([
+            html.H3("Equity Curve", style={'margin': '0', 'color': '#1f2937'}),
+            html.P("No account history yet",
+                   style={'textAlign': 'center', 'color': '#9ca3af', 'padding': '40px'})
+        ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px', 'marginBottom': '20px'})
+
+    summary = db.get_drawdown_summary()
+
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.7, 0.3], vertical_spacing=0.05)
+    fig.add_trace(go.Scatter(x=curve['date'], y=curve['balance'], name='Balance',
+                             line={'color': '#3b82f6', 'width': 2}), row=1, col=1)
+    fig.add_trace(go.Scatter(x=curve['date'], y=curve['peak_balance'], name='Balance at Peak',
+                             line={'color': '#9ca3af', 'width': 1, 'dash': 'dot'}), row=1, col=1)
+    fig.add_trace(go.Scatter(x=curve['date'], y=curve['drawdown'], name='Drawdown', fill='tozeroy',
+                             line={'color': '#ef4444', 'width': 1}), row=2, col=1)
+    fig.update_layout(template='plotly_white', height=380, margin={'l': 50, 'r': 20, 't': 10, 'b': 30},
+                      legend={'orientation': 'h', 'y': 1.08})
+    fig.update_yaxes(title_text='Balance ($)', row=1, col=1)
+    fig.update_yaxes(title_text='Drawdown ($)', row=2, col=1)
+
+    def stat(label, value, color='#1f2937'):
+        return html.Div([
+            html.Span(label, style={'fontSize': '12px', 'color': '#6b7280', 'marginRight': '6px'}),
+            html.Span(value, style={'fontSize': '14px', 'fontWeight': '600', 'color': color}),
+        ])
+
+    return html.Div([
+        html.Div([
+            html.H3("Equity Curve", style={'margin': '0', 'color': '#1f2937'}),
+            html.Div([
+                stat("Current DD", f"${summary['current_drawdown']:,.2f} ({summary['current_drawdown_pct']:.1f}%)",
+                     '#ef4444' if summary['current_drawdown'] < 0 else '#10b981'),
+                stat("Days in DD", str(summary['current_drawdown_days'])),
+                stat("Max DD", f"${summary['max_drawdown']:,.2f} ({summary['max_drawdown_pct']:.1f}%)", '#ef4444'),
+                stat("Longest DD", f"{summary['longest_drawdown_days']} days"),
+            ], style={'display': 'flex', 'gap': '20px'}),
+        ], style={'display': 'flex', 'justifyContent': 'space-between', 'alignItems': 'center'}),
+        dcc.Graph(figure=fig, config={'displayModeBar': False}),
+    ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px', 'marginBottom': '20px'})
@@ -5,6 +5,21 @@ Shows net P/L grouped by 15-minute intervals during trading hours
 from dash import html
 
 
+def render_interval(bounds, max_pnl, intervals, class_name):
+    """
+    Render a confidence interval whisker on the same scale as the bars
+
+    Returns:
+        (whisker component or None, hover text)
+    """
+    if not bounds or max_pnl <= 0:
+        return None, None
+    low, high = bounds
+    whisker = html.Div(className=class_name, style={'left': f'{50 + low / max_pnl * 45}%',
+                                                    'width': f'{(high - low) / max_pnl * 45}%'})
+    return whisker, f"{intervals['confidence']}% CI: ${low:,.0f} to ${high:,.0f}"
+
+
 def render_hourly_chart(db):
     """
     Render hourly performance chart
@@ -24,8 +39,13 @@ def render_hourly_chart(db):
                    style={'textAlign': 'center', 'color': '#9ca3af', 'padding': '40px'})
         ], className='hourly-chart')
 
-    # Find max absolute value for scaling
-    max_pnl = max(abs(item['pnl']) for item in hourly_data)
+    # Bootstrap confidence intervals per bucket, drawn as whiskers
+    intervals = db.get_bootstrap_intervals()
+    bounds = intervals['hourly'] if intervals else {}
+
+    # Find max absolute value for scaling (whiskers included, so they stay inside the row)
+    max_pnl = max(max(abs(item['pnl']), *(abs(b) for b in bounds.get(item['time'], ())))
+                  for item in hourly_data)
 
     hourly_rows = []
     for item in hourly_data:
@@ -60,14 +80,17 @@ def render_hourly_chart(db):
                 style={'right': f'calc(50% + {max(width_percent - 8, 0)}%)'}  # Position inside bar
             )
 
+        whisker, hint = render_interval(bounds.get(time_label), max_pnl, intervals, 'hourly-ci')
+
         hourly_rows.append(
             html.Div([
                 html.Div(time_label, className='hourly-time'),
                 html.Div([
                     html.Div(className='hourly-center-line'),
                     bar,
+                    whisker,
                     amount
-                ], className='hourly-bar-container')
+                ], className='hourly-bar-container', title=hint)
             ], className='hourly-row')
         )
 
@@ -2,23 +2,30 @@
 Logs Component
 Display system and user action logs
 """
-from dash import html, dash_table
-import pandas as pd
+from dash import html, dcc, dash_table
 
+LOGS_PAGE_SIZE = 50
+
+# Most expensive statements shown under the slow query log
+SLOW_QUERY_STATEMENTS = 15
+
+SQL_CELL_STYLE = {'padding': '6px 8px', 'fontSize': '12px', 'borderBottom': '1px solid #f3f4f6',
+                  'textAlign': 'right', 'verticalAlign': 'top'}
+SQL_HEADER_STYLE = {'padding': '6px 8px', 'fontSize': '12px', 'backgroundColor': '#f3f4f6', 'fontWeight': '600',
+                    'textAlign': 'right'}
+SQL_TEXT_STYLE = {**SQL_CELL_STYLE, 'textAlign': 'left', 'fontFamily': 'monospace', 'maxWidth': '600px',
+                  'overflow': 'hidden', 'textOverflow': 'ellipsis', 'whiteSpace': 'nowrap'}
 
-def render_logs(db):
-    """Render the logs page"""
-    logs_df = db.get_all_logs()
 
-    # Format timestamp for display
-    if len(logs_df) > 0:
-        logs_df['timestamp'] = pd.to_datetime(logs_df['timestamp']).dt.strftime('%Y-%m-%d %H:%M:%S')
+def render_logs(db):
+    """Render the logs page (rows are loaded page by page by the logs table callback)"""
+    filter_options = db.get_log_filter_options()
 
     return html.Div([
         html.Div([
             html.Div([
                 html.H2("System Logs", style={'marginBottom': '10px', 'color': '#1f2937'}),
-                html.P(f"Total entries: {len(logs_df)}",
+                html.P("Total entries: --", id='logs-total-count',
                        style={'color': '#6b7280', 'marginBottom': '0'}),
             ], style={'flex': '1'}),
 
@@ -47,28 +54,86 @@ def render_logs(db):
         # Status message
         html.Div(id='logs-status-message', style={'marginBottom': '15px'}),
 
+        # Filters (applied in SQL by the logs table callback)
+        render_logs_filters(filter_options),
+
+        # Ranked full-text hits for the search filter
+        html.Div(id='logs-search-hits', style={'marginBottom': '15px'}),
+
         # Logs table
         html.Div([
-            render_logs_table(logs_df) if len(logs_df) > 0 else html.P(
-                "No logs yet. System will automatically log all actions.",
-                style={'textAlign': 'center', 'color': '#9ca3af', 'padding': '60px',
-                       'backgroundColor': '#f9fafb', 'borderRadius': '8px'}
-            )
-        ])
+            render_logs_table()
+        ]),
+
+        # Slow SQL statements and per-statement totals
+        html.Div([
+            html.Div([
+                html.H3("Slow Queries", style={'margin': '0', 'color': '#1f2937', 'flex': '1'}),
+                html.Button('Clear', id='clear-slow-queries-btn', n_clicks=0,
+                            style={'backgroundColor': '#6b7280', 'color': 'white', 'padding': '8px 16px',
+                                   'border': 'none', 'borderRadius': '6px', 'cursor': 'pointer',
+                                   'fontSize': '13px'}),
+            ], style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '10px'}),
+            html.Div(render_slow_queries(db.get_slow_queries(), db.get_statement_stats(SLOW_QUERY_STATEMENTS),
+                                         db.sql_tracer.slow_ms),
+                     id='slow-queries-panel'),
+        ], style={'marginTop': '30px'}),
 
     ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px', 'maxWidth': '1400px'})
 
 
-def render_logs_table(logs_df):
-    """Render the logs as a table"""
-    if len(logs_df) == 0:
-        return html.P("No logs", style={'textAlign': 'center', 'color': '#9ca3af', 'padding': '20px'})
+def render_logs_filters(filter_options):
+    """Render the category / action / date range / text filters for the logs table"""
+    label_style = {'fontSize': '12px', 'fontWeight': '500', 'color': '#6b7280', 'marginBottom': '4px',
+                   'display': 'block'}
+
+    return html.Div([
+        html.Div([
+            html.Label("Category", style=label_style),
+            dcc.Dropdown(
+                id='logs-filter-category',
+                options=[{'label': c, 'value': c} for c in filter_options['categories']],
+                placeholder='All categories',
+                clearable=True,
+            ),
+        ], style={'flex': '1', 'marginRight': '10px'}),
+        html.Div([
+            html.Label("Action", style=label_style),
+            dcc.Dropdown(
+                id='logs-filter-action',
+                options=[{'label': a, 'value': a} for a in filter_options['action_types']],
+                placeholder='All actions',
+                clearable=True,
+            ),
+        ], style={'flex': '1', 'marginRight': '10px'}),
+        html.Div([
+            html.Label("Time Range", style=label_style),
+            dcc.DatePickerRange(
+                id='logs-filter-dates',
+                display_format='YYYY-MM-DD',
+                clearable=True,
+            ),
+        ], style={'marginRight': '10px'}),
+        html.Div([
+            html.Label("Search", style=label_style),
+            dcc.Input(
+                id='logs-filter-search',
+                type='text',
+                placeholder='Text in description or details',
+                debounce=True,
+                style={'width': '100%', 'padding': '8px', 'borderRadius': '6px',
+                       'border': '1px solid #d1d5db', 'fontSize': '14px'}
+            ),
+        ], style={'flex': '2'}),
+    ], style={'display': 'flex', 'alignItems': 'flex-end', 'marginBottom': '20px', 'padding': '15px',
+              'backgroundColor': '#f9fafb', 'borderRadius': '6px', 'border': '1px solid #e5e7eb'})
 
-    # Select columns to display
-    display_df = logs_df[['timestamp', 'action_category', 'action_type', 'description', 'details']].copy()
 
+def render_logs_table():
+    """Render the logs table; paging, sorting and filtering happen server-side"""
     return dash_table.DataTable(
-        data=display_df.to_dict('records'),
+        id='logs-table',
+        data=[],
         columns=[
             {'name': 'Timestamp', 'id': 'timestamp'},
             {'name': 'Category', 'id': 'action_category'},
@@ -127,7 +192,62 @@ def render_logs_table(logs_df):
                 'backgroundColor': '#f9fafb'
             }
         ],
-        page_size=50,
-        sort_action='native',
-        filter_action='native',
-    )
\ No newline at end of file
+        page_current=0,
+        page_size=LOGS_PAGE_SIZE,
+        page_count=1,
+        page_action='custom',
+        sort_action='custom',
+        sort_mode='single',
+        sort_by=[],
+    )
+
+def render_sql_table(columns, rows):
+    """Render a compact table; the first column is left-aligned"""
+    header = html.Tr([html.Th(c, style={**SQL_HEADER_STYLE, 'textAlign': 'left'} if i == 0 else SQL_HEADER_STYLE)
+                      for i, c in enumerate(columns)])
+    return html.Table([html.Thead(header), html.Tbody(rows)],
+                      style={'width': '100%', 'borderCollapse': 'collapse', 'tableLayout': 'fixed'})
+
+
+def render_slow_queries(slow_queries, statement_stats, threshold_ms):
+    """
+    Render the slow query log and the most expensive statements
+
+    Args:
+        slow_queries: Result of db.get_slow_queries
+        statement_stats: Result of db.get_statement_stats
+        threshold_ms: Slow query threshold
+    """
+    slow_rows = [
+        html.Tr([
+            html.Td(row['sql'], title=row['sql'], style=SQL_TEXT_STYLE),
+            html.Td(row['timestamp'], style=SQL_CELL_STYLE),
+            html.Td(row['source'] or '', style=SQL_CELL_STYLE),
+            html.Td(f"{row['rows']:,}", style=SQL_CELL_STYLE),
+            html.Td(f"{row['duration_ms']:,.1f} ms",
+                    style={**SQL_CELL_STYLE, 'color': '#ef4444', 'fontWeight': '600'}),
+        ])
+        for row in slow_queries.to_dict('records')
+    ]
+    stat_rows = [
+        html.Tr([
+            html.Td(s['statement'], title=s['statement'], style=SQL_TEXT_STYLE),
+            html.Td(s['source'] or '', style=SQL_CELL_STYLE),
+            html.Td(f"{s['count']:,}", style=SQL_CELL_STYLE),
+            html.Td(f"{s['rows']:,}", style=SQL_CELL_STYLE),
+            html.Td(f"{s['avg_ms']:,.1f} ms", style=SQL_CELL_STYLE),
+            html.Td(f"{s['max_ms']:,.1f} ms", style=SQL_CELL_STYLE),
+            html.Td(f"{s['total_ms']:,.1f} ms", style={**SQL_CELL_STYLE, 'fontWeight': '600'}),
+        ])
+        for s in statement_stats
+    ]
+
+    note_style = {'fontSize': '12px', 'color': '#9ca3af', 'margin': '0 0 8px 0'}
+    return html.Div([
+        html.P(f"Statements slower than {threshold_ms:g} ms, newest first.", style=note_style),
+        render_sql_table(["Statement", "Time", "Source", "Rows", "Duration"], slow_rows) if slow_rows else
+        html.P("No slow statements logged.", style={'fontSize': '13px', 'color': '#6b7280'}),
+        html.H4("Most expensive statements since startup",
+                style={'fontSize': '14px', 'color': '#374151', 'margin': '20px 0 8px 0'}),
+        render_sql_table(["Statement", "Source", "Calls", "Rows", "Avg", "Max", "Total"], stat_rows),
+    ])
@@ -0,0 +1,53 @@
+"""
+Metrics Panel Component
+Risk and edge statistics from the running metrics engine
+"""
+from dash import html
+
+
+def format_ratio(value, digits=2):
+    return '—' if value is None else f"{value:.{digits}f}"
+
+
+def render_metric(label, value, hint, color='#1f2937'):
+    """Render one labelled metric"""
+    return html.Div([
+        html.P(label, style={'fontSize': '12px', 'color': '#6b7280', 'margin': '0 0 4px 0'}),
+        html.P(value, style={'fontSize': '20px', 'fontWeight': '700', 'color': color, 'margin': '0'}),
+        html.P(hint, style={'fontSize': '11px', 'color': '#9ca3af', 'margin': '4px 0 0 0'}),
+    ], style={'textAlign': 'center', 'flex': '1'})
+
+
+def render_metrics_panel(metrics, intervals=None):
+    """
+    Render the extended stats row on the dashboard
+
+    Args:
+        metrics: Result of db.get_trade_metrics (None without trades)
+        intervals: Optional result of db.get_bootstrap_intervals, for the expectancy interval
+
+    Returns:
+        Dash HTML component
+    """
+    if not metrics:
+        return html.Div()
+
+    expectancy_color = '#10b981' if metrics['expectancy'] >= 0 else '#ef4444'
+    profit_factor = metrics['profit_factor']
+
+    expectancy_hint = "Average P/L per trade"
+    low, high = intervals['stats']['expectancy'] if intervals else (None, None)
+    if low is not None:
+        expectancy_hint = f"{intervals['confidence']}% CI: ${low:,.2f} to ${high:,.2f}"
+
+    return html.Div([
+        render_metric("Profit Factor", format_ratio(profit_factor), "Gross wins / gross losses",
+                      '#10b981' if profit_factor is None or profit_factor >= 1 else '#ef4444'),
+        render_metric("Expectancy", f"${metrics['expectancy']:,.2f}", expectancy_hint, expectancy_color),
+        render_metric("Payoff Ratio", format_ratio(metrics['payoff_ratio']), "Avg win / avg loss"),
+        render_metric("Std Dev", f"${metrics['std_dev']:,.2f}", "Per-trade P/L"),
+        render_metric("SQN", format_ratio(metrics['sqn']), f"{metrics['total_trades']} trades"),
+        render_metric("Sharpe", format_ratio(metrics['sharpe']), "Daily P/L, annualized"),
+        render_metric("Sortino", format_ratio(metrics['sortino']), f"{metrics['trading_days']} trading days"),
+    ], style={'display': 'flex', 'gap': '10px', 'backgroundColor': 'white', 'padding': '20px',
+              'borderRadius': '8px', 'marginBottom': '20px', 'boxShadow': '0 1px 3px rgba(0,0,0,0.1)'})
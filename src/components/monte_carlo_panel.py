@@ -0,0 +1,74 @@
+"""
+Monte Carlo Panel Component
+Projected equity range, risk of ruin and drawdown percentiles over the next N trades
+"""
+from dash import html, dcc
+import plotly.graph_objs as go
+
+
+def render_monte_carlo(simulation):
+    """
+    Render the Monte Carlo projection panel
+
+    Args:
+        simulation: Result of db.get_monte_carlo (None with too few trades)
+
+    Returns:
+        Dash HTML component
+    """
+    if simulation is None:
+        return html.Div()
+
+    bands = simulation['bands']
+    trades = bands['trade']
+
+    fig = go.Figure()
+    # Outer band first, so the inner band draws on top
+    for low, high, color in ((5, 95, 'rgba(59,130,246,0.12)'), (25, 75, 'rgba(59,130,246,0.25)')):
+        fig.add_trace(go.Scatter(x=trades, y=bands[high], line={'width': 0}, showlegend=False,
+                                 hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=trades, y=bands[low], line={'width': 0}, fill='tonexty', fillcolor=color,
+                                 name=f"{low}th-{high}th percentile"))
+    fig.add_trace(go.Scatter(x=trades, y=bands[50], name='Median', line={'color': '#3b82f6', 'width': 2}))
+    fig.add_hline(y=simulation['start_capital'], line={'color': '#9ca3af', 'dash': 'dot', 'width': 1})
+    fig.add_hline(y=simulation['ruin_equity'], line={'color': '#ef4444', 'dash': 'dash', 'width': 1},
+                  annotation_text='Ruin', annotation_position='bottom right')
+    fig.update_layout(template='plotly_white', height=320, margin={'l': 50, 'r': 20, 't': 10, 'b': 40},
+                      xaxis_title='Trades from now', yaxis_title='Equity ($)',
+                      legend={'orientation': 'h', 'y': 1.1})
+
+    def stat(label, value, color='#1f2937'):
+        return html.Div([
+            html.P(label, style={'fontSize': '12px', 'color': '#6b7280', 'margin': '0 0 4px 0'}),
+            html.P(value, style={'fontSize': '18px', 'fontWeight': '700', 'color': color, 'margin': '0'}),
+        ], style={'marginBottom': '12px'})
+
+    drawdowns = simulation['drawdown_percentiles']
+    drawdown_pcts = simulation['drawdown_pct_percentiles']
+    drawdown_rows = [
+        html.Tr([
+            html.Td(f"{p}th", style={'padding': '4px 8px', 'fontSize': '12px', 'color': '#6b7280'}),
+            html.Td(f"${drawdowns[p]:,.0f}", style={'padding': '4px 8px', 'fontSize': '13px', 'textAlign': 'right'}),
+            html.Td('' if drawdown_pcts[p] is None else f"{drawdown_pcts[p]:.1f}%",
+                    style={'padding': '4px 8px', 'fontSize': '13px', 'textAlign': 'right', 'color': '#ef4444'}),
+        ])
+        for p in drawdowns
+    ]
+
+    return html.Div([
+        html.H3(f"Next {simulation['n_trades']} Trades (Monte Carlo)", style={'margin': '0', 'color': '#1f2937'}),
+        html.P(f"{simulation['n_paths']:,} paths resampled from your trade history, "
+               f"starting at ${simulation['start_capital']:,.2f}",
+               style={'fontSize': '13px', 'color': '#6b7280', 'margin': '5px 0 0 0'}),
+        html.Div([
+            html.Div([dcc.Graph(figure=fig, config={'displayModeBar': False})], style={'flex': '3'}),
+            html.Div([
+                stat("Risk of Ruin", f"{simulation['risk_of_ruin']:.2f}%",
+                     '#ef4444' if simulation['risk_of_ruin'] > 1 else '#10b981'),
+                stat("Chance of Profit", f"{simulation['profit_probability']:.1f}%"),
+                stat("Median Outcome", f"${simulation['final_percentiles'][50]:,.0f}"),
+                html.P("Max drawdown percentiles", style={'fontSize': '12px', 'color': '#6b7280', 'margin': '0'}),
+                html.Table(drawdown_rows, style={'width': '100%'}),
+            ], style={'flex': '1', 'paddingLeft': '20px'}),
+        ], style={'display': 'flex', 'alignItems': 'flex-start'}),
+    ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px', 'marginBottom': '20px'})
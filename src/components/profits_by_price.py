@@ -3,6 +3,7 @@ Profits by Price Band Component
 Shows total P/L grouped by entry price bands
 """
 from dash import html
+from .hourly_chart import render_interval
 
 
 def render_profits_by_price(db):
@@ -24,8 +25,13 @@ def render_profits_by_price(db):
                    style={'textAlign': 'center', 'color': '#9ca3af', 'padding': '40px'})
         ], className='price-chart')
 
-    # Find max absolute value for scaling
-    max_pnl = max(abs(item['pnl']) for item in price_data)
+    # Bootstrap confidence intervals per bucket, drawn as whiskers
+    intervals = db.get_bootstrap_intervals()
+    bounds = intervals['price_bands'] if intervals else {}
+
+    # Find max absolute value for scaling (whiskers included, so they stay inside the row)
+    max_pnl = max(max(abs(item['pnl']), *(abs(b) for b in bounds.get(item['price_band'], ())))
+                  for item in price_data)
 
     price_rows = []
     for item in price_data:
@@ -60,14 +66,17 @@ def render_profits_by_price(db):
                 style={'right': f'calc(50% + {max(width_percent - 8, 0)}%)'}  # Position inside bar
             )
 
+        whisker, hint = render_interval(bounds.get(price_band), max_pnl, intervals, 'price-ci')
+
         price_rows.append(
             html.Div([
                 html.Div(price_band, className='price-label'),
                 html.Div([
                     html.Div(className='price-center-line'),
                     bar,
+                    whisker,
                     amount
-                ], className='price-bar-container')
+                ], className='price-bar-container', title=hint)
             ], className='price-row')
         )
 
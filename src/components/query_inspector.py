@@ -0,0 +1,98 @@
+"""
+Query Inspector Component
+Shows EXPLAIN QUERY PLAN output and run counters for the Maintenance SQL console
+"""
+from dash import html
+
+# Representative copies of the queries behind the dashboard, for checking their plans
+DASHBOARD_QUERIES = {
+    'Calendar (month P/L)': "SELECT date, SUM(profit_loss) AS daily_pnl FROM trades "
+                            "WHERE strftime('%Y', date) = '2025' AND strftime('%m', date) = '11' GROUP BY date;",
+    'Streaks': "SELECT date, profit_loss FROM trades ORDER BY date ASC;",
+    'Hourly performance': "SELECT entry_time, profit_loss FROM trades;",
+    'Stock data enrichment': "SELECT id, ticker, date FROM trades "
+                             "WHERE data_fetched = 0 OR data_fetched IS NULL ORDER BY date DESC LIMIT 50;",
+    'Enrichment tickers for a day': "SELECT DISTINCT ticker FROM trades "
+                                    "WHERE date = '2025-11-11' AND (data_fetched = 0 OR data_fetched IS NULL);",
+    'Logs page': "SELECT * FROM logs WHERE action_category = 'TRADE' ORDER BY timestamp DESC, id DESC LIMIT 50;",
+}
+
+# Badge colors per plan step kind
+PLAN_KIND_STYLES = {
+    'index': ('INDEX', '#065f46', '#d1fae5'),
+    'scan': ('FULL SCAN', '#991b1b', '#fee2e2'),
+    'auto': ('AUTO INDEX', '#92400e', '#fef3c7'),
+    'temp': ('TEMP B-TREE', '#92400e', '#fef3c7'),
+    'other': ('', '#374151', '#f3f4f6'),
+}
+
+
+def render_plan_step(step):
+    """Render one EXPLAIN QUERY PLAN row, indented under its parent"""
+    label, color, background = PLAN_KIND_STYLES[step['kind']]
+    return html.Div([
+        html.Span(label, style={'fontSize': '10px', 'fontWeight': '700', 'color': color,
+                                'backgroundColor': background, 'padding': '2px 6px', 'borderRadius': '4px',
+                                'marginRight': '8px', 'minWidth': '80px', 'display': 'inline-block',
+                                'textAlign': 'center'}) if label else None,
+        html.Span(step['detail'], style={'fontFamily': 'monospace', 'fontSize': '13px', 'color': color}),
+    ], style={'padding': '4px 0', 'marginLeft': f"{step['depth'] * 24}px"})
+
+
+def render_stat(label, value):
+    """Render a single counter tile"""
+    return html.Div([
+        html.P(label, style={'fontSize': '11px', 'color': '#6b7280', 'margin': '0 0 4px 0'}),
+        html.P(value, style={'fontSize': '18px', 'fontWeight': '700', 'color': '#1f2937', 'margin': '0'}),
+    ], style={'padding': '10px 15px', 'backgroundColor': '#f9fafb', 'borderRadius': '6px',
+              'border': '1px solid #e5e7eb'})
+
+
+def render_query_plan(plan_result, run_result=None):
+    """
+    Render the Explain view of a console query
+
+    Args:
+        plan_result: Result of db.explain_query
+        run_result: Result of db.execute_query for the same query (None if it was not run)
+
+    Returns:
+        Dash HTML component
+    """
+    if not plan_result['success']:
+        return html.Div([
+            html.P(f"✗ {plan_result['message']}",
+                   style={'color': '#ef4444', 'padding': '15px', 'backgroundColor': '#fee2e2',
+                          'borderRadius': '6px', 'fontFamily': 'monospace', 'fontSize': '13px'})
+        ])
+
+    stats = [
+        render_stat("Full Scans", str(plan_result['full_scans'])),
+        render_stat("Index Lookups", str(plan_result['index_lookups'])),
+        render_stat("Temp B-Trees", str(plan_result['temp_btrees'])),
+        render_stat("VM Program Ops", f"{plan_result['program_ops']:,}"),
+    ]
+
+    if run_result is None:
+        run_note = html.P("Only read queries are executed in Explain mode; this plan was not run.",
+                          style={'fontSize': '12px', 'color': '#9ca3af', 'margin': '10px 0 0 0'})
+    elif not run_result['success']:
+        run_note = html.P(f"Run failed: {run_result['message']}",
+                          style={'fontSize': '12px', 'color': '#ef4444', 'margin': '10px 0 0 0'})
+    else:
+        stats += [
+            render_stat("Execution Time", f"{run_result['elapsed_ms']:,.1f} ms"),
+            render_stat("Rows Read", f"{run_result['rows_read']:,}"),
+            render_stat("VM Steps (≈)", f"{run_result['vm_steps']:,}"),
+        ]
+        run_note = html.P("Counters are for the first page of rows; VM steps are sampled by the progress handler.",
+                          style={'fontSize': '12px', 'color': '#9ca3af', 'margin': '10px 0 0 0'})
+
+    return html.Div([
+        html.H3("Query Plan", style={'margin': '0 0 10px 0', 'fontSize': '16px', 'color': '#1f2937'}),
+        html.Div([render_plan_step(step) for step in plan_result['plan']],
+                 style={'padding': '15px', 'backgroundColor': 'white', 'border': '1px solid #e5e7eb',
+                        'borderRadius': '6px', 'marginBottom': '15px'}),
+        html.Div(stats, style={'display': 'grid', 'gridTemplateColumns': 'repeat(4, 1fr)', 'gap': '10px'}),
+        run_note,
+    ], style={'padding': '20px', 'backgroundColor': '#f0f9ff', 'borderRadius': '8px', 'border': '1px solid #bfdbfe'})
@@ -0,0 +1,77 @@
+"""
+Returns Component
+Time-weighted and money-weighted returns, overall and per year and month
+"""
+from dash import html
+
+CELL_STYLE = {'padding': '8px 10px', 'fontSize': '13px', 'textAlign': 'right', 'borderBottom': '1px solid #f3f4f6'}
+HEADER_STYLE = {'padding': '8px 10px', 'fontSize': '12px', 'backgroundColor': '#f3f4f6', 'fontWeight': '600',
+                'textAlign': 'right'}
+
+
+def format_return(value):
+    """Percent with sign, or a dash when the return is undefined"""
+    return '—' if value is None else f"{value:+.2f}%"
+
+
+def return_color(value):
+    if value is None:
+        return '#9ca3af'
+    return '#10b981' if value >= 0 else '#ef4444'
+
+
+def render_period_table(title, periods):
+    """Render one breakdown table, newest period first"""
+    header = html.Tr([html.Th("Period", style={**HEADER_STYLE, 'textAlign': 'left'})] +
+                     [html.Th(label, style=HEADER_STYLE) for label in
+                      ("TWR", "MWR", "Trading P/L", "Net Deposits", "End Balance")])
+    rows = [
+        html.Tr([
+            html.Td(p['period'], style={**CELL_STYLE, 'textAlign': 'left', 'fontWeight': '600'}),
+            html.Td(format_return(p['twr']), style={**CELL_STYLE, 'color': return_color(p['twr'])}),
+            html.Td(format_return(p['mwr']), style={**CELL_STYLE, 'color': return_color(p['mwr'])}),
+            html.Td(f"${p['trading_pl']:,.2f}", style=CELL_STYLE),
+            html.Td(f"${p['net_flows']:,.2f}", style=CELL_STYLE),
+            html.Td(f"${p['end_balance']:,.2f}", style=CELL_STYLE),
+        ])
+        for p in reversed(periods)
+    ]
+    return html.Div([
+        html.H4(title, style={'fontSize': '14px', 'color': '#374151', 'margin': '20px 0 10px 0'}),
+        html.Table([html.Thead(header), html.Tbody(rows)], style={'width': '100%', 'borderCollapse': 'collapse'}),
+    ])
+
+
+def render_returns(returns):
+    """
+    Render the returns section of the Capital tab
+
+    Args:
+        returns: Result of db.get_returns
+
+    Returns:
+        Dash HTML component
+    """
+    total = returns['total']
+    if total is None:
+        return html.Div()
+
+    def tile(label, value, note):
+        return html.Div([
+            html.P(label, style={'fontSize': '12px', 'color': '#6b7280', 'margin': '0 0 5px 0'}),
+            html.H3(format_return(value), style={'color': return_color(value), 'margin': '0'}),
+            html.P(note, style={'fontSize': '11px', 'color': '#9ca3af', 'margin': '5px 0 0 0'}),
+        ], style={'textAlign': 'center', 'flex': '1'})
+
+    return html.Div([
+        html.H3("Returns", style={'marginBottom': '5px'}),
+        html.P(f"{total['start_date']} to {total['end_date']}",
+               style={'fontSize': '13px', 'color': '#6b7280', 'marginTop': '0'}),
+        html.Div([
+            tile("Time-Weighted", total['twr'], "Trading skill, ignores deposit timing"),
+            tile("Money-Weighted", total['mwr'], "What your dollars earned"),
+            tile("IRR (annualized)", total['irr_annualized'], "Shown after a full year"),
+        ], style={'display': 'flex', 'gap': '20px', 'padding': '15px 0', 'borderBottom': '1px solid #e5e7eb'}),
+        render_period_table("By Year", returns['yearly']),
+        render_period_table("By Month", returns['monthly']),
+    ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px', 'marginBottom': '20px'})
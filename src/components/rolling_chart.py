@@ -0,0 +1,59 @@
+"""
+Rolling Metrics Chart Component
+Shows whether the edge is improving: rolling win rate, average P/L and profit factor over
+the last N trades, and P/L over the last N trading days
+"""
+import numpy as np
+from dash import html, dcc
+import plotly.graph_objs as go
+from plotly.subplots import make_subplots
+
+WINDOW_COLORS = {20: '#3b82f6', 50: '#8b5cf6', 100: '#f59e0b', 5: '#10b981'}
+
+
+def render_rolling_metrics(rolling):
+    """
+    Render the rolling metrics chart
+
+    Args:
+        rolling: Result of db.get_rolling_metrics
+
+    Returns:
+        Dash HTML component
+    """
+    trades = rolling['trades']
+    days = rolling['days']
+
+    if not trades['date']:
+        return html.Div()
+
+    # NumPy arrays (None -> NaN) skip plotly's per-element validation and copying of lists
+    trade_numbers = np.arange(1, len(trades['date']) + 1)
+    hover_text = np.array([f"{date} {ticker}" for date, ticker in zip(trades['date'], trades['ticker'])])
+
+    fig = make_subplots(rows=4, cols=1, vertical_spacing=0.07,
+                        subplot_titles=("Win Rate (%)", "Average P/L ($)", "Profit Factor",
+                                        "Trailing Trading-Day P/L ($)"))
+    for window, values in trades['windows'].items():
+        color = WINDOW_COLORS.get(window, '#6b7280')
+        for row, key in ((1, 'win_rate'), (2, 'avg_pl'), (3, 'profit_factor')):
+            fig.add_trace(go.Scatter(x=trade_numbers, y=np.array(values[key], dtype=float), name=f"{window} trades",
+                                     legendgroup=f"trades-{window}", showlegend=(row == 1),
+                                     text=hover_text, line={'color': color, 'width': 1.5}),
+                          row=row, col=1)
+    fig.add_hline(y=1, line={'color': '#9ca3af', 'dash': 'dot', 'width': 1}, row=3, col=1)
+
+    for window, values in days['windows'].items():
+        fig.add_trace(go.Scatter(x=np.array(days['date']), y=np.array(values, dtype=float), name=f"{window} days",
+                                 line={'color': WINDOW_COLORS.get(window, '#6b7280'), 'width': 1.5}),
+                      row=4, col=1)
+    fig.add_hline(y=0, line={'color': '#9ca3af', 'width': 1}, row=4, col=1)
+
+    fig.update_xaxes(title_text='Trade #', row=3, col=1)
+    fig.update_layout(template='plotly_white', height=760, margin={'l': 50, 'r': 20, 't': 40, 'b': 30},
+                      legend={'orientation': 'h', 'y': 1.06})
+
+    return html.Div([
+        html.H3("Rolling Metrics", style={'margin': '0', 'color': '#1f2937'}),
+        dcc.Graph(figure=fig, config={'displayModeBar': False}),
+    ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px', 'marginBottom': '20px'})
@@ -0,0 +1,100 @@
+"""
+Search Component
+Full-text search over trade notes and log entries
+"""
+from dash import html, dcc
+from database import SNIPPET_START, SNIPPET_END
+
+
+def render_search_box():
+    """Render the journal search box shown on the dashboard"""
+    return html.Div([
+        html.Div([
+            dcc.Input(
+                id='journal-search-input',
+                type='text',
+                placeholder='Search trade notes and logs (e.g. halted, offering, "VWAP reclaim")',
+                debounce=True,
+                style={'flex': '1', 'padding': '10px', 'borderRadius': '6px',
+                       'border': '1px solid #d1d5db', 'fontSize': '14px'}
+            ),
+        ], style={'display': 'flex', 'alignItems': 'center'}),
+        html.Div(id='journal-search-results'),
+    ], style={'backgroundColor': 'white', 'padding': '20px', 'borderRadius': '8px', 'marginBottom': '20px',
+              'boxShadow': '0 1px 3px rgba(0,0,0,0.1)'})
+
+
+def render_snippet(snippet):
+    """Render an FTS snippet with the matched terms highlighted"""
+    parts = []
+    for i, chunk in enumerate((snippet or '').split(SNIPPET_START)):
+        if i == 0:
+            parts.append(chunk)
+            continue
+        match, _, rest = chunk.partition(SNIPPET_END)
+        parts.append(html.Mark(match, style={'backgroundColor': '#fef08a', 'padding': '0 2px'}))
+        parts.append(rest)
+    return html.Span(parts, style={'fontSize': '13px', 'color': '#374151'})
+
+
+def render_trade_hits(trade_hits):
+    """Render ranked trade note hits"""
+    rows = []
+    for hit in trade_hits:
+        pnl = hit['profit_loss'] or 0
+        rows.append(html.Div([
+            html.Span(hit['date'], style={'fontSize': '12px', 'color': '#6b7280', 'width': '90px'}),
+            html.Span(hit['ticker'], style={'fontWeight': '700', 'width': '70px'}),
+            html.Span(f"${pnl:,.2f}", style={'width': '90px', 'fontWeight': '600',
+                                             'color': '#10b981' if pnl > 0 else '#ef4444'}),
+            html.Div(render_snippet(hit['snippet']), style={'flex': '1'}),
+        ], style={'display': 'flex', 'gap': '10px', 'alignItems': 'baseline', 'padding': '8px 0',
+                  'borderBottom': '1px solid #f3f4f6'}))
+    return rows
+
+
+def render_log_hits(log_hits):
+    """Render ranked log hits"""
+    rows = []
+    for hit in log_hits:
+        rows.append(html.Div([
+            html.Span(hit['timestamp'], style={'fontSize': '12px', 'color': '#6b7280', 'width': '140px'}),
+            html.Span(hit['action_category'], style={'fontSize': '12px', 'fontWeight': '600', 'width': '80px'}),
+            html.Div(render_snippet(hit['snippet']), style={'flex': '1'}),
+        ], style={'display': 'flex', 'gap': '10px', 'alignItems': 'baseline', 'padding': '8px 0',
+                  'borderBottom': '1px solid #f3f4f6'}))
+    return rows
+
+
+def render_search_results(query, trade_hits=None, log_hits=None):
+    """
+    Render ranked search hits
+
+    Args:
+        query: The text that was searched
+        trade_hits: Results of db.search_trades (None to omit the section)
+        log_hits: Results of db.search_logs (None to omit the section)
+
+    Returns:
+        Dash HTML component
+    """
+    if not query or not query.strip():
+        return html.Div()
+
+    sections = []
+    if trade_hits is not None:
+        sections.append(html.Div([
+            html.H4(f"Trade Notes ({len(trade_hits)})",
+                    style={'margin': '15px 0 5px 0', 'fontSize': '14px', 'color': '#1f2937'}),
+            *(render_trade_hits(trade_hits) or [html.P("No matching notes",
+                                                       style={'fontSize': '13px', 'color': '#9ca3af'})]),
+        ]))
+    if log_hits is not None:
+        sections.append(html.Div([
+            html.H4(f"Logs ({len(log_hits)})",
+                    style={'margin': '15px 0 5px 0', 'fontSize': '14px', 'color': '#1f2937'}),
+            *(render_log_hits(log_hits) or [html.P("No matching logs",
+                                                   style={'fontSize': '13px', 'color': '#9ca3af'})]),
+        ]))
+
+    return html.Div(sections, style={'maxHeight': '400px', 'overflowY': 'auto'})
@@ -5,12 +5,13 @@ Allows users to customize colors and appearance
 from dash import html, dcc
 
 
-def render_settings(db):
+def render_settings(db, callback_names=None):
     """
     Render settings page
 
     Args:
         db: TradingDatabase instance
+        callback_names: Callbacks offered in the profiling filter
 
     Returns:
         Dash HTML component
@@ -167,4 +168,48 @@ def render_settings(db):
 
         ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px', 'maxWidth': '800px'}),
 
+        # Callback Profiling Section
+        html.Div([
+            html.H3("Callback Profiling", style={'marginBottom': '10px', 'color': '#374151', 'fontSize': '18px'}),
+            html.P("Profile the next callback invocations and save a report for each (listed on the Maintenance "
+                   "tab). Opening the dashboard with ?profile=N does the same for the page load. Only the worker "
+                   "process that handles the request is armed, so with several workers other requests may not "
+                   "be profiled.",
+                   style={'fontSize': '13px', 'color': '#6b7280', 'marginBottom': '15px'}),
+
+            html.Div([
+                html.Div([
+                    html.Label("Invocations", style={'fontSize': '14px', 'fontWeight': '500', 'marginBottom': '8px',
+                                                     'display': 'block'}),
+                    dcc.Input(id='profile-count', type='number', min=1, max=20, step=1, value=5,
+                              style={'width': '80px', 'padding': '8px', 'border': '1px solid #d1d5db',
+                                     'borderRadius': '6px'}),
+                ], style={'marginRight': '20px'}),
+                html.Div([
+                    html.Label("Profiler", style={'fontSize': '14px', 'fontWeight': '500', 'marginBottom': '8px',
+                                                  'display': 'block'}),
+                    dcc.RadioItems(id='profile-mode',
+                                   options=[{'label': ' Sampling (flame graph)', 'value': 'sampling'},
+                                            {'label': ' Deterministic (cProfile)', 'value': 'deterministic'}],
+                                   value='sampling',
+                                   labelStyle={'display': 'block', 'fontSize': '13px', 'marginBottom': '4px'}),
+                ], style={'marginRight': '20px'}),
+                html.Div([
+                    html.Label("Callback", style={'fontSize': '14px', 'fontWeight': '500', 'marginBottom': '8px',
+                                                  'display': 'block'}),
+                    dcc.Dropdown(id='profile-callback',
+                                 options=[{'label': name, 'value': name} for name in sorted(callback_names or [])],
+                                 placeholder='Any callback', style={'width': '260px'}),
+                ]),
+            ], style={'display': 'flex', 'alignItems': 'flex-start', 'marginBottom': '15px'}),
+
+            html.Button('Start Profiling', id='start-profiling-btn', n_clicks=0,
+                        style={'backgroundColor': '#3b82f6', 'color': 'white', 'padding': '10px 20px',
+                               'border': 'none', 'borderRadius': '6px', 'cursor': 'pointer',
+                               'fontSize': '14px', 'fontWeight': '600'}),
+            html.Div(id='profile-status', style={'marginTop': '15px', 'fontSize': '13px'}),
+
+        ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px', 'maxWidth': '800px',
+                  'marginTop': '20px'}),
+
     ], style={'maxWidth': '1200px'})
\ No newline at end of file
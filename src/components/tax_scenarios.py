@@ -0,0 +1,91 @@
+"""
+Tax Scenarios Component
+Sensitivity tables for the tax on trading income across what-if scenarios
+"""
+from dash import html
+from tax_engine import FILING_STATUS_LABELS
+
+HEADER_STYLE = {'padding': '10px', 'backgroundColor': '#f3f4f6', 'fontWeight': '600', 'fontSize': '13px',
+                'textAlign': 'right'}
+
+
+def render_tax_cell(tax, trading_income, highlight=False):
+    """Render one scenario: tax (or savings) and its effective rate"""
+    rate = f" ({tax / trading_income * 100:.1f}%)" if trading_income > 0 else ''
+    label = f"${tax:,.0f}{rate}" if tax >= 0 else f"-${-tax:,.0f} saved"
+    return html.Td(label, style={'padding': '10px', 'textAlign': 'right', 'fontSize': '13px',
+                                 'fontWeight': '700' if highlight else '400',
+                                 'color': '#10b981' if tax < 0 else '#1f2937',
+                                 'backgroundColor': '#fef3c7' if highlight else 'transparent'})
+
+
+def render_sensitivity_table(row_values, column_labels, values, projected_index, highlight_column):
+    """
+    Render a trading income x scenario table
+
+    Args:
+        row_values: Trading incomes, one per row
+        column_labels: Header per column
+        values: values[row][column] tax amounts
+        projected_index: Row of the year-end projection (None if there is none)
+        highlight_column: Column matching the saved tax settings
+    """
+    header = html.Tr([html.Th("Trading Income", style={**HEADER_STYLE, 'textAlign': 'left'})] +
+                     [html.Th(label, style=HEADER_STYLE) for label in column_labels])
+
+    rows = []
+    for i, (trading_income, row) in enumerate(zip(row_values, values)):
+        label = f"${trading_income:,.0f}"
+        if i == projected_index:
+            label += " (projected)"
+        rows.append(html.Tr(
+            [html.Td(label, style={'padding': '10px', 'fontSize': '13px', 'fontWeight': '600'})] +
+            [render_tax_cell(tax, trading_income, highlight=(i == projected_index and j == highlight_column))
+             for j, tax in enumerate(row)],
+            style={'borderBottom': '1px solid #e5e7eb'}))
+
+    return html.Table([html.Thead(header), html.Tbody(rows)],
+                      style={'width': '100%', 'borderCollapse': 'collapse', 'border': '1px solid #e5e7eb'})
+
+
+def render_tax_scenarios(scenarios):
+    """
+    Render the what-if section of the Tax Calculator
+
+    Args:
+        scenarios: Result of db.get_tax_scenarios
+
+    Returns:
+        Dash HTML component
+    """
+    if scenarios['projected_index'] is not None:
+        intro = (f"Year to date: ${scenarios['ytd_net']:,.2f} net. "
+                 f"At this pace the year ends near ${scenarios['projected_net']:,.0f}.")
+    else:
+        intro = f"Year to date: ${scenarios['ytd_net']:,.2f} net. No profit to project yet."
+
+    w2_incomes = scenarios['w2_incomes']
+    center = len(w2_incomes) // 2
+    income_labels = [f"W-2 ${income / 1000:,.0f}k" + (" (saved)" if i == center else '')
+                     for i, income in enumerate(w2_incomes)]
+    status_labels = [FILING_STATUS_LABELS[status] for status in scenarios['filing_statuses']]
+
+    return html.Div([
+        html.H3("What-If Scenarios", style={'marginBottom': '10px', 'color': '#1f2937'}),
+        html.P(intro, style={'fontSize': '14px', 'color': '#6b7280', 'marginBottom': '20px'}),
+
+        html.H4(f"By household W-2 income ({FILING_STATUS_LABELS[scenarios['filing_status']]})",
+                style={'fontSize': '14px', 'color': '#374151', 'margin': '0 0 10px 0'}),
+        render_sensitivity_table(scenarios['trading_incomes'], income_labels, scenarios['by_income'],
+                                 scenarios['projected_index'], center),
+
+        html.H4(f"By filing status (W-2 ${w2_incomes[center]:,.0f})",
+                style={'fontSize': '14px', 'color': '#374151', 'margin': '25px 0 10px 0'}),
+        render_sensitivity_table(scenarios['trading_incomes'], status_labels, scenarios['by_status'],
+                                 scenarios['projected_index'],
+                                 scenarios['filing_statuses'].index(scenarios['filing_status'])),
+
+        html.P("Federal + Georgia tax caused by trading income on top of W-2 income. "
+               "Net losses deduct up to the capital loss limit.",
+               style={'fontSize': '12px', 'color': '#9ca3af', 'marginTop': '10px'}),
+    ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px', 'marginBottom': '20px'})
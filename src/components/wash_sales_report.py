@@ -0,0 +1,63 @@
+"""
+Wash Sales Report Component
+Shows the losses disallowed by the wash sale rule for a tax year
+"""
+from dash import html
+
+CELL_STYLE = {'padding': '8px 10px', 'fontSize': '13px', 'borderBottom': '1px solid #f3f4f6'}
+HEADER_STYLE = {'padding': '8px 10px', 'fontSize': '12px', 'backgroundColor': '#f3f4f6', 'fontWeight': '600',
+                'textAlign': 'left'}
+
+
+def render_wash_sales(tax_data, wash_sales):
+    """
+    Render the wash sale section of the Tax Calculator
+
+    Args:
+        tax_data: Result of db.calculate_taxes_simple
+        wash_sales: Recent matches from db.get_wash_sales for the same year
+
+    Returns:
+        Dash HTML component
+    """
+    if not tax_data['wash_count']:
+        summary = html.P(f"No wash sales in {tax_data['year']}: every loss counts in full.",
+                         style={'fontSize': '14px', 'color': '#6b7280', 'margin': '0'})
+        return html.Div([
+            html.H3("Wash Sales", style={'marginBottom': '10px', 'color': '#1f2937'}),
+            summary,
+        ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px', 'marginBottom': '20px'})
+
+    summary = [
+        html.P(f"Wash sales on {tax_data['wash_count']} losing trades moved ${tax_data['wash_disallowed']:,.2f} of "
+               f"losses into the cost basis of the repurchases (counted once along chains of wash sales).",
+               style={'fontSize': '14px', 'color': '#374151', 'margin': '0 0 5px 0'}),
+    ]
+    if tax_data['wash_deferred']:
+        summary.append(html.P(f"${tax_data['wash_deferred']:,.2f} moves into {tax_data['year'] + 1} because the "
+                              f"repurchase happened after December 31.",
+                              style={'fontSize': '14px', 'color': '#b45309', 'margin': '0 0 5px 0'}))
+
+    header = html.Tr([html.Th(label, style=HEADER_STYLE) for label in
+                      ("Loss Date", "Ticker", "Shares", "Disallowed", "Repurchased", "Basis +/sh")])
+    rows = [
+        html.Tr([
+            html.Td(w['loss_date'], style=CELL_STYLE),
+            html.Td(w['ticker'], style={**CELL_STYLE, 'fontWeight': '600'}),
+            html.Td(f"{w['shares']:,.0f}", style=CELL_STYLE),
+            html.Td(f"${w['disallowed_loss']:,.2f}", style={**CELL_STYLE, 'color': '#ef4444'}),
+            html.Td(w['replacement_date'], style=CELL_STYLE),
+            html.Td(f"${w['basis_adjustment']:,.4f}", style=CELL_STYLE),
+        ])
+        for w in wash_sales
+    ]
+
+    return html.Div([
+        html.H3("Wash Sales", style={'marginBottom': '10px', 'color': '#1f2937'}),
+        *summary,
+        html.Table([html.Thead(header), html.Tbody(rows)],
+                   style={'width': '100%', 'borderCollapse': 'collapse', 'marginTop': '15px'}),
+        html.P(f"Showing the {len(wash_sales)} most recent matches. Gains and losses above already "
+               f"reflect these adjustments.",
+               style={'fontSize': '12px', 'color': '#9ca3af', 'marginTop': '10px'}),
+    ], style={'backgroundColor': 'white', 'padding': '30px', 'borderRadius': '8px', 'marginBottom': '20px'})
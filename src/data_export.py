@@ -0,0 +1,222 @@
+"""
+Streaming data export
+Writes trades, logs and capital transactions to CSV, Parquet or Arrow IPC
+in fixed-size chunks, so memory use stays flat no matter how large the history is.
+Parquet and Arrow output need pyarrow (pip install pyarrow).
+Usage: python data_export.py trades --format parquet --start 2025-01-01
+"""
+import csv
+import os
+import sys
+
+# Tables that can be exported and the column their date range applies to
+EXPORT_TABLES = {
+    'trades': 'date',
+    'logs': 'timestamp',
+    'capital_transactions': 'date',
+}
+
+EXPORT_FORMATS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+}
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def get_table_columns(conn, table):
+    """Get (name, declared type) pairs for a table"""
+    cursor = conn.execute(f'PRAGMA table_info({table})')
+    return [(row[1], (row[2] or '').upper()) for row in cursor.fetchall()]
+
+
+def build_export_query(conn, table, columns=None, start_date=None, end_date=None, order_by=None, limit=None):
+    """
+    Build the SELECT for an export
+
+    Args:
+        conn: Open sqlite3 connection
+        table: One of EXPORT_TABLES
+        columns: Column names to include (default: all)
+        start_date: First day to include, 'YYYY-MM-DD' (optional)
+        end_date: Last day to include, 'YYYY-MM-DD' (optional)
+        order_by: ORDER BY clause (default: date column, id)
+        limit: Maximum number of rows (optional)
+
+    Returns:
+        (query, params, [(name, declared type), ...])
+    """
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown table '{table}'. Choose from: {', '.join(EXPORT_TABLES)}")
+
+    table_columns = get_table_columns(conn, table)
+    if columns:
+        known = dict(table_columns)
+        unknown = [c for c in columns if c not in known]
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+        table_columns = [(c, known[c]) for c in columns]
+
+    date_column = EXPORT_TABLES[table]
+    clauses = []
+    params = []
+    if start_date:
+        clauses.append(f'{date_column} >= ?')
+        params.append(start_date)
+    if end_date:
+        # Inclusive end day, also for timestamp columns
+        clauses.append(f"{date_column} < date(?, '+1 day')")
+        params.append(end_date)
+
+    where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+    column_sql = ', '.join(f'"{name}"' for name, _ in table_columns)
+    query = f'SELECT {column_sql} FROM {table} {where_sql} ORDER BY {order_by or f"{date_column}, id"}'
+    if limit is not None:
+        query += ' LIMIT ?'
+        params.append(int(limit))
+    return query, params, table_columns
+
+
+def iter_chunks(cursor, chunk_size):
+    """Yield lists of rows from an executed cursor"""
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
+
+
+def arrow_type_for(declared_type):
+    """Map an SQLite declared column type to a pyarrow type"""
+    import pyarrow as pa
+
+    if 'INT' in declared_type:
+        return pa.int64()
+    if any(t in declared_type for t in ('REAL', 'FLOA', 'DOUB', 'NUMERIC')):
+        return pa.float64()
+    return pa.string()
+
+
+def write_csv(cursor, filename, table_columns, chunk_size):
+    """Stream rows into a CSV file"""
+    row_count = 0
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow([name for name, _ in table_columns])
+        for rows in iter_chunks(cursor, chunk_size):
+            writer.writerows(rows)
+            row_count += len(rows)
+    return row_count
+
+
+def write_arrow(cursor, filename, table_columns, chunk_size, fmt):
+    """Stream rows into a Parquet file or Arrow IPC file, one record batch per chunk"""
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(f"{fmt} export requires pyarrow. Install it with: pip install pyarrow")
+
+    schema = pa.schema([(name, arrow_type_for(declared)) for name, declared in table_columns])
+
+    if fmt == 'parquet':
+        writer = pa.parquet.ParquetWriter(filename, schema)
+    else:
+        writer = pa.ipc.new_file(filename, schema)
+
+    row_count = 0
+    try:
+        for rows in iter_chunks(cursor, chunk_size):
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*rows), schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            row_count += len(rows)
+    finally:
+        writer.close()
+    return row_count
+
+
+def export_table(db, filename, table='trades', fmt='csv', columns=None, start_date=None, end_date=None,
+                 chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Export one table to a file without loading it into memory
+
+    Args:
+        db: TradingDatabase instance
+        filename: Output path
+        table: 'trades', 'logs' or 'capital_transactions'
+        fmt: 'csv', 'parquet' or 'arrow'
+        columns: Column names to include (default: all)
+        start_date: First day to include, 'YYYY-MM-DD' (optional)
+        end_date: Last day to include, 'YYYY-MM-DD' (optional)
+        chunk_size: Rows fetched and written per chunk
+
+    Returns:
+        Number of rows written
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'. Choose from: {', '.join(EXPORT_FORMATS)}")
+
+    conn = db.get_connection()
+    try:
+        query, params, table_columns = build_export_query(conn, table, columns, start_date, end_date)
+        cursor = conn.execute(query, params)
+        if fmt == 'csv':
+            return write_csv(cursor, filename, table_columns, chunk_size)
+        return write_arrow(cursor, filename, table_columns, chunk_size, fmt)
+    finally:
+        conn.close()
+
+
+def export_history(db, directory='.', fmt='csv', tables=('trades',), columns=None, start_date=None,
+                   end_date=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Export several tables, one file each, named <table>_export.<ext>
+
+    Args:
+        columns: Optional {table: [column, ...]} selection per table
+        Other arguments as for export_table
+
+    Returns:
+        {filename: rows written}
+    """
+    written = {}
+    for table in tables:
+        filename = os.path.join(directory, f'{table}_export{EXPORT_FORMATS[fmt]}')
+        written[filename] = export_table(db, filename, table, fmt, (columns or {}).get(table),
+                                         start_date, end_date, chunk_size)
+    return written
+
+
+if __name__ == '__main__':
+    import argparse
+
+    sys.path.insert(0, 'src')
+    from database import TradingDatabase
+
+    parser = argparse.ArgumentParser(description='Export trading history in chunks')
+    parser.add_argument('tables', nargs='*', default=['trades'],
+                        help=f"Tables to export: {', '.join(EXPORT_TABLES)} (default: trades)")
+    parser.add_argument('--format', dest='fmt', default='csv', choices=list(EXPORT_FORMATS))
+    parser.add_argument('--columns', help='Comma-separated columns (single table only)')
+    parser.add_argument('--start', help='First date, YYYY-MM-DD')
+    parser.add_argument('--end', help='Last date, YYYY-MM-DD')
+    parser.add_argument('--dir', default='.', help='Output directory')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    unknown_tables = [t for t in args.tables if t not in EXPORT_TABLES]
+    if unknown_tables:
+        parser.error(f"unknown table(s): {', '.join(unknown_tables)}")
+
+    column_selection = None
+    if args.columns:
+        if len(args.tables) != 1:
+            parser.error('--columns can only be used when exporting a single table')
+        column_selection = {args.tables[0]: [c.strip() for c in args.columns.split(',') if c.strip()]}
+
+    results = export_history(TradingDatabase(), args.dir, args.fmt, args.tables, column_selection,
+                             args.start, args.end, args.chunk_size)
+    for path, count in results.items():
+        print(f"✓ Wrote {count:,} rows to {path}")
@@ -1,18 +1,82 @@
+import json
+import re
 import sqlite3
+import threading
+import time
 import pandas as pd
+from concurrent import futures
 from datetime import datetime
+from pathlib import Path
+
+from sql_trace import SQLTracer
+from write_queue import WRITE_TIMEOUT_SECONDS, WriteQueue
+from tax_engine import (FEDERAL_BRACKETS, household_w2_income, normalize_filing_status, tax_on_trading,
+                        trading_tax_grid)
+
+# Trailing parameters stripped from cache keys when counting hits per cache
+CACHE_KEY_PARAMS = re.compile(r'(_(?:None|-?\d+))+$')
+
+# Compact dtypes for trade frames (get_trades): repeated strings as categoricals, prices
+# and percentages as float32, counts as int32. profit_loss and position_size stay float64
+# since they are summed. Integer columns holding NULLs get the nullable equivalent.
+TRADE_DTYPES = {
+    'day_of_week': 'category',
+    'ticker': 'category',
+    'sector': 'category',
+    'news_type': 'category',
+    'auto_sector': 'category',
+    'stock_type': 'category',
+    'exchange': 'category',
+    'entry_price': 'float32',
+    'exit_price': 'float32',
+    'profit_loss_percent': 'float32',
+    'shares': 'int32',
+    'hold_duration': 'int32',
+    'is_win': 'int8',
+    'data_fetched': 'int8',
+    'id': 'int32',
+}
+
+# Markers wrapped around matched terms in full-text search snippets
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
 
 
 class TradingDatabase:
-    def __init__(self, db_name='trades.db'):
+    def __init__(self, db_name='trades.db', analytics_engine=None, shared_cache=None):
         self.db_name = db_name
+        self.sql_tracer = SQLTracer(db_name)
+        # Writes go through one writer thread committing in batches (also switches the file to WAL)
+        self.writer = WriteQueue(db_name, self.sql_tracer)
+        self.sql_tracer.writer = self.writer
+        # Cancel flags of the Maintenance console queries running now, by console id
+        self.running_queries = {}
+        self.last_query_stats = None
         self.create_tables()
         self.create_logs_table()
         self.migrate_logs_table()
         self.migrate_tax_settings()
+        self.create_search_tables()
+        self.create_data_versions()
+        self.create_wash_sales_table()
+        self.create_equity_curve_table()
+        self.create_trade_metrics_table()
+        self.create_callback_metrics_table()
+        self.create_slow_queries_table()
+
+        # Results memoized per data version (see cached), optionally shared across worker processes
+        self.cache = {}
+        self.cache_stats = {}
+        from shared_cache import SharedCache, get_configured_shared_cache
+        shared_cache_path = get_configured_shared_cache(db_name, shared_cache)
+        self.shared_cache = SharedCache(shared_cache_path) if shared_cache_path else None
+
+        # Optional DuckDB backend for the dashboard aggregates (None = pandas)
+        from analytics_engine import create_analytics_backend
+        self.analytics = create_analytics_backend(db_name, analytics_engine)
 
     def get_connection(self):
-        return sqlite3.connect(self.db_name)
+        return self.sql_tracer.connect(self.db_name, timeout=self.writer.timeout)
 
     def create_tables(self):
         conn = self.get_connection()
@@ -140,13 +204,80 @@ class TradingDatabase:
                            )
                        ''')
 
+        # Date index for year/month range queries (taxes, calendar)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_date ON trades (date)')
+
         conn.commit()
         conn.close()
 
-    def add_trade(self, trade_data):
+    # Tables whose changes are counted in data_versions
+    VERSIONED_TABLES = ('trades', 'capital_transactions')
+
+    def create_data_versions(self):
+        """Create per-table change counters, bumped by triggers on every write"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS data_versions
+                       (
+                           name    TEXT PRIMARY KEY,
+                           version INTEGER NOT NULL DEFAULT 0
+                       )
+                       ''')
+
+        for table in self.VERSIONED_TABLES:
+            cursor.execute('INSERT OR IGNORE INTO data_versions (name, version) VALUES (?, 0)', (table,))
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(f'''
+                               CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+                               AFTER {event} ON {table}
+                               BEGIN
+                                   UPDATE data_versions SET version = version + 1 WHERE name = '{table}';
+                               END
+                               ''')
+
+        conn.commit()
+        conn.close()
+
+    def get_data_version(self, *tables):
+        """
+        Get the change counters for tables (default: all versioned tables)
+
+        Returns:
+            Tuple of versions, usable as a cache key that changes whenever the data does
+        """
+        tables = tables or self.VERSIONED_TABLES
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT name, version FROM data_versions WHERE name IN ({', '.join('?' * len(tables))})",
+                       tables)
+        versions = dict(cursor.fetchall())
+        conn.close()
+        return tuple(versions.get(table, 0) for table in tables)
+
+    def cached(self, key, version, compute):
+        """Return compute() memoized under key until version changes (in process, then in the shared cache)"""
+        entry = self.cache.get(key)
+        # Hit/miss counts per cache, without the key's parameters (tax_scenarios_2025 -> tax_scenarios)
+        counts = self.cache_stats.setdefault(CACHE_KEY_PARAMS.sub('', key), [0, 0])
+        if entry is not None and entry[0] == version:
+            counts[0] += 1
+            return entry[1]
+        if self.shared_cache is not None:
+            found, value = self.shared_cache.get(key, version)
+            if found:
+                counts[0] += 1
+                self.cache[key] = (version, value)
+                return value
+        counts[1] += 1
+        value = compute()
+        self.cache[key] = (version, value)
+        if self.shared_cache is not None:
+            self.shared_cache.set(key, version, value)
+        return value
+
+    def add_trade(self, trade_data):
         # Calculate fields
         entry_price = float(trade_data['entry_price'])
         exit_price = float(trade_data['exit_price'])
@@ -184,25 +315,44 @@ class TradingDatabase:
         avg_volume = float(trade_data['avg_volume']) if trade_data.get('avg_volume') else None
         float_val = float(trade_data['float']) if trade_data.get('float') else None
 
-        cursor.execute('''
-                       INSERT INTO trades (date, day_of_week, ticker, sector, industry,
-                                           news_type, entry_price, entry_time, exit_price, exit_time,
-                                           shares, position_size, hold_duration, profit_loss, profit_loss_percent,
-                                           is_win, notes, day_volume, avg_volume, float)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                       ''', (
-                           trade_data['date'], day_of_week, trade_data['ticker'],
-                           trade_data['sector'], trade_data.get('industry'),
-                           trade_data['news_type'],
-                           entry_price, entry_time_str, exit_price, exit_time_str, shares,
-                           position_size, hold_duration, profit_loss, profit_loss_percent,
-                           1 if profit_loss > 0 else 0, trade_data.get('notes', ''),
-                           volume, avg_volume, float_val
-                       ))
+        def write(conn):
+            cursor = conn.cursor()
 
-        conn.commit()
-        conn.close()
-        return cursor.lastrowid
+            # Day total before this trade, for the running daily metrics
+            cursor.execute('SELECT COUNT(*), COALESCE(SUM(profit_loss), 0) FROM trades WHERE date = ?',
+                           (trade_data['date'],))
+            day_trades, day_total = cursor.fetchone()
+
+            cursor.execute('''
+                           INSERT INTO trades (date, day_of_week, ticker, sector, industry,
+                                               news_type, entry_price, entry_time, exit_price, exit_time,
+                                               shares, position_size, hold_duration, profit_loss, profit_loss_percent,
+                                               is_win, notes, day_volume, avg_volume, float)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                           ''', (
+                               trade_data['date'], day_of_week, trade_data['ticker'],
+                               trade_data['sector'], trade_data.get('industry'),
+                               trade_data['news_type'],
+                               entry_price, entry_time_str, exit_price, exit_time_str, shares,
+                               position_size, hold_duration, profit_loss, profit_loss_percent,
+                               1 if profit_loss > 0 else 0, trade_data.get('notes', ''),
+                               volume, avg_volume, float_val
+                           ))
+            trade_id = cursor.lastrowid
+
+            self.update_trade_metrics(cursor, profit_loss, day_total if day_trades else None)
+            return trade_id
+
+        trade_id = self.writer.run(write)
+
+        # Keep the in-memory columnar store current without reloading it
+        if hasattr(self.analytics, 'append_trade'):
+            self.analytics.append_trade(trade_id, {
+                'date': trade_data['date'], 'ticker': trade_data['ticker'], 'sector': trade_data['sector'],
+                'day_of_week': day_of_week, 'entry_time': entry_time_str, 'entry_price': entry_price,
+                'profit_loss': profit_loss, 'is_win': 1 if profit_loss > 0 else 0,
+            })
+        return trade_id
 
     def get_all_trades(self):
         conn = self.get_connection()
@@ -210,8 +360,46 @@ class TradingDatabase:
         conn.close()
         return df
 
+    def get_trades(self, columns=None, start=None, end=None, limit=None):
+        """
+        Get trades as a compactly typed frame
+
+        Only the requested columns are read, the date range is filtered in SQL and the
+        result uses TRADE_DTYPES, so a frame of a few columns costs a fraction of
+        get_all_trades (which reads every column, notes included, as Python objects).
+
+        Args:
+            columns: Column names to read (default: all)
+            start: First day to include, 'YYYY-MM-DD' (optional)
+            end: Last day to include, 'YYYY-MM-DD' (optional)
+            limit: Only the newest this many trades (optional)
+
+        Returns:
+            DataFrame ordered by date, id, or newest first (date, entry time, id descending)
+            when limit is given
+        """
+        from data_export import build_export_query
+
+        conn = self.get_connection()
+        order_by = 'date DESC, entry_time DESC, id DESC' if limit is not None else None
+        query, params, _ = build_export_query(conn, 'trades', columns, start, end, order_by, limit)
+        df = pd.read_sql_query(query, conn, params=params)
+        conn.close()
+
+        dtypes = {}
+        for column, dtype in TRADE_DTYPES.items():
+            if column not in df:
+                continue
+            if dtype.startswith('int') and df[column].isna().any():
+                dtype = dtype.capitalize()
+            dtypes[column] = dtype
+        return df.astype(dtypes)
+
     def get_stats(self):
-        df = self.get_all_trades()
+        if self.analytics:
+            return self.analytics.get_stats()
+
+        df = self.get_trades(['profit_loss', 'is_win'])
         if len(df) == 0:
             return None
 
@@ -230,24 +418,231 @@ class TradingDatabase:
             'worst_trade': df['profit_loss'].min()
         }
 
-    def export_to_csv(self, filename='trades_export.csv'):
-        df = self.get_all_trades()
-        df.to_csv(filename, index=False)
-        return filename
+    def create_trade_metrics_table(self):
+        """Create the single-row table holding the running metric accumulators"""
+        from metrics_engine import METRIC_FIELDS
 
-    def update_tax_settings(self, filing_status, estimated_income, self_employed):
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute('''
-                       UPDATE tax_settings
-                       SET filing_status    = ?,
-                           estimated_income = ?,
-                           self_employed    = ?
-                       WHERE id = 1
-                       ''', (filing_status, estimated_income, 1 if self_employed else 0))
+        columns = ',\n'.join(f'{field} REAL' for field in METRIC_FIELDS)
+        cursor.execute(f'''
+                       CREATE TABLE IF NOT EXISTS trade_metrics
+                       (
+                           id             INTEGER PRIMARY KEY CHECK (id = 1),
+                           trades_version INTEGER NOT NULL,
+                           {columns}
+                       )
+                       ''')
         conn.commit()
         conn.close()
 
+    def update_trade_metrics(self, cursor, profit_loss, previous_day_total):
+        """
+        Apply one inserted trade to the accumulators, inside add_trade's transaction
+
+        Only done when the accumulators matched trades right before this insert; otherwise
+        (edits, deletes, console writes) they are left stale and get_trade_metrics rebuilds them.
+        """
+        from metrics_engine import METRIC_FIELDS, TradeMetrics
+
+        cursor.execute(f"SELECT trades_version, {', '.join(METRIC_FIELDS)} FROM trade_metrics WHERE id = 1")
+        row = cursor.fetchone()
+        cursor.execute("SELECT version FROM data_versions WHERE name = 'trades'")
+        trades_version = cursor.fetchone()[0]
+        if row is None or row[0] != trades_version - 1:
+            return
+
+        metrics = TradeMetrics(**dict(zip(METRIC_FIELDS, row[1:])))
+        metrics.add_trade(profit_loss, previous_day_total)
+        cursor.execute(f'''
+                       UPDATE trade_metrics
+                       SET trades_version = ?, {', '.join(f'{field} = ?' for field in METRIC_FIELDS)}
+                       WHERE id = 1
+                       ''', (trades_version, *metrics.state()))
+
+    def get_trade_metrics(self):
+        """
+        Get profit factor, expectancy, payoff ratio, Sharpe/Sortino, SQN and standard deviation
+
+        Reads the running accumulators; rebuilds them in one NumPy pass only when trades
+        changed other than through add_trade.
+
+        Returns:
+            dict from metrics_engine.TradeMetrics.summary, or None without trades
+        """
+        from metrics_engine import METRIC_FIELDS, TradeMetrics
+
+        trades_version = self.get_data_version('trades')[0]
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT trades_version, {', '.join(METRIC_FIELDS)} FROM trade_metrics WHERE id = 1")
+        row = cursor.fetchone()
+
+        rebuilt = row is None or row[0] != trades_version
+        if not rebuilt:
+            metrics = TradeMetrics(**dict(zip(METRIC_FIELDS, row[1:])))
+        else:
+            cursor.execute('SELECT profit_loss FROM trades')
+            trade_pnl = [r[0] or 0 for r in cursor.fetchall()]
+            cursor.execute('SELECT SUM(profit_loss) FROM trades GROUP BY date')
+            daily_pnl = [r[0] or 0 for r in cursor.fetchall()]
+            metrics = TradeMetrics.from_history(trade_pnl, daily_pnl)
+        conn.close()
+
+        if rebuilt:
+            def write(conn):
+                conn.execute(f'''
+                             INSERT OR REPLACE INTO trade_metrics (id, trades_version, {', '.join(METRIC_FIELDS)})
+                             VALUES (1, ?, {', '.join('?' * len(METRIC_FIELDS))})
+                             ''', (trades_version, *metrics.state()))
+            self.writer.run(write)
+
+        if metrics.trades.count == 0:
+            return None
+        return metrics.summary()
+
+    def get_rolling_metrics(self):
+        """
+        Get rolling edge metrics over recent trades and trading days
+
+        Trades are ordered by date and entry time. Cached until trades change.
+
+        Returns:
+            dict with
+              'trades': {'date', 'ticker', 'profit_loss': lists, 'windows': {N: {'win_rate', 'avg_pl',
+                        'profit_factor'}}} for N in rolling_metrics.TRADE_WINDOWS
+              'days': {'date', 'pnl': lists, 'windows': {N: trailing P/L}} for N in rolling_metrics.DAY_WINDOWS
+            Values are None until a window is full (JSON-ready)
+        """
+        def compute():
+            from rolling_metrics import rolling_day_pnl, rolling_trade_metrics
+            from wash_sales import time_sort_key
+
+            df = self.get_trades(['id', 'date', 'entry_time', 'ticker', 'profit_loss'])
+
+            # entry_time is 'H:MM' or 'HH:MM', so order by parsed minutes rather than text
+            df['entry_minutes'] = df['entry_time'].map(time_sort_key)
+            df = df.sort_values(['date', 'entry_minutes', 'id'])
+            df['profit_loss'] = df['profit_loss'].fillna(0)
+            daily = df.groupby('date', sort=True)['profit_loss'].sum()
+
+            return {
+                'trades': {
+                    'date': df['date'].tolist(),
+                    'ticker': df['ticker'].tolist(),
+                    'profit_loss': df['profit_loss'].astype(float).tolist(),
+                    'windows': rolling_trade_metrics(df['profit_loss'].to_numpy()),
+                },
+                'days': {
+                    'date': daily.index.tolist(),
+                    'pnl': daily.astype(float).tolist(),
+                    'windows': rolling_day_pnl(daily.to_numpy()),
+                },
+            }
+
+        return self.cached('rolling_metrics', self.get_data_version('trades'), compute)
+
+    # Fewest trades worth resampling in the Monte Carlo simulation
+    MONTE_CARLO_MIN_TRADES = 10
+
+    def get_monte_carlo(self, n_trades=None, n_paths=None, seed=0):
+        """
+        Simulate the next n_trades by resampling historical trade P/L
+
+        Starts from the current capital, with DASHBOARD_PATHS paths unless given (run in-process).
+        Cached per data version and parameters.
+
+        Returns:
+            dict from monte_carlo.run_simulation, or None with too few trades
+        """
+        from monte_carlo import DASHBOARD_PATHS, DEFAULT_TRADES, run_simulation
+
+        n_trades = n_trades or DEFAULT_TRADES
+        n_paths = n_paths or DASHBOARD_PATHS
+
+        def compute():
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('SELECT profit_loss FROM trades WHERE profit_loss IS NOT NULL')
+            pnl = [row[0] for row in cursor.fetchall()]
+            conn.close()
+
+            if len(pnl) < self.MONTE_CARLO_MIN_TRADES:
+                return None
+            return run_simulation(pnl, self.get_current_capital()['total'], n_paths, n_trades, seed=seed)
+
+        return self.cached(f'monte_carlo_{n_trades}_{n_paths}_{seed}', self.get_data_version(), compute)
+
+    def get_bootstrap_intervals(self):
+        """
+        Get bootstrap confidence intervals for the headline stats and chart buckets
+
+        Cached until trades change.
+
+        Returns:
+            dict with 'confidence', 'stats' ({'win_rate', 'avg_win', 'avg_loss', 'expectancy': (low, high)}),
+            'hourly' ({time label: (low, high)}, labels as in get_hourly_performance) and
+            'price_bands' ({band label: (low, high)}, labels as in get_profits_by_price);
+            None without trades
+        """
+        def compute():
+            from analytics_engine import PRICE_BANDS
+            from bootstrap import CONFIDENCE, bootstrap_intervals
+            from wash_sales import time_sort_key
+
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('SELECT profit_loss, is_win, entry_time, entry_price FROM trades')
+            rows = cursor.fetchall()
+            conn.close()
+
+            if not rows:
+                return None
+
+            # 15-minute entry buckets, labelled like get_hourly_performance
+            hourly_labels = []
+            for minutes in (time_sort_key(row[2]) for row in rows):
+                hourly_labels.append(f"{minutes // 60:02d}:{minutes % 60 // 15 * 15:02d}")
+            hourly_keys = sorted(set(hourly_labels))
+            hourly_index = {label: i for i, label in enumerate(hourly_keys)}
+            hourly_codes = [hourly_index[label] for label in hourly_labels]
+
+            band_codes = []
+            for price in (row[3] or 0 for row in rows):
+                band_codes.append(next(i for i, (upper, _) in enumerate(PRICE_BANDS)
+                                       if upper is None or price < upper))
+
+            result = bootstrap_intervals(
+                [row[0] or 0 for row in rows], [row[1] == 1 for row in rows],
+                buckets={'hourly': (hourly_codes, len(hourly_keys)), 'price_bands': (band_codes, len(PRICE_BANDS))}
+            )
+            return {
+                'confidence': CONFIDENCE,
+                'stats': result['stats'],
+                'hourly': dict(zip(hourly_keys, result['hourly'])),
+                'price_bands': {label: bounds for (_, label), bounds in zip(PRICE_BANDS, result['price_bands'])},
+            }
+
+        return self.cached('bootstrap_intervals', self.get_data_version('trades'), compute)
+
+    def export_to_csv(self, filename='trades_export.csv', columns=None, start_date=None, end_date=None):
+        """Stream the trades table to CSV in chunks (data_export also writes Parquet and Arrow)"""
+        from data_export import export_table
+
+        export_table(self, filename, 'trades', 'csv', columns, start_date, end_date)
+        return filename
+
+    def update_tax_settings(self, filing_status, estimated_income, self_employed):
+        def write(conn):
+            conn.execute('''
+                         UPDATE tax_settings
+                         SET filing_status    = ?,
+                             estimated_income = ?,
+                             self_employed    = ?
+                         WHERE id = 1
+                         ''', (filing_status, estimated_income, 1 if self_employed else 0))
+        self.writer.run(write)
+
     def get_tax_settings(self):
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -261,15 +656,13 @@ class TradingDatabase:
         }
 
     def add_capital_transaction(self, date, trans_type, amount, notes=''):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-                       INSERT INTO capital_transactions (date, type, amount, notes)
-                       VALUES (?, ?, ?, ?)
-                       ''', (date, trans_type, amount, notes))
-        conn.commit()
-        conn.close()
-        return cursor.lastrowid
+        def write(conn):
+            cursor = conn.execute('''
+                                  INSERT INTO capital_transactions (date, type, amount, notes)
+                                  VALUES (?, ?, ?, ?)
+                                  ''', (date, trans_type, amount, notes))
+            return cursor.lastrowid
+        return self.writer.run(write)
 
     def get_capital_transactions(self):
         conn = self.get_connection()
@@ -281,17 +674,14 @@ class TradingDatabase:
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        # Get deposits
-        cursor.execute('SELECT COALESCE(SUM(amount), 0) FROM capital_transactions WHERE type = "deposit"')
-        deposits = cursor.fetchone()[0]
-
-        # Get withdrawals
-        cursor.execute('SELECT COALESCE(SUM(amount), 0) FROM capital_transactions WHERE type = "withdrawal"')
-        withdrawals = cursor.fetchone()[0]
-
-        # Get trading profit/loss
-        cursor.execute('SELECT COALESCE(SUM(profit_loss), 0) FROM trades')
-        trading_pl = cursor.fetchone()[0]
+        # Deposits, withdrawals and trading P/L in one pass
+        cursor.execute('''
+                       SELECT COALESCE(SUM(CASE WHEN type = 'deposit' THEN amount END), 0),
+                              COALESCE(SUM(CASE WHEN type = 'withdrawal' THEN amount END), 0),
+                              (SELECT COALESCE(SUM(profit_loss), 0) FROM trades)
+                       FROM capital_transactions
+                       ''')
+        deposits, withdrawals, trading_pl = cursor.fetchone()
 
         conn.close()
 
@@ -302,10 +692,206 @@ class TradingDatabase:
             'total': deposits - withdrawals + trading_pl
         }
 
-    def get_streak(self):
+    # Tables whose rows feed the equity curve (both keyed by a 'date' day column)
+    EQUITY_SOURCES = ('trades', 'capital_transactions')
+
+    def create_equity_curve_table(self):
+        """
+        Create the persisted daily equity curve
+
+        Triggers on trades and capital_transactions record the earliest day touched
+        since the last refresh in equity_curve_state.dirty_from, so refresh_equity_curve
+        only recomputes from that day forward.
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS equity_curve
+                       (
+                           date           TEXT PRIMARY KEY,
+                           deposits       REAL    NOT NULL,
+                           withdrawals    REAL    NOT NULL,
+                           trading_pl     REAL    NOT NULL,
+                           balance        REAL    NOT NULL,
+                           cum_trading_pl REAL    NOT NULL,
+                           peak_pl        REAL    NOT NULL,
+                           peak_balance   REAL    NOT NULL,
+                           peak_date      TEXT    NOT NULL,
+                           drawdown       REAL    NOT NULL,
+                           drawdown_pct   REAL    NOT NULL,
+                           drawdown_days  INTEGER NOT NULL
+                       )
+                       ''')
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS equity_curve_state
+                       (
+                           id         INTEGER PRIMARY KEY CHECK (id = 1),
+                           dirty_from TEXT
+                       )
+                       ''')
+        # A new state row means a full build; '' sorts before every date
+        cursor.execute("INSERT OR IGNORE INTO equity_curve_state (id, dirty_from) VALUES (1, '')")
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_capital_transactions_date ON capital_transactions (date)')
+
+        for table in self.EQUITY_SOURCES:
+            for event, days in (('INSERT', ('NEW.date',)), ('UPDATE', ('OLD.date', 'NEW.date')),
+                                ('DELETE', ('OLD.date',))):
+                cursor.execute(f'''
+                               CREATE TRIGGER IF NOT EXISTS {table}_equity_{event.lower()}
+                               AFTER {event} ON {table}
+                               BEGIN
+                                   UPDATE equity_curve_state
+                                   SET dirty_from = MIN(COALESCE(dirty_from, {days[0]}), {', '.join(days)})
+                                   WHERE id = 1;
+                               END
+                               ''')
+
+        conn.commit()
+        conn.close()
+
+    def refresh_equity_curve(self):
+        """Recompute the equity curve from the earliest changed day (no-op when nothing changed)"""
+        from equity_curve import compute_equity_curve
+
         conn = self.get_connection()
-        df = pd.read_sql_query('SELECT date, profit_loss FROM trades ORDER BY date ASC', conn)
+        row = conn.execute('SELECT dirty_from FROM equity_curve_state WHERE id = 1').fetchone()
         conn.close()
+        if row is None or row[0] is None:
+            return
+
+        def write(conn):
+            cursor = conn.cursor()
+            # Checked again on the writer: a refresh queued just before may have done the work
+            cursor.execute('SELECT dirty_from FROM equity_curve_state WHERE id = 1')
+            row = cursor.fetchone()
+            if row is None or row[0] is None:
+                return
+            dirty_from = row[0]
+
+            # State after the last untouched day
+            cursor.execute('''
+                           SELECT balance, cum_trading_pl, peak_pl, peak_balance, peak_date
+                           FROM equity_curve
+                           WHERE date < ?
+                           ORDER BY date DESC
+                           LIMIT 1
+                           ''', (dirty_from,))
+            seed_row = cursor.fetchone()
+            seed = dict(zip(('balance', 'cum_trading_pl', 'peak_pl', 'peak_balance', 'peak_date'), seed_row)) \
+                if seed_row else None
+
+            cursor.execute('''
+                           SELECT date, SUM(deposits), SUM(withdrawals), SUM(trading_pl)
+                           FROM (SELECT date,
+                                        CASE WHEN type = 'deposit' THEN amount ELSE 0 END    AS deposits,
+                                        CASE WHEN type = 'withdrawal' THEN amount ELSE 0 END AS withdrawals,
+                                        0                                                    AS trading_pl
+                                 FROM capital_transactions
+                                 WHERE date >= ?
+                                 UNION ALL
+                                 SELECT date, 0, 0, profit_loss
+                                 FROM trades
+                                 WHERE date >= ?)
+                           GROUP BY date
+                           ORDER BY date
+                           ''', (dirty_from, dirty_from))
+            days = cursor.fetchall()
+
+            rows = compute_equity_curve([d[0] for d in days], [d[1] or 0 for d in days],
+                                        [d[2] or 0 for d in days], [d[3] or 0 for d in days], seed)
+
+            cursor.execute('DELETE FROM equity_curve WHERE date >= ?', (dirty_from,))
+            cursor.executemany('''
+                               INSERT INTO equity_curve (date, deposits, withdrawals, trading_pl, balance, cum_trading_pl,
+                                                         peak_pl, peak_balance, peak_date, drawdown, drawdown_pct,
+                                                         drawdown_days)
+                               VALUES (:date, :deposits, :withdrawals, :trading_pl, :balance, :cum_trading_pl,
+                                       :peak_pl, :peak_balance, :peak_date, :drawdown, :drawdown_pct, :drawdown_days)
+                               ''', rows)
+            # Only clear the marker if no write moved it while we were computing
+            cursor.execute('UPDATE equity_curve_state SET dirty_from = NULL WHERE id = 1 AND dirty_from = ?',
+                           (dirty_from,))
+
+        self.writer.run(write)
+
+    def get_equity_curve(self, start_date=None):
+        """
+        Get the daily equity curve, oldest first
+
+        Returns:
+            DataFrame with date, deposits, withdrawals, trading_pl, balance, cum_trading_pl,
+            peak_pl, peak_balance, peak_date, drawdown, drawdown_pct and drawdown_days
+        """
+        self.refresh_equity_curve()
+
+        conn = self.get_connection()
+        if start_date:
+            df = pd.read_sql_query('SELECT * FROM equity_curve WHERE date >= ? ORDER BY date', conn,
+                                   params=[start_date])
+        else:
+            df = pd.read_sql_query('SELECT * FROM equity_curve ORDER BY date', conn)
+        conn.close()
+        return df
+
+    def get_returns(self):
+        """
+        Get time- and money-weighted returns, overall and per month and year
+
+        Cached until trades or capital transactions change.
+
+        Returns:
+            dict with 'total' (period dict or None), 'monthly' and 'yearly' (lists of period dicts,
+            see returns.compute_returns)
+        """
+        def compute():
+            from returns import compute_returns
+
+            curve = self.get_equity_curve()
+            total = compute_returns(curve, None)
+            return {
+                'total': total[0] if total else None,
+                'monthly': compute_returns(curve, 7),
+                'yearly': compute_returns(curve, 4),
+            }
+
+        return self.cached('returns', self.get_data_version(), compute)
+
+    def get_drawdown_summary(self):
+        """
+        Get current and maximum drawdown from the equity curve
+
+        Returns:
+            dict with current_drawdown, current_drawdown_pct, current_drawdown_days,
+            max_drawdown, max_drawdown_pct, max_drawdown_date and longest_drawdown_days
+        """
+        self.refresh_equity_curve()
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('SELECT drawdown, drawdown_pct, drawdown_days FROM equity_curve ORDER BY date DESC LIMIT 1')
+        current = cursor.fetchone() or (0, 0, 0)
+        cursor.execute('SELECT drawdown, drawdown_pct, date FROM equity_curve ORDER BY drawdown ASC LIMIT 1')
+        worst = cursor.fetchone() or (0, 0, None)
+        cursor.execute('SELECT COALESCE(MAX(drawdown_days), 0) FROM equity_curve')
+        longest = cursor.fetchone()[0]
+        conn.close()
+
+        return {
+            'current_drawdown': current[0],
+            'current_drawdown_pct': current[1],
+            'current_drawdown_days': current[2],
+            'max_drawdown': worst[0],
+            'max_drawdown_pct': worst[1],
+            'max_drawdown_date': worst[2],
+            'longest_drawdown_days': longest
+        }
+
+    def get_streak(self):
+        if self.analytics:
+            return self.analytics.get_streak()
+
+        df = self.get_trades(['date', 'profit_loss'])
 
         if len(df) == 0:
             return {
@@ -364,88 +950,502 @@ class TradingDatabase:
             'zero_loss_best': zero_loss_best
         }
 
-    def execute_query(self, query):
-        """Execute a SQL query and return results/status"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def get_win_rate_by_day(self):
+        """
+        Get win rate and trade count per weekday
 
-        try:
-            # Execute the query
-            cursor.execute(query)
+        Returns:
+            List of {'day', 'win_rate', 'trades'}, Monday to Friday (days without trades left out)
+        """
+        if self.analytics:
+            return self.analytics.get_win_rate_by_day()
 
-            # Check if it's a SELECT query
-            if query.strip().upper().startswith('SELECT'):
-                results = cursor.fetchall()
-                columns = [description[0] for description in cursor.description]
-                conn.close()
+        from analytics_engine import WEEKDAYS
+
+        df = self.get_trades(['day_of_week', 'is_win'])
+        grouped = df.groupby('day_of_week', observed=True)['is_win'].agg(['mean', 'count'])
+        return [{'day': day, 'win_rate': float(grouped.loc[day, 'mean'] * 100), 'trades': int(grouped.loc[day, 'count'])}
+                for day in WEEKDAYS if day in grouped.index]
+
+    # Maintenance console limits
+    QUERY_MAX_ROWS = 500
+    QUERY_MAX_ROWS_LIMIT = 5000
+    QUERY_TIMEOUT_SECONDS = 10
+    QUERY_PROGRESS_STEPS = 1000  # SQLite VM instructions between timeout checks
+
+    READ_QUERY_PREFIXES = ('SELECT', 'WITH', 'EXPLAIN', 'VALUES')
+    # Statements that control transactions or cannot run inside one (kept off the writer queue)
+    STANDALONE_QUERY_PREFIXES = ('VACUUM', 'BEGIN', 'COMMIT', 'END', 'ROLLBACK', 'SAVEPOINT', 'RELEASE',
+                                 'PRAGMA', 'ATTACH', 'DETACH')
+
+    def is_read_query(self, query):
+        """Check whether a console query only reads (and can run on a read-only connection)"""
+        return query.strip().lstrip('(').upper().startswith(self.READ_QUERY_PREFIXES)
+
+    def is_standalone_query(self, query):
+        """Check whether a console statement has to run on its own connection rather than the writer"""
+        return query.strip().upper().startswith(self.STANDALONE_QUERY_PREFIXES)
+
+    def get_read_only_connection(self):
+        """Open a connection that SQLite itself refuses to write through"""
+        return self.sql_tracer.connect(Path(self.db_name).resolve().as_uri() + '?mode=ro', uri=True,
+                                       timeout=self.writer.timeout)
+
+    def cancel_query(self, query_id):
+        """
+        Interrupt the Maintenance console query running under query_id
+
+        Returns:
+            True if a query was running under that id
+        """
+        cancel = self.running_queries.get(query_id)
+        if cancel is None:
+            return False
+        cancel.set()
+        return True
+
+    def execute_query(self, query, max_rows=None, page=0, timeout=None, query_id=None):
+        """
+        Execute a Maintenance console query with a row cap and a wall-clock timeout
+
+        Read queries run on a read-only connection and are streamed with fetchmany,
+        so only the requested page is ever held in memory. Writes go through the writer
+        queue in a batch of their own, so interrupting one never rolls back other
+        writes. A progress handler aborts any statement that runs longer than the
+        timeout (time spent waiting in the queue not counted) or is cancelled via
+        cancel_query with the same query_id (only that query is interrupted).
+
+        Args:
+            query: SQL text (a single statement)
+            max_rows: Rows per page (defaults to QUERY_MAX_ROWS, capped at QUERY_MAX_ROWS_LIMIT)
+            page: Zero-based page of the result rows to return
+            timeout: Seconds before the statement is interrupted (defaults to QUERY_TIMEOUT_SECONDS)
+            query_id: Id cancel_query can interrupt this query by (one per console)
+
+        Returns:
+            dict with success, type, message, elapsed_ms, rows_read (rows fetched: earlier
+            pages, this page and one to check for more) and vm_steps; row-returning
+            queries also include rows, columns, page, max_rows and has_more, other
+            statements include rows_affected
+        """
+        max_rows = min(max(int(max_rows or self.QUERY_MAX_ROWS), 1), self.QUERY_MAX_ROWS_LIMIT)
+        timeout = timeout or self.QUERY_TIMEOUT_SECONDS
+        is_read = self.is_read_query(query)
+
+        cancel = threading.Event()
+        if query_id is not None:
+            self.running_queries[query_id] = cancel
+        started = time.perf_counter()
+        progress = {'ticks': 0, 'deadline': None}
+
+        def check_deadline():
+            # A non-zero return makes SQLite abort the statement with "interrupted"
+            progress['ticks'] += 1
+            return 1 if time.perf_counter() > progress['deadline'] or cancel.is_set() else 0
+
+        def run(conn):
+            """(columns, rows, rows skipped, has_more), or (None, rows affected, 0, False) without a result set"""
+            progress['deadline'] = time.perf_counter() + timeout
+            conn.set_progress_handler(check_deadline, self.QUERY_PROGRESS_STEPS)
+            cursor = conn.cursor()
+            try:
+                cursor.execute(query)
+                if cursor.description is None:
+                    return None, cursor.rowcount, 0, False
+
+                # Skip earlier pages without keeping them
+                skipped = 0
+                to_skip = page * max_rows
+                while skipped < to_skip:
+                    chunk = cursor.fetchmany(min(max_rows, to_skip - skipped))
+                    if not chunk:
+                        break
+                    skipped += len(chunk)
+
+                rows = cursor.fetchmany(max_rows)
+                has_more = cursor.fetchone() is not None
+                return [description[0] for description in cursor.description], rows, skipped, has_more
+            finally:
+                cursor.close()
+                conn.set_progress_handler(None, 0)
+
+        conn = None
+        try:
+            if is_read or self.is_standalone_query(query):
+                conn = self.get_read_only_connection() if is_read else self.get_connection()
+                # Autocommit, so VACUUM, PRAGMA and transaction statements run as typed
+                conn.isolation_level = None
+                columns, rows, skipped, has_more = run(conn)
+            else:
+                columns, rows, skipped, has_more = self.writer.run(run, isolated=True)
+
+            if columns is not None:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self.last_query_stats = {
+                    'query': query,
+                    'elapsed_ms': elapsed_ms,
+                    'rows_read': skipped + len(rows) + (1 if has_more else 0),
+                    'vm_steps': progress['ticks'] * self.QUERY_PROGRESS_STEPS,
+                }
+                first_row = page * max_rows + 1
+                if rows:
+                    shown = f'Showing rows {first_row:,}-{first_row + len(rows) - 1:,}'
+                else:
+                    shown = 'No rows on this page'
                 return {
                     'success': True,
                     'type': 'select',
-                    'rows': results,
+                    'rows': rows,
                     'columns': columns,
-                    'message': f'Query executed successfully. Returned {len(results)} rows.'
+                    'page': page,
+                    'max_rows': max_rows,
+                    'has_more': has_more,
+                    **self.last_query_stats,
+                    'message': f'Query executed successfully in {elapsed_ms:,.1f} ms. {shown}'
+                               f'{" (more available)" if has_more else ""}.'
                 }
             else:
-                # For INSERT, UPDATE, DELETE, etc.
-                conn.commit()
-                rows_affected = cursor.rowcount
-                conn.close()
+                # For INSERT, UPDATE, DELETE, etc. (run returned the affected row count)
+                rows_affected = rows
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                self.last_query_stats = {
+                    'query': query,
+                    'elapsed_ms': elapsed_ms,
+                    'rows_read': 0,
+                    'vm_steps': progress['ticks'] * self.QUERY_PROGRESS_STEPS,
+                }
                 return {
                     'success': True,
                     'type': 'modify',
                     'rows_affected': rows_affected,
-                    'message': f'Query executed successfully. {rows_affected} row(s) affected.'
+                    **self.last_query_stats,
+                    'message': f'Query executed successfully in {elapsed_ms:,.1f} ms. '
+                               f'{rows_affected} row(s) affected.'
                 }
         except Exception as e:
-            conn.close()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if isinstance(e, sqlite3.OperationalError) and str(e) == 'interrupted':
+                reason = 'cancelled' if cancel.is_set() else f'timed out (limit {timeout}s)'
+                message = f'Error: Query {reason} after {elapsed_ms / 1000:.1f}s'
+            else:
+                message = f'Error: {str(e)}'
             return {
                 'success': False,
-                'message': f'Error: {str(e)}'
+                'elapsed_ms': elapsed_ms,
+                'message': message
             }
+        finally:
+            if conn is not None:
+                conn.close()
+            if query_id is not None and self.running_queries.get(query_id) is cancel:
+                self.running_queries.pop(query_id, None)
 
-    def calculate_taxes_simple(self):
+    def explain_query(self, query):
         """
-        Calculate taxes ONLY on trading income
-        Simple calculation: How much tax do I owe on my trading profits?
+        Get the EXPLAIN QUERY PLAN for a console query without running it
+
+        Returns:
+            dict with success, message, program_ops (size of the compiled VM program) and
+            plan: list of {'id', 'parent', 'depth', 'detail', 'kind'} where kind is
+            'index' (index or rowid lookup), 'scan' (full table scan), 'auto' (index
+            built at run time), 'temp' (temp b-tree for sorting/grouping) or 'other'
         """
-        from datetime import datetime
+        statement = re.sub(r'^\s*EXPLAIN(\s+QUERY\s+PLAN)?\s+', '', query, flags=re.IGNORECASE)
+
+        conn = self.get_read_only_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f'EXPLAIN QUERY PLAN {statement}')
+            rows = cursor.fetchall()
+            cursor.execute(f'EXPLAIN {statement}')
+            program_ops = len(cursor.fetchall())
+        except Exception as e:
+            return {'success': False, 'message': f'Error: {str(e)}'}
+        finally:
+            conn.close()
+
+        depths = {}
+        plan = []
+        for node_id, parent, _, detail in rows:
+            depth = depths[parent] + 1 if parent in depths else 0
+            depths[node_id] = depth
+
+            if 'AUTOMATIC' in detail:
+                kind = 'auto'
+            elif detail.startswith('USE TEMP B-TREE'):
+                kind = 'temp'
+            elif detail.startswith('SEARCH') or ('USING' in detail and 'INDEX' in detail):
+                kind = 'index'
+            elif detail.startswith('SCAN'):
+                kind = 'scan'
+            else:
+                kind = 'other'
+
+            plan.append({'id': node_id, 'parent': parent, 'depth': depth, 'detail': detail, 'kind': kind})
+
+        return {
+            'success': True,
+            'plan': plan,
+            'program_ops': program_ops,
+            'full_scans': sum(1 for node in plan if node['kind'] == 'scan'),
+            'index_lookups': sum(1 for node in plan if node['kind'] == 'index'),
+            'temp_btrees': sum(1 for node in plan if node['kind'] == 'temp'),
+            'message': f'{len(plan)} plan step(s)'
+        }
+
+    # Estimated tax periods: (quarter, months, period label, deadline month/day, deadline in next year)
+    TAX_QUARTERS = [
+        (1, (1, 2, 3), 'Jan-Mar', 'April 15', False),
+        (2, (4, 5), 'Apr-May', 'June 16', False),
+        (3, (6, 7, 8), 'Jun-Aug', 'September 15', False),
+        (4, (9, 10, 11, 12), 'Sep-Dec', 'January 15', True),
+    ]
 
+    def create_wash_sales_table(self):
+        """Create the table of wash sale matches (rebuilt from trades, see refresh_wash_sales)"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        # Get total trading gains and losses
-        cursor.execute('SELECT COALESCE(SUM(profit_loss), 0) FROM trades WHERE profit_loss > 0')
-        total_gains = cursor.fetchone()[0]
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS wash_sales
+                       (
+                           id                   INTEGER PRIMARY KEY AUTOINCREMENT,
+                           loss_trade_id        INTEGER NOT NULL,
+                           replacement_trade_id INTEGER NOT NULL,
+                           ticker               TEXT    NOT NULL,
+                           loss_date            TEXT    NOT NULL,
+                           replacement_date     TEXT    NOT NULL,
+                           shares               REAL,
+                           disallowed_loss      REAL    NOT NULL,
+                           basis_adjustment     REAL    NOT NULL
+                       )
+                       ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_wash_sales_loss_date ON wash_sales (loss_date)')
 
-        cursor.execute('SELECT COALESCE(SUM(profit_loss), 0) FROM trades WHERE profit_loss < 0')
-        total_losses = abs(cursor.fetchone()[0])
+        conn.commit()
+        conn.close()
 
-        # Net trading income
-        net_trading_income = total_gains - total_losses
+    # Times refresh_wash_sales finds matches before giving up on trades that keep changing
+    WASH_SALES_REFRESH_ATTEMPTS = 3
+
+    def refresh_wash_sales(self):
+        """
+        Rebuild wash_sales if trades changed since it was last built
+
+        The trades version the table was built from is kept in data_versions under 'wash_sales'.
+        Matches are found on a reader connection; the writer only swaps the rows in, and only if
+        trades have not changed since they were read (otherwise the matches are found again).
+        """
+        from wash_sales import find_wash_sales
+
+        for _ in range(self.WASH_SALES_REFRESH_ATTEMPTS):
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            try:
+                # One read transaction, so the version belongs to the trades read with it
+                cursor.execute('BEGIN')
+                cursor.execute("SELECT name, version FROM data_versions WHERE name IN ('trades', 'wash_sales')")
+                versions = dict(cursor.fetchall())
+                trades_version = versions.get('trades', 0)
+                if versions.get('wash_sales') == trades_version:
+                    return
+                cursor.execute('SELECT id, ticker, date, entry_time, shares, profit_loss FROM trades')
+                rows = cursor.fetchall()
+            finally:
+                conn.close()
+            matches = find_wash_sales(rows)
+
+            def write(conn):
+                # Versions read again on the writer: trades may have changed, or a rebuild queued
+                # just before may have done the work
+                cursor = conn.cursor()
+                cursor.execute("SELECT name, version FROM data_versions WHERE name IN ('trades', 'wash_sales')")
+                versions = dict(cursor.fetchall())
+                if versions.get('wash_sales') == versions.get('trades', 0):
+                    return True
+                if versions.get('trades', 0) != trades_version:
+                    return False
+
+                cursor.execute('DELETE FROM wash_sales')
+                cursor.executemany('''
+                                   INSERT INTO wash_sales (loss_trade_id, replacement_trade_id, ticker, loss_date,
+                                                           replacement_date, shares, disallowed_loss, basis_adjustment)
+                                   VALUES (:loss_trade_id, :replacement_trade_id, :ticker, :loss_date,
+                                           :replacement_date, :shares, :disallowed_loss, :basis_adjustment)
+                                   ''', matches)
+                cursor.execute("INSERT OR REPLACE INTO data_versions (name, version) VALUES ('wash_sales', ?)",
+                               (trades_version,))
+                return True
+
+            if self.writer.run(write):
+                return
+
+    def get_wash_sales(self, year=None, limit=None):
+        """Get wash sale matches, newest first, optionally for the tax year of the loss"""
+        self.refresh_wash_sales()
+
+        query = 'SELECT * FROM wash_sales'
+        params = []
+        if year:
+            query += ' WHERE loss_date >= ? AND loss_date < ?'
+            params += [f'{int(year)}-01-01', f'{int(year) + 1}-01-01']
+        query += ' ORDER BY loss_date DESC, id DESC'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(int(limit))
 
+        conn = self.get_connection()
+        df = pd.read_sql_query(query, conn, params=params)
         conn.close()
+        return df.to_dict('records')
 
-        # If net loss, no taxes owed
-        if net_trading_income <= 0:
-            return {
-                'total_tax_owed': 0,
-                'federal_tax': 0,
-                'ga_state_tax': 0,
-                'net_trading_income': net_trading_income,
-                'total_gains': total_gains,
-                'total_losses': total_losses,
-                'quarterly_estimate': 0,
-                'year': datetime.now().year
-            }
+    def get_tax_breakdown(self):
+        """
+        Get trading gains and losses per tax year and estimated-tax quarter
+
+        Trade P/L is adjusted for wash sales: disallowed losses are removed from the losing
+        trade and added to the basis of its replacement. One conditional-aggregation pass
+        over trades, cached until trades change.
 
-        # Assume top tax bracket since you have high W-2 income
-        # Federal: 24% (your bracket based on $258k household income)
-        federal_rate = 0.24
-        federal_tax = net_trading_income * federal_rate
+        Returns:
+            {year: {'gains', 'losses', 'wash_disallowed', 'wash_deferred', 'wash_count',
+                    'quarters': {quarter: {'gains', 'losses'}}}}
+            wash_disallowed is the net loss the year's wash sales move into replacement basis
+            (basis carried along a chain of wash sales is counted once)
+        """
+        def compute():
+            self.refresh_wash_sales()
+
+            quarter_case = ' '.join(
+                f"WHEN CAST(substr(date, 6, 2) AS INTEGER) IN ({', '.join(map(str, months))}) THEN {quarter}"
+                for quarter, months, _, _, _ in self.TAX_QUARTERS
+            )
+
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                           WITH adjustments AS (SELECT trade_id, SUM(amount) AS amount
+                                                FROM (SELECT loss_trade_id AS trade_id, disallowed_loss AS amount
+                                                      FROM wash_sales
+                                                      UNION ALL
+                                                      SELECT replacement_trade_id, -disallowed_loss
+                                                      FROM wash_sales)
+                                                GROUP BY trade_id),
+                                adjusted AS (SELECT t.date, t.profit_loss + COALESCE(a.amount, 0) AS pnl
+                                             FROM trades t
+                                                      LEFT JOIN adjustments a ON a.trade_id = t.id)
+                           SELECT CAST(substr(date, 1, 4) AS INTEGER)              AS year,
+                                  CASE {quarter_case} END                           AS quarter,
+                                  COALESCE(SUM(CASE WHEN pnl > 0 THEN pnl END), 0)  AS gains,
+                                  COALESCE(SUM(CASE WHEN pnl < 0 THEN -pnl END), 0) AS losses
+                           FROM adjusted
+                           GROUP BY year, quarter
+                           ''')
+            rows = cursor.fetchall()
+
+            # A loss disallowed again at each link of a chain carries the earlier links' basis with it,
+            # so each loss trade counts only what it adds on top of the basis carried into it
+            cursor.execute('''
+                           WITH carried AS (SELECT replacement_trade_id AS trade_id, SUM(disallowed_loss) AS amount
+                                            FROM wash_sales
+                                            GROUP BY replacement_trade_id),
+                                losses AS (SELECT loss_trade_id,
+                                                  MIN(loss_date)       AS loss_date,
+                                                  SUM(disallowed_loss) AS disallowed,
+                                                  SUM(CASE WHEN substr(replacement_date, 1, 4) > substr(loss_date, 1, 4)
+                                                               THEN disallowed_loss ELSE 0 END) AS deferred
+                                           FROM wash_sales
+                                           GROUP BY loss_trade_id)
+                           SELECT CAST(substr(l.loss_date, 1, 4) AS INTEGER) AS year,
+                                  SUM(l.disallowed - COALESCE(c.amount, 0)),
+                                  SUM(l.deferred),
+                                  COUNT(*)
+                           FROM losses l
+                                    LEFT JOIN carried c ON c.trade_id = l.loss_trade_id
+                           GROUP BY year
+                           ''')
+            wash_rows = cursor.fetchall()
+            conn.close()
 
-        # Georgia: 5.49% flat rate
-        ga_rate = 0.0549
-        ga_state_tax = net_trading_income * ga_rate
+            def year_entry(year):
+                return breakdown.setdefault(year, {
+                    'gains': 0, 'losses': 0, 'wash_disallowed': 0, 'wash_deferred': 0, 'wash_count': 0,
+                    'quarters': {q[0]: {'gains': 0, 'losses': 0} for q in self.TAX_QUARTERS}
+                })
+
+            breakdown = {}
+            for year, quarter, gains, losses in rows:
+                if year is None or quarter is None:
+                    continue
+                year_data = year_entry(year)
+                year_data['gains'] += gains
+                year_data['losses'] += losses
+                year_data['quarters'][quarter] = {'gains': gains, 'losses': losses}
+
+            for year, disallowed, deferred, count in wash_rows:
+                if year is None:
+                    continue
+                year_data = year_entry(year)
+                year_data['wash_disallowed'] = disallowed
+                year_data['wash_deferred'] = deferred
+                year_data['wash_count'] = count
+            return breakdown
+
+        return self.cached('tax_breakdown', self.get_data_version('trades'), compute)
+
+    def get_tax_years(self):
+        """Get the tax years with trades, plus the current year, newest first"""
+        years = set(self.get_tax_breakdown())
+        years.add(datetime.now().year)
+        return sorted(years, reverse=True)
+
+    def calculate_taxes_simple(self, year=None):
+        """
+        Calculate taxes ONLY on trading income for one tax year
+        Simple calculation: How much tax do I owe on my trading profits?
+
+        Args:
+            year: Tax year (defaults to the current year)
+        """
+        now = datetime.now()
+        current_year = now.year
+        year = int(year) if year else current_year
+
+        year_data = self.get_tax_breakdown().get(year)
+        total_gains = year_data['gains'] if year_data else 0
+        total_losses = year_data['losses'] if year_data else 0
+
+        # Net trading income
+        net_trading_income = total_gains - total_losses
+
+        # Bracket-aware tax on top of the household W-2 income in tax settings
+        settings = self.get_tax_settings()
+        trading_tax = tax_on_trading(settings, net_trading_income)
+        federal_rate = trading_tax['federal_rate']
+        ga_rate = trading_tax['state_rate']
+
+        quarters = []
+        for quarter, months, period, deadline, next_year in self.TAX_QUARTERS:
+            quarter_data = year_data['quarters'][quarter] if year_data else {'gains': 0, 'losses': 0}
+            quarters.append({
+                'quarter': quarter,
+                'period': period,
+                'deadline': f'{deadline}, {year + 1 if next_year else year}',
+                'gains': quarter_data['gains'],
+                'losses': quarter_data['losses'],
+                'net': quarter_data['gains'] - quarter_data['losses'],
+            })
+
+        # Only the current year has a "next" payment
+        current_quarter = None
+        next_deadline = None
+        if year == current_year:
+            current_quarter = next(q for q, months, _, _, _ in self.TAX_QUARTERS if now.month in months)
+            next_deadline = quarters[current_quarter - 1]
+
+        # If net loss, no taxes owed
+        federal_tax = max(trading_tax['federal'], 0)
+        ga_state_tax = max(trading_tax['state'], 0)
 
         # Total tax on trading profits
         total_tax = federal_tax + ga_state_tax
@@ -453,28 +1453,6 @@ class TradingDatabase:
         # Quarterly estimate
         quarterly_estimate = total_tax / 4
 
-        # Get current quarter
-        current_month = datetime.now().month
-        if current_month <= 3:
-            current_quarter = 1
-        elif current_month <= 5:
-            current_quarter = 2
-        elif current_month <= 8:
-            current_quarter = 3
-        else:
-            current_quarter = 4
-
-        current_year = datetime.now().year
-        quarters = [
-            {'quarter': 1, 'period': 'Jan-Mar', 'deadline': f'April 15, {current_year}'},
-            {'quarter': 2, 'period': 'Apr-May', 'deadline': f'June 16, {current_year}'},
-            {'quarter': 3, 'period': 'Jun-Aug', 'deadline': f'September 15, {current_year}'},
-            {'quarter': 4, 'period': 'Sep-Dec', 'deadline': f'January 15, {current_year + 1}'}
-        ]
-
-        # Find next deadline
-        next_deadline = quarters[current_quarter - 1] if current_quarter <= 4 else quarters[0]
-
         return {
             'total_tax_owed': total_tax,
             'federal_tax': federal_tax,
@@ -484,13 +1462,84 @@ class TradingDatabase:
             'net_trading_income': net_trading_income,
             'total_gains': total_gains,
             'total_losses': total_losses,
+            'wash_disallowed': year_data['wash_disallowed'] if year_data else 0,
+            'wash_deferred': year_data['wash_deferred'] if year_data else 0,
+            'wash_count': year_data['wash_count'] if year_data else 0,
             'quarterly_estimate': quarterly_estimate,
             'current_quarter': current_quarter,
             'next_deadline': next_deadline,
             'all_quarters': quarters,
-            'year': current_year
+            'filing_status': normalize_filing_status(settings['filing_status']),
+            'w2_income': household_w2_income(settings),
+            'year': year
         }
 
+    # What-if axes for the tax scenario grid
+    TAX_SCENARIO_INCOME_OFFSETS = (-50000, -25000, 0, 25000, 50000)
+    TAX_SCENARIO_MULTIPLIERS = (0, 0.5, 0.75, 1, 1.25, 1.5, 2)
+    TAX_SCENARIO_DEFAULT_LEVELS = (-10000, 0, 10000, 25000, 50000, 100000, 200000)
+
+    def get_tax_scenarios(self, year=None):
+        """
+        Evaluate the tax on trading income over a grid of what-if scenarios
+
+        Axes are every filing status, household W-2 income around the saved settings,
+        and projected year-end trading income (the year's net annualized to date for the
+        current year). The whole grid is computed in one vectorized pass and cached until
+        trades or tax settings change.
+
+        Returns:
+            dict with filing_status, filing_statuses, w2_incomes, trading_incomes,
+            projected_index (row of the projection, or None), ytd_net, projected_net,
+            by_income (rows = trading incomes, columns = W-2 incomes, for the saved status)
+            and by_status (rows = trading incomes, columns = filing statuses, at the saved income)
+        """
+        now = datetime.now()
+        year = int(year) if year else now.year
+        settings = self.get_tax_settings()
+
+        def compute():
+            year_data = self.get_tax_breakdown().get(year)
+            ytd_net = year_data['gains'] - year_data['losses'] if year_data else 0
+
+            # Straight-line projection to December 31 for the year in progress
+            projected_net = ytd_net
+            if year == now.year:
+                days_in_year = (datetime(year + 1, 1, 1) - datetime(year, 1, 1)).days
+                projected_net = ytd_net * days_in_year / now.timetuple().tm_yday
+
+            if projected_net > 0:
+                trading_incomes = [round(projected_net * m, 2) for m in self.TAX_SCENARIO_MULTIPLIERS]
+                projected_index = self.TAX_SCENARIO_MULTIPLIERS.index(1)
+            else:
+                trading_incomes = list(self.TAX_SCENARIO_DEFAULT_LEVELS)
+                projected_index = None
+
+            filing_status = normalize_filing_status(settings['filing_status'])
+            w2_income = household_w2_income(settings, filing_status)
+            w2_incomes = [max(w2_income + offset, 0) for offset in self.TAX_SCENARIO_INCOME_OFFSETS]
+            filing_statuses = list(FEDERAL_BRACKETS)
+
+            grid = trading_tax_grid(filing_statuses, w2_incomes, trading_incomes)
+            status_index = filing_statuses.index(filing_status)
+            income_index = self.TAX_SCENARIO_INCOME_OFFSETS.index(0)
+
+            return {
+                'year': year,
+                'filing_status': filing_status,
+                'filing_statuses': filing_statuses,
+                'w2_incomes': w2_incomes,
+                'trading_incomes': trading_incomes,
+                'projected_index': projected_index,
+                'ytd_net': ytd_net,
+                'projected_net': projected_net,
+                'by_income': grid['total'][status_index].T.tolist(),
+                'by_status': grid['total'][:, income_index, :].T.tolist(),
+            }
+
+        version = (self.get_data_version('trades'), year, now.date(), tuple(settings.items()))
+        return self.cached(f'tax_scenarios_{year}', version, compute)
+
     def get_tax_settings(self):
         conn = self.get_connection()
         cursor = conn.cursor()
@@ -513,18 +1562,16 @@ class TradingDatabase:
         }
 
     def update_tax_settings(self, filing_status, user_income, spouse_income, visa_status):
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-                       UPDATE tax_settings
-                       SET filing_status = ?,
-                           user_income   = ?,
-                           spouse_income = ?,
-                           visa_status   = ?
-                       WHERE id = 1
-                       ''', (filing_status, user_income, spouse_income, visa_status))
-        conn.commit()
-        conn.close()
+        def write(conn):
+            conn.execute('''
+                         UPDATE tax_settings
+                         SET filing_status = ?,
+                             user_income   = ?,
+                             spouse_income = ?,
+                             visa_status   = ?
+                         WHERE id = 1
+                         ''', (filing_status, user_income, spouse_income, visa_status))
+        self.writer.run(write)
 
     def migrate_tax_settings(self):
         """Migrate tax_settings table to new schema"""
@@ -620,12 +1667,10 @@ class TradingDatabase:
 
     def get_hourly_performance(self):
         """Get P/L grouped by 15-minute intervals during trading hours"""
-        import pandas as pd
-        from datetime import time
+        if self.analytics:
+            return self.analytics.get_hourly_performance()
 
-        conn = self.get_connection()
-        df = pd.read_sql_query('SELECT entry_time, profit_loss FROM trades', conn)
-        conn.close()
+        df = self.get_trades(['entry_time', 'profit_loss'])
 
         if len(df) == 0:
             return []
@@ -711,52 +1756,39 @@ class TradingDatabase:
 
     def save_setting(self, key, value):
         """Save a single setting"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO settings (key, value)
-            VALUES (?, ?)
-        ''', (key, value))
-        conn.commit()
-        conn.close()
+        self.writer.run(lambda conn: conn.execute('INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)',
+                                                  (key, value)))
 
     def reset_settings(self):
         """Reset all settings to defaults"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM settings')
-        conn.commit()
-        conn.close()
+        self.writer.run(lambda conn: conn.execute('DELETE FROM settings'))
 
     def update_trade_stock_data(self, trade_id, stock_data):
         """Update a trade with stock metrics data"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-                       UPDATE trades
-                       SET float        = ?,
-                           avg_volume   = ?,
-                           day_volume   = ?,
-                           market_cap   = ?,
-                           stock_type   = ?,
-                           exchange     = ?,
-                           auto_sector  = ?,
-                           data_fetched = 1
-                       WHERE id = ?
-                       ''', (
-                           stock_data.get('float'),
-                           stock_data.get('avg_volume'),
-                           stock_data.get('day_volume'),
-                           stock_data.get('market_cap'),
-                           stock_data.get('stock_type'),
-                           stock_data.get('exchange'),
-                           stock_data.get('sector'),
-                           trade_id
-                       ))
-
-        conn.commit()
-        conn.close()
+        def write(conn):
+            conn.execute('''
+                         UPDATE trades
+                         SET float        = ?,
+                             avg_volume   = ?,
+                             day_volume   = ?,
+                             market_cap   = ?,
+                             stock_type   = ?,
+                             exchange     = ?,
+                             auto_sector  = ?,
+                             data_fetched = 1
+                         WHERE id = ?
+                         ''', (
+                             stock_data.get('float'),
+                             stock_data.get('avg_volume'),
+                             stock_data.get('day_volume'),
+                             stock_data.get('market_cap'),
+                             stock_data.get('stock_type'),
+                             stock_data.get('exchange'),
+                             stock_data.get('sector'),
+                             trade_id
+                         ))
+
+        self.writer.run(write)
 
     def get_trades_without_stock_data(self, limit=50):
         """Get trades that haven't had stock data fetched yet"""
@@ -786,11 +1818,10 @@ class TradingDatabase:
 
     def get_profits_by_price(self):
         """Get P/L grouped by entry price bands"""
-        import pandas as pd
+        if self.analytics:
+            return self.analytics.get_profits_by_price()
 
-        conn = self.get_connection()
-        df = pd.read_sql_query('SELECT entry_price, profit_loss FROM trades', conn)
-        conn.close()
+        df = self.get_trades(['entry_price', 'profit_loss'])
 
         if len(df) == 0:
             return []
@@ -891,6 +1922,11 @@ class TradingDatabase:
                        )
                        ''')
 
+        # Indexes for the paged Logs tab (newest-first ordering and category filter)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs (timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_category ON logs (action_category, timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_logs_action_type ON logs (action_type, timestamp)')
+
         conn.commit()
         conn.close()
 
@@ -907,19 +1943,14 @@ class TradingDatabase:
         Returns:
             Log ID
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        def write(conn):
+            cursor = conn.execute('''
+                                  INSERT INTO logs (action_type, action_category, description, details)
+                                  VALUES (?, ?, ?, ?)
+                                  ''', (action_type, action_category, description, details))
+            return cursor.lastrowid
 
-        cursor.execute('''
-                       INSERT INTO logs (action_type, action_category, description, details)
-                       VALUES (?, ?, ?, ?)
-                       ''', (action_type, action_category, description, details))
-
-        conn.commit()
-        log_id = cursor.lastrowid
-        conn.close()
-
-        return log_id
+        return self.writer.run(write)
 
     def get_all_logs(self, limit=None):
         """Get all logs, optionally limited"""
@@ -935,45 +1966,273 @@ class TradingDatabase:
         conn.close()
         return df
 
-    def delete_all_logs(self):
-        """Delete all log entries"""
+    def create_search_tables(self):
+        """Create FTS5 indexes over trade notes and log text, kept in sync by triggers"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute('SELECT COUNT(*) FROM logs')
-        count = cursor.fetchone()[0]
+        self.fts_enabled = False
+        try:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name IN ('trades_fts', 'logs_fts')")
+            existing = {row[0] for row in cursor.fetchall()}
 
-        cursor.execute('DELETE FROM logs')
-        conn.commit()
-        conn.close()
+            cursor.execute('''
+                           CREATE VIRTUAL TABLE IF NOT EXISTS trades_fts
+                           USING fts5(notes, content='trades', content_rowid='id')
+                           ''')
+            cursor.execute('''
+                           CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts
+                           USING fts5(description, details, content='logs', content_rowid='id')
+                           ''')
+
+            cursor.executescript('''
+                CREATE TRIGGER IF NOT EXISTS trades_fts_ai AFTER INSERT ON trades BEGIN
+                    INSERT INTO trades_fts (rowid, notes) VALUES (new.id, new.notes);
+                END;
+                CREATE TRIGGER IF NOT EXISTS trades_fts_ad AFTER DELETE ON trades BEGIN
+                    INSERT INTO trades_fts (trades_fts, rowid, notes) VALUES ('delete', old.id, old.notes);
+                END;
+                CREATE TRIGGER IF NOT EXISTS trades_fts_au AFTER UPDATE OF notes ON trades BEGIN
+                    INSERT INTO trades_fts (trades_fts, rowid, notes) VALUES ('delete', old.id, old.notes);
+                    INSERT INTO trades_fts (rowid, notes) VALUES (new.id, new.notes);
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS logs_fts_ai AFTER INSERT ON logs BEGIN
+                    INSERT INTO logs_fts (rowid, description, details)
+                    VALUES (new.id, new.description, new.details);
+                END;
+                CREATE TRIGGER IF NOT EXISTS logs_fts_ad AFTER DELETE ON logs BEGIN
+                    INSERT INTO logs_fts (logs_fts, rowid, description, details)
+                    VALUES ('delete', old.id, old.description, old.details);
+                END;
+                CREATE TRIGGER IF NOT EXISTS logs_fts_au AFTER UPDATE OF description, details ON logs BEGIN
+                    INSERT INTO logs_fts (logs_fts, rowid, description, details)
+                    VALUES ('delete', old.id, old.description, old.details);
+                    INSERT INTO logs_fts (rowid, description, details)
+                    VALUES (new.id, new.description, new.details);
+                END;
+            ''')
+
+            # Index rows that were written before the FTS tables existed
+            if 'trades_fts' not in existing:
+                cursor.execute("INSERT INTO trades_fts (trades_fts) VALUES ('rebuild')")
+            if 'logs_fts' not in existing:
+                cursor.execute("INSERT INTO logs_fts (logs_fts) VALUES ('rebuild')")
+
+            conn.commit()
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable: {e}")
+        finally:
+            conn.close()
 
-        return count
+    @staticmethod
+    def to_fts_query(text):
+        """
+        Turn free text into a safe FTS5 MATCH expression
+
+        Every word is quoted so punctuation can't break the query syntax.
+        "Quoted phrases" stay phrases and a trailing * keeps prefix matching.
+        Returns None when there is nothing to search for.
+        """
+        terms = []
+        for token in re.findall(r'"[^"]+"|\S+', text or ''):
+            prefix = token.endswith('*') and not token.startswith('"')
+            token = token.strip('"*')
+            if not token:
+                continue
+            term = '"' + token.replace('"', '""') + '"'
+            terms.append(term + '*' if prefix else term)
+        return ' '.join(terms) if terms else None
+
+    def search_trades(self, text, limit=20):
+        """
+        Full-text search over trade notes
+
+        Returns:
+            List of ranked hits (best first) with a highlighted notes snippet
+        """
+        match = self.to_fts_query(text)
+        if not match or not self.fts_enabled:
+            return []
 
-    def trim_logs(self, keep_count=25):
-        """Keep only the most recent N logs"""
         conn = self.get_connection()
         cursor = conn.cursor()
+        cursor.execute('''
+                       SELECT t.id, t.date, t.ticker, t.profit_loss,
+                              snippet(trades_fts, 0, ?, ?, '…', 16) AS snippet
+                       FROM trades_fts
+                                JOIN trades t ON t.id = trades_fts.rowid
+                       WHERE trades_fts MATCH ?
+                       ORDER BY bm25(trades_fts)
+                       LIMIT ?
+                       ''', (SNIPPET_START, SNIPPET_END, match, limit))
+        rows = cursor.fetchall()
+        conn.close()
 
-        # Get count before trim
-        cursor.execute('SELECT COUNT(*) FROM logs')
-        before_count = cursor.fetchone()[0]
+        return [
+            {'id': row[0], 'date': row[1], 'ticker': row[2], 'profit_loss': row[3], 'snippet': row[4]}
+            for row in rows
+        ]
+
+    def search_logs(self, text, limit=20):
+        """
+        Full-text search over log descriptions and details
+
+        Returns:
+            List of ranked hits (best first) with a highlighted snippet
+        """
+        match = self.to_fts_query(text)
+        if not match or not self.fts_enabled:
+            return []
 
-        # Delete all except the most recent keep_count
+        conn = self.get_connection()
+        cursor = conn.cursor()
         cursor.execute('''
-                       DELETE
-                       FROM logs
-                       WHERE id NOT IN (SELECT id
-                                        FROM logs
-                                        ORDER BY timestamp DESC
-                           LIMIT ?
-                           )
-                       ''', (keep_count,))
+                       SELECT l.id, strftime('%Y-%m-%d %H:%M:%S', l.timestamp), l.action_category, l.action_type,
+                              snippet(logs_fts, -1, ?, ?, '…', 16) AS snippet
+                       FROM logs_fts
+                                JOIN logs l ON l.id = logs_fts.rowid
+                       WHERE logs_fts MATCH ?
+                       ORDER BY bm25(logs_fts)
+                       LIMIT ?
+                       ''', (SNIPPET_START, SNIPPET_END, match, limit))
+        rows = cursor.fetchall()
+        conn.close()
+
+        return [
+            {'id': row[0], 'timestamp': row[1], 'action_category': row[2], 'action_type': row[3],
+             'snippet': row[4]}
+            for row in rows
+        ]
+
+    # Columns the Logs table is allowed to sort on
+    LOG_SORT_COLUMNS = ('timestamp', 'action_category', 'action_type', 'description', 'details')
+
+    def build_logs_filter(self, category=None, action_type=None, start_date=None, end_date=None, search=None):
+        """
+        Build the WHERE clause shared by the Logs tab queries
+
+        Args:
+            category: Exact action_category to match (optional)
+            action_type: Exact action_type to match (optional)
+            start_date: First day to include, 'YYYY-MM-DD' (optional)
+            end_date: Last day to include, 'YYYY-MM-DD' (optional)
+            search: Text matched against description and details, via FTS when available (optional)
+
+        Returns:
+            (where_sql, params) tuple; where_sql is '' when no filter applies
+        """
+        clauses = []
+        params = []
+
+        if category:
+            clauses.append('action_category = ?')
+            params.append(category)
+        if action_type:
+            clauses.append('action_type = ?')
+            params.append(action_type)
+        if start_date:
+            clauses.append('timestamp >= ?')
+            params.append(start_date)
+        if end_date:
+            # Inclusive end day: compare against the start of the following day
+            clauses.append("timestamp < date(?, '+1 day')")
+            params.append(end_date)
+        if search and search.strip():
+            match = self.to_fts_query(search) if self.fts_enabled else None
+            if match:
+                clauses.append('id IN (SELECT rowid FROM logs_fts WHERE logs_fts MATCH ?)')
+                params.append(match)
+            else:
+                clauses.append('(description LIKE ? OR details LIKE ?)')
+                pattern = f'%{search.strip()}%'
+                params.extend([pattern, pattern])
+
+        where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        return where_sql, params
+
+    def get_logs_page(self, page=0, page_size=50, sort_by=None, category=None, action_type=None,
+                      start_date=None, end_date=None, search=None):
+        """
+        Get a single page of logs with filtering, sorting and paging done in SQL
+
+        Args:
+            page: Zero-based page number
+            page_size: Rows per page
+            sort_by: Dash DataTable sort_by list ([{'column_id': ..., 'direction': 'asc'|'desc'}])
+            category, action_type, start_date, end_date, search: See build_logs_filter
+
+        Returns:
+            (DataFrame with the requested page, total number of matching logs)
+        """
+        where_sql, params = self.build_logs_filter(category, action_type, start_date, end_date, search)
+
+        order_terms = []
+        for sort in sort_by or []:
+            column = sort.get('column_id')
+            if column in self.LOG_SORT_COLUMNS:
+                direction = 'ASC' if sort.get('direction') == 'asc' else 'DESC'
+                order_terms.append(f'{column} {direction}')
+        if not order_terms:
+            order_terms.append('timestamp DESC')
+        order_terms.append('id DESC')
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f'SELECT COUNT(*) FROM logs {where_sql}', params)
+        total = cursor.fetchone()[0]
+
+        query = f'''
+                SELECT id, strftime('%Y-%m-%d %H:%M:%S', timestamp) AS timestamp,
+                       action_type, action_category, description, details
+                FROM logs {where_sql}
+                ORDER BY {', '.join(order_terms)}
+                LIMIT ? OFFSET ?
+                '''
+        df = pd.read_sql_query(query, conn, params=params + [page_size, page * page_size])
+        conn.close()
+
+        return df, total
+
+    def get_log_filter_options(self):
+        """Get the distinct categories and action types for the Logs tab filters"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('SELECT DISTINCT action_category FROM logs ORDER BY action_category')
+        categories = [row[0] for row in cursor.fetchall()]
+
+        cursor.execute('SELECT DISTINCT action_type FROM logs ORDER BY action_type')
+        action_types = [row[0] for row in cursor.fetchall()]
 
-        conn.commit()
-        deleted_count = before_count - keep_count if before_count > keep_count else 0
         conn.close()
+        return {'categories': categories, 'action_types': action_types}
 
-        return deleted_count
+    def delete_all_logs(self):
+        """Delete all log entries"""
+        def write(conn):
+            return conn.execute('DELETE FROM logs').rowcount
+
+        return self.writer.run(write)
+
+    def trim_logs(self, keep_count=25):
+        """Keep only the most recent N logs"""
+        def write(conn):
+            # Delete all except the most recent keep_count
+            cursor = conn.execute('''
+                                  DELETE
+                                  FROM logs
+                                  WHERE id NOT IN (SELECT id
+                                                   FROM logs
+                                                   ORDER BY timestamp DESC
+                                      LIMIT ?
+                                      )
+                                  ''', (keep_count,))
+            return cursor.rowcount
+
+        return self.writer.run(write)
 
     def get_unread_logs_count(self):
         """Get count of unread logs"""
@@ -986,11 +2245,7 @@ class TradingDatabase:
 
     def mark_logs_as_read(self):
         """Mark all logs as read"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('UPDATE logs SET is_read = 1 WHERE is_read = 0')
-        conn.commit()
-        conn.close()
+        self.writer.run(lambda conn: conn.execute('UPDATE logs SET is_read = 1 WHERE is_read = 0'))
 
     def migrate_logs_table(self):
         """Add is_read column to existing logs table"""
@@ -1009,4 +2264,112 @@ class TradingDatabase:
         except Exception as e:
             print(f"Migration error: {e}")
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
+
+    def create_callback_metrics_table(self):
+        """Create the table holding persisted callback latency counters (see callback_metrics.py)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS callback_metrics
+                       (
+                           name              TEXT PRIMARY KEY,
+                           outputs           TEXT,
+                           count             INTEGER NOT NULL,
+                           errors            INTEGER NOT NULL,
+                           prevented         INTEGER NOT NULL,
+                           total_ms          REAL    NOT NULL,
+                           max_ms            REAL    NOT NULL,
+                           payload_bytes     INTEGER NOT NULL,
+                           max_payload_bytes INTEGER NOT NULL,
+                           buckets           TEXT    NOT NULL,
+                           updated_at        TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                       )
+                       ''')
+        conn.commit()
+        conn.close()
+
+    def save_callback_metrics(self, rows):
+        """
+        Add callback counts (CallbackStats.summary dicts of the invocations since the last save)
+        to the persisted totals, so every worker process sharing the database adds its own
+        """
+        def write(conn):
+            for row in rows:
+                # Histograms are JSON, so they are added here; the writer's transaction holds the
+                # write lock, so no other process can save between this read and the upsert
+                stored = conn.execute('SELECT buckets FROM callback_metrics WHERE name = ?', (row['name'],)).fetchone()
+                buckets = row['buckets']
+                if stored and len(json.loads(stored[0])) == len(buckets):
+                    buckets = [a + b for a, b in zip(json.loads(stored[0]), buckets)]
+                conn.execute('''
+                             INSERT INTO callback_metrics
+                             (name, outputs, count, errors, prevented, total_ms, max_ms, payload_bytes,
+                              max_payload_bytes, buckets, updated_at)
+                             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                             ON CONFLICT(name) DO UPDATE SET outputs           = excluded.outputs,
+                                                             count             = count + excluded.count,
+                                                             errors            = errors + excluded.errors,
+                                                             prevented         = prevented + excluded.prevented,
+                                                             total_ms          = total_ms + excluded.total_ms,
+                                                             max_ms            = MAX(max_ms, excluded.max_ms),
+                                                             payload_bytes     = payload_bytes + excluded.payload_bytes,
+                                                             max_payload_bytes = MAX(max_payload_bytes,
+                                                                                     excluded.max_payload_bytes),
+                                                             buckets           = excluded.buckets,
+                                                             updated_at        = CURRENT_TIMESTAMP
+                             ''', (row['name'], row['outputs'], row['count'], row['errors'], row['prevented'],
+                                    row['total_ms'], row['max_ms'], row['payload_bytes'], row['max_payload_bytes'],
+                                    json.dumps(buckets)))
+        self.writer.run(write)
+
+    def get_callback_metrics(self):
+        """Get persisted callback counters as dicts (buckets decoded)"""
+        conn = self.get_connection()
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute('SELECT * FROM callback_metrics').fetchall()
+        conn.close()
+        return [{**dict(row), 'buckets': json.loads(row['buckets'])} for row in rows]
+
+    def clear_callback_metrics(self):
+        """Delete persisted callback counters"""
+        self.writer.run(lambda conn: conn.execute('DELETE FROM callback_metrics'))
+
+    def create_slow_queries_table(self):
+        """Create the table slow statements are logged to (see sql_trace.py)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+                       CREATE TABLE IF NOT EXISTS slow_queries
+                       (
+                           id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                           timestamp   TIMESTAMP NOT NULL,
+                           duration_ms REAL      NOT NULL,
+                           statement   TEXT      NOT NULL,
+                           sql         TEXT,
+                           source      TEXT,
+                           rows        INTEGER,
+                           error       INTEGER DEFAULT 0
+                       )
+                       ''')
+        conn.commit()
+        conn.close()
+
+    def get_slow_queries(self, limit=50):
+        """Get the most recent slow statements, newest first"""
+        pending = self.sql_tracer.flush()
+        if pending is not None:
+            futures.wait([pending], timeout=WRITE_TIMEOUT_SECONDS)
+        conn = self.get_connection()
+        df = pd.read_sql_query('SELECT * FROM slow_queries ORDER BY id DESC LIMIT ?', conn, params=(limit,))
+        conn.close()
+        return df
+
+    def get_statement_stats(self, limit=None):
+        """Per-statement counts and durations since startup (or the last clear), most expensive first"""
+        return self.sql_tracer.summaries(limit=limit)
+
+    def clear_slow_queries(self):
+        """Delete logged slow statements and reset the statement stats"""
+        self.writer.run(lambda conn: conn.execute('DELETE FROM slow_queries'))
+        self.sql_tracer.reset()
@@ -0,0 +1,93 @@
+"""
+Equity curve engine
+Turns daily deposits, withdrawals and trading P/L into a running account balance with
+running peak, drawdown depth and drawdown duration, using cumulative NumPy operations.
+
+Drawdowns are measured on cumulative trading P/L, so deposits and withdrawals move the
+balance without registering as gains or drawdowns. The percentage is relative to the
+account balance at the peak.
+
+The computation can start from any stored day (the seed), which is how the persisted
+curve is extended incrementally instead of replaying all history.
+"""
+from datetime import date as date_cls
+
+import numpy as np
+
+# State carried from the last stored day into the next computation
+EMPTY_SEED = {
+    'balance': 0.0,
+    'cum_trading_pl': 0.0,
+    'peak_pl': 0.0,
+    'peak_balance': 0.0,
+    'peak_date': None,
+}
+
+
+def compute_equity_curve(dates, deposits, withdrawals, trading_pl, seed=None):
+    """
+    Compute the equity curve for consecutive days
+
+    Args:
+        dates: Day strings 'YYYY-MM-DD' in ascending order
+        deposits, withdrawals, trading_pl: Daily totals aligned with dates
+        seed: State after the day before dates[0] (EMPTY_SEED keys), None to start from zero
+
+    Returns:
+        List of row dicts: date, deposits, withdrawals, trading_pl, balance, cum_trading_pl,
+        peak_pl, peak_balance, peak_date, drawdown, drawdown_pct, drawdown_days
+    """
+    if len(dates) == 0:
+        return []
+    seed = seed or EMPTY_SEED
+
+    deposits = np.asarray(deposits, dtype=float)
+    withdrawals = np.asarray(withdrawals, dtype=float)
+    trading_pl = np.asarray(trading_pl, dtype=float)
+    ordinals = np.array([date_cls.fromisoformat(d).toordinal() for d in dates])
+
+    balance = seed['balance'] + np.cumsum(deposits - withdrawals + trading_pl)
+    cum_pl = seed['cum_trading_pl'] + np.cumsum(trading_pl)
+
+    # Index 0 is the seed's peak, so running maxima continue across the seam.
+    # Without history it is the start of the first day, after that day's deposits.
+    if seed['peak_date']:
+        start = (seed['peak_pl'], seed['peak_balance'], date_cls.fromisoformat(seed['peak_date']).toordinal())
+    else:
+        start = (seed['cum_trading_pl'], seed['balance'] + deposits[0] - withdrawals[0], ordinals[0])
+    all_pl = np.concatenate([[start[0]], cum_pl])
+    all_balance = np.concatenate([[start[1]], balance])
+    all_ordinals = np.concatenate([[start[2]], ordinals])
+
+    peak_pl = np.maximum.accumulate(all_pl)
+    # Position of the most recent peak: last index where the running max was (re)reached
+    positions = np.arange(len(all_pl))
+    peak_index = np.maximum.accumulate(np.where(all_pl >= peak_pl, positions, 0))
+
+    peak_pl = peak_pl[1:]
+    peak_index = peak_index[1:]
+    peak_balance = all_balance[peak_index]
+    peak_ordinal = all_ordinals[peak_index]
+
+    drawdown = cum_pl - peak_pl
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown_pct = np.where(peak_balance > 0, drawdown / peak_balance * 100, 0.0)
+    drawdown_days = np.where(drawdown < 0, ordinals - peak_ordinal, 0)
+
+    rows = []
+    for i, day in enumerate(dates):
+        rows.append({
+            'date': day,
+            'deposits': float(deposits[i]),
+            'withdrawals': float(withdrawals[i]),
+            'trading_pl': float(trading_pl[i]),
+            'balance': float(balance[i]),
+            'cum_trading_pl': float(cum_pl[i]),
+            'peak_pl': float(peak_pl[i]),
+            'peak_balance': float(peak_balance[i]),
+            'peak_date': date_cls.fromordinal(int(peak_ordinal[i])).isoformat(),
+            'drawdown': float(drawdown[i]),
+            'drawdown_pct': float(drawdown_pct[i]),
+            'drawdown_days': int(drawdown_days[i]),
+        })
+    return rows
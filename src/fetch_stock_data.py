@@ -41,7 +41,7 @@ def fetch_data_for_today():
 
         if stock_data.get('success'):
             # Get all trades for this ticker today
-            trades = db.get_all_trades()
+            trades = db.get_trades(['id', 'ticker', 'date', 'data_fetched'], start=today, end=today)
             ticker_trades = trades[
                 (trades['ticker'] == ticker) &
                 (trades['date'] == today) &
@@ -0,0 +1,158 @@
+"""
+Metrics engine
+Trade statistics maintained incrementally with running-moment (Welford) accumulators, so
+adding a trade costs O(1) instead of recomputing over the whole trades table.
+
+Two sets of moments are kept: one over individual trade P/L (standard deviation, SQN)
+and one over daily P/L totals (Sharpe, Sortino). A new trade changes its day's total, so
+the daily accumulator removes the old total and adds the new one.
+"""
+import math
+
+import numpy as np
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Accumulator fields persisted in the trade_metrics table, in column order
+METRIC_FIELDS = ('trade_count', 'trade_mean', 'trade_m2', 'wins', 'win_sum', 'losses', 'loss_sum',
+                 'best', 'worst', 'day_count', 'day_mean', 'day_m2', 'day_downside_sq')
+
+
+class RunningMoments:
+    """Welford accumulator for count, mean and sum of squared deviations"""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def remove(self, x):
+        if self.count <= 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        previous_mean = (self.count * self.mean - x) / (self.count - 1)
+        self.m2 = max(self.m2 - (x - self.mean) * (x - previous_mean), 0.0)
+        self.mean = previous_mean
+        self.count -= 1
+
+    def std(self):
+        """Sample standard deviation (0 with fewer than two values)"""
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+
+class TradeMetrics:
+    """Running accumulators behind the extended stats"""
+
+    def __init__(self, **state):
+        state = {field: state.get(field) or 0 for field in METRIC_FIELDS}
+        self.trades = RunningMoments(int(state['trade_count']), state['trade_mean'], state['trade_m2'])
+        self.days = RunningMoments(int(state['day_count']), state['day_mean'], state['day_m2'])
+        self.wins = int(state['wins'])
+        self.win_sum = state['win_sum']
+        self.losses = int(state['losses'])
+        self.loss_sum = state['loss_sum']
+        self.best = state['best'] if self.trades.count else None
+        self.worst = state['worst'] if self.trades.count else None
+        self.day_downside_sq = state['day_downside_sq']
+
+    @classmethod
+    def from_history(cls, trade_pnl, daily_pnl):
+        """
+        Build the accumulators from scratch with NumPy
+
+        Args:
+            trade_pnl: P/L of every trade
+            daily_pnl: Total P/L of every trading day
+        """
+        trade_pnl = np.asarray(trade_pnl, dtype=float)
+        daily_pnl = np.asarray(daily_pnl, dtype=float)
+        metrics = cls()
+        if len(trade_pnl):
+            metrics.trades = RunningMoments(len(trade_pnl), float(trade_pnl.mean()),
+                                            float(((trade_pnl - trade_pnl.mean()) ** 2).sum()))
+            metrics.wins = int((trade_pnl > 0).sum())
+            metrics.win_sum = float(trade_pnl[trade_pnl > 0].sum())
+            metrics.losses = int((trade_pnl < 0).sum())
+            metrics.loss_sum = float(-trade_pnl[trade_pnl < 0].sum())
+            metrics.best = float(trade_pnl.max())
+            metrics.worst = float(trade_pnl.min())
+        if len(daily_pnl):
+            metrics.days = RunningMoments(len(daily_pnl), float(daily_pnl.mean()),
+                                          float(((daily_pnl - daily_pnl.mean()) ** 2).sum()))
+            metrics.day_downside_sq = float((np.minimum(daily_pnl, 0) ** 2).sum())
+        return metrics
+
+    def add_trade(self, profit_loss, previous_day_total=None):
+        """
+        Update for one new trade
+
+        Args:
+            profit_loss: The trade's P/L
+            previous_day_total: Its day's P/L total before the trade (None if it is the day's first trade)
+        """
+        self.trades.add(profit_loss)
+        if profit_loss > 0:
+            self.wins += 1
+            self.win_sum += profit_loss
+        elif profit_loss < 0:
+            self.losses += 1
+            self.loss_sum -= profit_loss
+        self.best = profit_loss if self.best is None else max(self.best, profit_loss)
+        self.worst = profit_loss if self.worst is None else min(self.worst, profit_loss)
+
+        if previous_day_total is not None:
+            self.days.remove(previous_day_total)
+            self.day_downside_sq -= min(previous_day_total, 0) ** 2
+            day_total = previous_day_total + profit_loss
+        else:
+            day_total = profit_loss
+        self.days.add(day_total)
+        self.day_downside_sq += min(day_total, 0) ** 2
+
+    def state(self):
+        """Accumulator values in METRIC_FIELDS order"""
+        return (self.trades.count, self.trades.mean, self.trades.m2, self.wins, self.win_sum, self.losses,
+                self.loss_sum, self.best, self.worst, self.days.count, self.days.mean, self.days.m2,
+                self.day_downside_sq)
+
+    def summary(self):
+        """
+        Derived metrics
+
+        Returns:
+            dict with total_trades, trading_days, win_rate, profit_factor, expectancy, payoff_ratio,
+            std_dev, sqn, daily_mean, daily_std, sharpe, sortino, best_trade and worst_trade
+            (ratios are None when undefined, e.g. profit factor without losses)
+        """
+        count = self.trades.count
+        avg_win = self.win_sum / self.wins if self.wins else 0.0
+        avg_loss = self.loss_sum / self.losses if self.losses else 0.0
+        std_dev = self.trades.std()
+        daily_std = self.days.std()
+        downside_dev = math.sqrt(self.day_downside_sq / self.days.count) if self.days.count else 0.0
+        annualize = math.sqrt(TRADING_DAYS_PER_YEAR)
+
+        return {
+            'total_trades': count,
+            'trading_days': self.days.count,
+            'win_rate': self.wins / count * 100 if count else 0.0,
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'profit_factor': self.win_sum / self.loss_sum if self.loss_sum else None,
+            'expectancy': self.trades.mean,
+            'payoff_ratio': avg_win / avg_loss if avg_loss else None,
+            'std_dev': std_dev,
+            'sqn': math.sqrt(count) * self.trades.mean / std_dev if std_dev else None,
+            'daily_mean': self.days.mean,
+            'daily_std': daily_std,
+            'sharpe': self.days.mean / daily_std * annualize if daily_std else None,
+            'sortino': self.days.mean / downside_dev * annualize if downside_dev else None,
+            'best_trade': self.best,
+            'worst_trade': self.worst,
+        }
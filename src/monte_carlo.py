@@ -0,0 +1,132 @@
+"""
+Monte Carlo equity simulation
+Resamples historical per-trade P/L (with replacement) to project equity paths over the
+next N trades, and reports risk of ruin, drawdown percentiles and outcome bands.
+
+Paths are simulated in NumPy batches (one (paths x trades) matrix per batch). Runs of
+up to IN_PROCESS_PATHS paths - the dashboard panel's DASHBOARD_PATHS - stay in the
+calling process; larger ones are spread across one long-lived ProcessPoolExecutor
+started with the spawn method, since forking a multi-threaded web worker can deadlock.
+Each batch gets its own child seed, so results are reproducible for a given seed
+regardless of where the batches run.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_PATHS = 100_000
+DASHBOARD_PATHS = 20_000
+DEFAULT_TRADES = 250
+BATCH_SIZE = 1_000
+
+# Larger runs go to the worker pool
+IN_PROCESS_PATHS = 20_000
+
+# Ruin = equity falls to this fraction of the starting capital
+RUIN_LEVEL = 0.5
+
+# Equity is sampled at this many points along each path for the outcome bands
+CHECKPOINTS = 50
+
+DRAWDOWN_PERCENTILES = (50, 75, 90, 95, 99)
+BAND_PERCENTILES = (5, 25, 50, 75, 95)
+
+# (pid, workers, executor) of the pool, created on first use
+pool = None
+pool_lock = threading.Lock()
+
+
+def get_executor(workers):
+    """The process's worker pool (recreated in a forked child or for a different size)"""
+    global pool
+    with pool_lock:
+        if pool is None or pool[0] != os.getpid() or pool[1] != workers:
+            if pool is not None and pool[0] == os.getpid():
+                # Stop the old pool's workers once the batches already submitted to it finish
+                # (a pool inherited through fork belongs to the parent and is left alone)
+                pool[2].shutdown(wait=False)
+            pool = (os.getpid(), workers,
+                    ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')))
+        return pool[2]
+
+
+def simulate_batch(pnl, n_paths, n_trades, start_capital, ruin_level, seed):
+    """
+    Simulate one batch of equity paths
+
+    Returns:
+        (final equity, max drawdown in $, ruined flags, equity at checkpoints as float32)
+    """
+    rng = np.random.default_rng(seed)
+    steps = pnl[rng.integers(0, len(pnl), size=(n_paths, n_trades))]
+    equity = start_capital + np.cumsum(steps, axis=1)
+
+    peaks = np.maximum(np.maximum.accumulate(equity, axis=1), start_capital)
+    max_drawdown = (peaks - equity).max(axis=1)
+    ruined = (equity <= ruin_level).any(axis=1)
+
+    checkpoints = np.unique(np.linspace(0, n_trades - 1, min(CHECKPOINTS, n_trades)).astype(int))
+    # Copy the last column: a view would keep the whole batch matrix alive
+    return equity[:, -1].copy(), max_drawdown, ruined, equity[:, checkpoints].astype(np.float32)
+
+
+def run_simulation(pnl, start_capital, n_paths=DEFAULT_PATHS, n_trades=DEFAULT_TRADES, ruin_level=RUIN_LEVEL,
+                   batch_size=BATCH_SIZE, workers=None, seed=0):
+    """
+    Run a Monte Carlo simulation of future trades
+
+    Args:
+        pnl: Historical per-trade P/L to resample
+        start_capital: Equity at the start of every path
+        n_paths: Number of simulated paths
+        n_trades: Trades per path
+        ruin_level: Ruin threshold as a fraction of start_capital
+        batch_size: Paths per NumPy batch
+        workers: Worker processes for runs over IN_PROCESS_PATHS (default: CPU count; 1 runs in-process)
+        seed: Base seed
+
+    Returns:
+        dict with n_paths, n_trades, start_capital, ruin_equity, risk_of_ruin (%),
+        profit_probability (%), drawdown_percentiles {p: $}, drawdown_pct_percentiles {p: % of start},
+        final_percentiles {p: equity}, bands {'trade': [...], p: [...]} and mean_final
+    """
+    pnl = np.asarray(pnl, dtype=float)
+    ruin_equity = start_capital * ruin_level
+    batches = [min(batch_size, n_paths - start) for start in range(0, n_paths, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    args = [(pnl, size, n_trades, start_capital, ruin_equity, child) for size, child in zip(batches, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or n_paths <= IN_PROCESS_PATHS:
+        results = [simulate_batch(*a) for a in args]
+    else:
+        results = list(get_executor(workers).map(simulate_batch, *zip(*args), chunksize=8))
+
+    final = np.concatenate([r[0] for r in results])
+    max_drawdown = np.concatenate([r[1] for r in results])
+    ruined = np.concatenate([r[2] for r in results])
+    checkpoints = np.concatenate([r[3] for r in results])
+
+    checkpoint_trades = np.unique(np.linspace(0, n_trades - 1, min(CHECKPOINTS, n_trades)).astype(int)) + 1
+    band_values = np.percentile(checkpoints, BAND_PERCENTILES, axis=0)
+    drawdowns = np.percentile(max_drawdown, DRAWDOWN_PERCENTILES)
+
+    return {
+        'n_paths': int(n_paths),
+        'n_trades': int(n_trades),
+        'start_capital': float(start_capital),
+        'ruin_equity': float(ruin_equity),
+        'risk_of_ruin': float(ruined.mean() * 100),
+        'profit_probability': float((final > start_capital).mean() * 100),
+        'mean_final': float(final.mean()),
+        'drawdown_percentiles': {p: float(v) for p, v in zip(DRAWDOWN_PERCENTILES, drawdowns)},
+        'drawdown_pct_percentiles': {p: float(v / start_capital * 100) if start_capital > 0 else None
+                                     for p, v in zip(DRAWDOWN_PERCENTILES, drawdowns)},
+        'final_percentiles': {p: float(v) for p, v in
+                              zip(BAND_PERCENTILES, np.percentile(final, BAND_PERCENTILES))},
+        'bands': {'trade': checkpoint_trades.tolist(),
+                  **{p: values.astype(float).tolist() for p, values in zip(BAND_PERCENTILES, band_values)}},
+    }
@@ -0,0 +1,223 @@
+"""
+Prometheus metrics
+Renders the dashboard's runtime numbers in the Prometheus text exposition format
+(version 0.0.4) for the /metrics endpoint:
+
+    tdash_callback_latency_seconds   histogram per callback (callback_metrics.py)
+    tdash_callback_errors_total      failed callback invocations
+    tdash_callback_payload_bytes     response bytes sent per callback
+    tdash_db_query_seconds           histogram over all SQL statements (sql_trace.py)
+    tdash_db_source_*                statements and time per TradingDatabase method
+    tdash_db_slow_queries_total      statements over the slow query threshold
+    tdash_db_write_*                 writer queue batches, operations, failures and depth
+    tdash_cache_*                    result cache hits/misses and hit ratio per cache
+    tdash_api_requests_*             daily API quota per provider
+    tdash_db_file_size_bytes         database file size (including WAL)
+    process_resident_memory_bytes    RSS of the server process
+
+Written by hand rather than through prometheus_client, so there is no extra dependency;
+every value is read from structures the app already keeps.
+
+Each worker process keeps its own numbers, and a scrape reaches whichever worker takes
+the request, so every series carries a pid label: counters are this process's since it
+started (persisted callback totals are not included) and can be summed across workers
+with `sum without (pid) (...)`.
+"""
+import os
+import sys
+import time
+
+from api_quota import requests_today
+from callback_metrics import LATENCY_BUCKETS_MS
+from sql_trace import QUERY_BUCKETS_MS
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+PROCESS_START = time.time()
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{escape_label(v)}"' for k, v in labels.items()) + '}'
+
+
+def format_value(value):
+    if value is None:
+        return 'NaN'
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsWriter:
+    """Collects metric families and renders them as exposition text"""
+
+    def __init__(self, labels=None):
+        self.lines = []
+        # Added to every sample
+        self.labels = labels or {}
+
+    def family(self, name, metric_type, help_text):
+        self.lines.append(f'# HELP {name} {help_text}')
+        self.lines.append(f'# TYPE {name} {metric_type}')
+
+    def sample(self, name, value, labels=None):
+        self.lines.append(f'{name}{format_labels({**self.labels, **(labels or {})})} {format_value(value)}')
+
+    def histogram(self, name, bounds_ms, buckets, total_ms, labels=None):
+        """One histogram series from per-bucket counts (the last count is above every bound)"""
+        labels = labels or {}
+        cumulative = 0
+        for bound, count in zip(bounds_ms, buckets):
+            cumulative += count
+            self.sample(f'{name}_bucket', cumulative, {**labels, 'le': format_value(bound / 1000)})
+        cumulative += buckets[-1]
+        self.sample(f'{name}_bucket', cumulative, {**labels, 'le': '+Inf'})
+        self.sample(f'{name}_sum', total_ms / 1000, labels)
+        self.sample(f'{name}_count', cumulative, labels)
+
+    def render(self):
+        return '\n'.join(self.lines) + '\n'
+
+
+def resident_memory_bytes():
+    """Current RSS (None where it cannot be read)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def db_file_size(db_name):
+    """Database file size including its WAL and shared-memory files"""
+    return sum(os.path.getsize(db_name + suffix) for suffix in ('', '-wal', '-shm')
+               if os.path.exists(db_name + suffix))
+
+
+def write_callback_metrics(writer, callback_metrics):
+    summaries = callback_metrics.summaries(all_time=False)
+
+    writer.family('tdash_callback_latency_seconds', 'histogram', 'Dash callback latency')
+    for s in summaries:
+        writer.histogram('tdash_callback_latency_seconds', LATENCY_BUCKETS_MS, s['buckets'], s['total_ms'],
+                         {'callback': s['name']})
+
+    writer.family('tdash_callback_errors_total', 'counter', 'Dash callback invocations that raised')
+    for s in summaries:
+        writer.sample('tdash_callback_errors_total', s['errors'], {'callback': s['name']})
+
+    writer.family('tdash_callback_prevented_total', 'counter', 'Dash callback invocations that raised PreventUpdate')
+    for s in summaries:
+        writer.sample('tdash_callback_prevented_total', s['prevented'], {'callback': s['name']})
+
+    writer.family('tdash_callback_payload_bytes_total', 'counter', 'Dash callback response bytes')
+    for s in summaries:
+        writer.sample('tdash_callback_payload_bytes_total', s['payload_bytes'], {'callback': s['name']})
+
+
+def write_db_metrics(writer, db):
+    tracer = db.sql_tracer
+    statements = tracer.summaries()
+    total_ms = sum(s['total_ms'] for s in statements)
+
+    writer.family('tdash_db_query_seconds', 'histogram', 'SQL statement duration, including fetching rows')
+    writer.histogram('tdash_db_query_seconds', QUERY_BUCKETS_MS, tracer.buckets, total_ms)
+
+    by_source = {}
+    for s in statements:
+        totals = by_source.setdefault(s['source'] or 'unknown', [0, 0.0, 0])
+        totals[0] += s['count']
+        totals[1] += s['total_ms']
+        totals[2] += s['errors']
+
+    writer.family('tdash_db_source_queries_total', 'counter', 'SQL statements run per TradingDatabase method')
+    for source, (count, _, _) in sorted(by_source.items()):
+        writer.sample('tdash_db_source_queries_total', count, {'source': source})
+    writer.family('tdash_db_source_seconds_total', 'counter', 'SQL time per TradingDatabase method')
+    for source, (_, seconds_ms, _) in sorted(by_source.items()):
+        writer.sample('tdash_db_source_seconds_total', seconds_ms / 1000, {'source': source})
+    writer.family('tdash_db_source_errors_total', 'counter', 'Failed SQL statements per TradingDatabase method')
+    for source, (_, _, errors) in sorted(by_source.items()):
+        writer.sample('tdash_db_source_errors_total', errors, {'source': source})
+
+    writer.family('tdash_db_slow_queries_total', 'counter', 'SQL statements over the slow query threshold')
+    writer.sample('tdash_db_slow_queries_total', tracer.slow_count)
+    writer.family('tdash_db_slow_query_threshold_seconds', 'gauge', 'Slow query threshold')
+    writer.sample('tdash_db_slow_query_threshold_seconds', tracer.slow_ms / 1000)
+
+    queue_stats = db.writer.stats()
+    writer.family('tdash_db_write_batches_total', 'counter', 'Group commits by the writer queue')
+    writer.sample('tdash_db_write_batches_total', queue_stats['batches'])
+    writer.family('tdash_db_write_operations_total', 'counter', 'Write operations committed by the writer queue')
+    writer.sample('tdash_db_write_operations_total', queue_stats['operations'])
+    writer.family('tdash_db_write_failures_total', 'counter', 'Write operations that failed or were rolled back')
+    writer.sample('tdash_db_write_failures_total', queue_stats['failures'])
+    writer.family('tdash_db_write_queue_depth', 'gauge', 'Write operations waiting for the writer')
+    writer.sample('tdash_db_write_queue_depth', queue_stats['queued'])
+
+    writer.family('tdash_db_file_size_bytes', 'gauge', 'Database file size, including WAL')
+    writer.sample('tdash_db_file_size_bytes', db_file_size(db.db_name))
+
+    cache_stats = sorted(db.cache_stats.items())
+    writer.family('tdash_cache_hits_total', 'counter', 'Result cache hits')
+    for name, (hits, _) in cache_stats:
+        writer.sample('tdash_cache_hits_total', hits, {'cache': name})
+    writer.family('tdash_cache_misses_total', 'counter', 'Result cache misses (recomputations)')
+    for name, (_, misses) in cache_stats:
+        writer.sample('tdash_cache_misses_total', misses, {'cache': name})
+    writer.family('tdash_cache_hit_ratio', 'gauge', 'Result cache hits / lookups')
+    for name, (hits, misses) in cache_stats:
+        writer.sample('tdash_cache_hit_ratio', hits / (hits + misses) if hits + misses else None, {'cache': name})
+
+
+def write_api_metrics(writer):
+    from alpha_vantage_api import AlphaVantageAPI
+    from stock_data_api import StockDataAPI
+
+    providers = [(api.provider, api.max_requests, requests_today(api.provider))
+                 for api in (StockDataAPI, AlphaVantageAPI)]
+
+    writer.family('tdash_api_requests_today', 'gauge', 'API requests made today')
+    for provider, _, used in providers:
+        writer.sample('tdash_api_requests_today', used, {'provider': provider})
+    writer.family('tdash_api_requests_limit', 'gauge', 'Daily API request limit')
+    for provider, limit, _ in providers:
+        writer.sample('tdash_api_requests_limit', limit, {'provider': provider})
+    writer.family('tdash_api_requests_remaining', 'gauge', 'API requests left today')
+    for provider, limit, used in providers:
+        writer.sample('tdash_api_requests_remaining', max(limit - used, 0), {'provider': provider})
+
+
+def generate_metrics(db, callback_metrics):
+    """
+    Render every metric as Prometheus exposition text
+
+    Args:
+        db: TradingDatabase (SQL tracer, result cache, file)
+        callback_metrics: CallbackMetrics of the running app
+    """
+    writer = MetricsWriter({'pid': os.getpid()})
+    write_callback_metrics(writer, callback_metrics)
+    write_db_metrics(writer, db)
+    write_api_metrics(writer)
+
+    rss = resident_memory_bytes()
+    if rss is not None:
+        writer.family('process_resident_memory_bytes', 'gauge', 'Resident memory size in bytes')
+        writer.sample('process_resident_memory_bytes', rss)
+    writer.family('process_start_time_seconds', 'gauge', 'Start time of the process since unix epoch in seconds')
+    writer.sample('process_start_time_seconds', PROCESS_START)
+    writer.family('tdash_python_info', 'gauge', 'Python version of the server process')
+    writer.sample('tdash_python_info', 1, {'version': sys.version.split()[0]})
+    return writer.render()
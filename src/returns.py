@@ -0,0 +1,149 @@
+"""
+Returns module
+Performance figures that are not distorted by deposits and withdrawals, computed from
+the daily equity curve (see equity_curve.py).
+
+- Time-weighted return (TWR): daily sub-period returns chained together, so funding
+  events do not count as performance. Deposits and withdrawals are treated as arriving
+  at the start of their day.
+- Money-weighted return (MWR): the IRR of the investor's cash flows (opening balance,
+  deposits, withdrawals, closing balance), found for every period at once with a
+  vectorized Newton solver. Annualized only for spans of a year or more.
+"""
+from datetime import date as date_cls
+
+import numpy as np
+import pandas as pd
+
+DAYS_PER_YEAR = 365.0
+
+
+def daily_returns(curve):
+    """
+    Daily time-weighted sub-period returns
+
+    Args:
+        curve: Equity curve DataFrame (date, deposits, withdrawals, trading_pl, balance), oldest first
+
+    Returns:
+        NumPy array aligned with curve rows (0 where no capital was at work)
+    """
+    balance = curve['balance'].to_numpy(dtype=float)
+    flows = (curve['deposits'] - curve['withdrawals']).to_numpy(dtype=float)
+    previous = np.concatenate([[0.0], balance[:-1]])
+    capital = previous + flows
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.where(capital > 0, curve['trading_pl'].to_numpy(dtype=float) / capital, 0.0)
+    # A loss cannot take more than the whole account
+    return np.maximum(returns, -1.0)
+
+
+def solve_irr(cash_flows, times, guess=0.1, tol=1e-10, max_iter=100):
+    """
+    Solve NPV(rate) = 0 for many cash flow series at once with Newton's method
+
+    Args:
+        cash_flows: (series, flows) array, zero-padded
+        times: (series, flows) array of flow times, in units of the rate's period
+        guess: Starting rate
+
+    Returns:
+        Rates per unit of time, NaN where a series has no sign change or did not converge
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    times = np.asarray(times, dtype=float)
+    rate = np.full(cash_flows.shape[0], guess)
+    step = np.full(cash_flows.shape[0], np.inf)
+
+    for _ in range(max_iter):
+        growth = (1.0 + rate)[:, np.newaxis] ** -times
+        npv = (cash_flows * growth).sum(axis=1)
+        slope = (-times * cash_flows * growth).sum(axis=1) / (1.0 + rate)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = np.where(slope != 0, npv / slope, 0.0)
+        rate = np.maximum(rate - step, -0.9999)
+        if np.all(np.abs(step) < tol):
+            break
+
+    has_sign_change = (cash_flows > 0).any(axis=1) & (cash_flows < 0).any(axis=1)
+    return np.where(has_sign_change & (np.abs(step) < 1e-6), rate, np.nan)
+
+
+def period_cash_flows(period_curve, opening_balance):
+    """
+    Investor cash flows for one period: opening balance in, funding events, closing balance out
+
+    Times are fractions of the period, so the solved rate is the period's own return.
+
+    Returns:
+        (cash flows, times as fractions of the period, period length in years)
+    """
+    ordinals = np.array([date_cls.fromisoformat(d).toordinal() for d in period_curve['date']])
+    days = ordinals[-1] - ordinals[0] + 1
+    times = (ordinals - ordinals[0]) / days
+
+    # Money put in is negative, money taken out positive
+    flows = -(period_curve['deposits'] - period_curve['withdrawals']).to_numpy(dtype=float)
+    flows[0] -= opening_balance
+    closing = period_curve['balance'].iloc[-1]
+
+    return np.append(flows, closing), np.append(times, 1.0), days / DAYS_PER_YEAR
+
+
+def compute_returns(curve, period_chars):
+    """
+    TWR and MWR per period
+
+    Args:
+        curve: Equity curve DataFrame, oldest first
+        period_chars: Date prefix that names a period: 7 for months ('YYYY-MM'), 4 for years,
+            None for one overall period
+
+    Returns:
+        List of dicts with period, start_date, end_date, twr, mwr, irr_annualized,
+        trading_pl, net_flows and end_balance. Returns are in percent, None when undefined;
+        irr_annualized is only given for periods of at least a year.
+    """
+    if len(curve) == 0:
+        return []
+
+    curve = curve.reset_index(drop=True)
+    returns = daily_returns(curve)
+    keys = curve['date'].str[:period_chars] if period_chars else pd.Series('All', index=curve.index)
+    opening = curve['balance'].shift(1, fill_value=0.0)
+
+    periods = []
+    flow_rows = []
+    for key, index in curve.groupby(keys, sort=True).groups.items():
+        rows = curve.loc[index]
+        flows, times, length = period_cash_flows(rows, opening.loc[index[0]])
+        flow_rows.append((flows, times))
+        periods.append({
+            'period': key,
+            'start_date': rows['date'].iloc[0],
+            'end_date': rows['date'].iloc[-1],
+            'twr': float(np.prod(1.0 + returns[index]) - 1.0) * 100,
+            'length': length,
+            'trading_pl': float(rows['trading_pl'].sum()),
+            'net_flows': float((rows['deposits'] - rows['withdrawals']).sum()),
+            'end_balance': float(rows['balance'].iloc[-1]),
+        })
+
+    # Pad every period's flows to one matrix and solve all IRRs together
+    width = max(len(flows) for flows, _ in flow_rows)
+    cash_flows = np.zeros((len(flow_rows), width))
+    times = np.zeros((len(flow_rows), width))
+    for i, (flows, flow_times) in enumerate(flow_rows):
+        cash_flows[i, :len(flows)] = flows
+        times[i, :len(flow_times)] = flow_times
+    irr = solve_irr(cash_flows, times)
+
+    for period, rate in zip(periods, irr):
+        length = period.pop('length')
+        if np.isnan(rate):
+            period['mwr'] = None
+            period['irr_annualized'] = None
+        else:
+            period['mwr'] = float(rate) * 100
+            period['irr_annualized'] = ((1.0 + float(rate)) ** (1.0 / length) - 1.0) * 100 if length >= 1 else None
+    return periods
@@ -0,0 +1,67 @@
+"""
+Rolling metrics
+Win rate, average P/L and profit factor over the last N trades, and P/L over the last
+N trading days, for spotting changes in edge.
+
+Window sums are differences of cumulative sums (c[i] - c[i - N]), the vectorized form of
+a ring buffer: every window costs O(1) no matter how long it is. Windows are only
+reported once they are full.
+"""
+import numpy as np
+
+TRADE_WINDOWS = (20, 50, 100)
+DAY_WINDOWS = (5, 20)
+
+
+def window_sums(values, window):
+    """Sum of each trailing window of a 1-D array, NaN until the first full window"""
+    sums = np.full(len(values), np.nan)
+    if len(values) >= window:
+        cumulative = np.concatenate([[0.0], np.cumsum(values, dtype=float)])
+        sums[window - 1:] = cumulative[window:] - cumulative[:-window]
+    return sums
+
+
+def to_json_list(values):
+    """Float list with NaN/inf replaced by None"""
+    return [float(v) if np.isfinite(v) else None for v in values]
+
+
+def rolling_trade_metrics(profit_loss, windows=TRADE_WINDOWS):
+    """
+    Rolling per-trade metrics
+
+    Args:
+        profit_loss: Trade P/L in date and entry time order
+        windows: Trade counts to roll over
+
+    Returns:
+        {window: {'win_rate', 'avg_pl', 'profit_factor'}} of lists aligned with the trades
+    """
+    pnl = np.asarray(profit_loss, dtype=float)
+    wins = (pnl > 0).astype(float)
+    gross_wins = np.where(pnl > 0, pnl, 0.0)
+    gross_losses = np.where(pnl < 0, -pnl, 0.0)
+
+    result = {}
+    for window in windows:
+        loss_sums = window_sums(gross_losses, window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            profit_factor = np.where(loss_sums > 0, window_sums(gross_wins, window) / loss_sums, np.nan)
+        result[window] = {
+            'win_rate': to_json_list(window_sums(wins, window) / window * 100),
+            'avg_pl': to_json_list(window_sums(pnl, window) / window),
+            'profit_factor': to_json_list(profit_factor),
+        }
+    return result
+
+
+def rolling_day_pnl(daily_pnl, windows=DAY_WINDOWS):
+    """
+    P/L over the trailing N trading days
+
+    Returns:
+        {window: list aligned with the days}
+    """
+    pnl = np.asarray(daily_pnl, dtype=float)
+    return {window: to_json_list(window_sums(pnl, window)) for window in windows}
@@ -0,0 +1,94 @@
+"""
+Cross-process result cache
+TradingDatabase.cached memoizes results in a per-process dict, so with several worker
+processes (gunicorn -w N) every worker would recompute every aggregate after each change.
+SharedCache keeps the pickled results in a small SQLite file next to the database, under
+the same keys and tagged with the data version they were computed for: a result one
+worker computed serves the others until the data changes.
+
+The cache is best effort: if its file is busy or unreadable, results are simply
+recomputed. Enable it with SHARED_CACHE = True (or a file path) in config.py,
+TRADING_SHARED_CACHE in the environment, or create_app(config={'SHARED_CACHE': True}).
+"""
+import os
+import pickle
+import sqlite3
+import threading
+
+# How long a worker waits for another one writing the cache
+BUSY_TIMEOUT_SECONDS = 0.5
+
+
+def get_configured_shared_cache(db_name, setting=None):
+    """
+    Path of the shared cache file, or None when disabled
+
+    Args:
+        setting: True/False, a path, or None to read SHARED_CACHE from config.py / TRADING_SHARED_CACHE
+    """
+    if setting is None:
+        try:
+            from config import SHARED_CACHE as setting
+        except ImportError:
+            setting = os.environ.get('TRADING_SHARED_CACHE')
+    if isinstance(setting, str) and setting.lower() in ('', '0', 'false', 'no'):
+        setting = False
+    elif isinstance(setting, str) and setting.lower() in ('1', 'true', 'yes'):
+        setting = True
+    if not setting:
+        return None
+    return setting if isinstance(setting, str) else os.path.splitext(db_name)[0] + '_cache.db'
+
+
+class SharedCache:
+    """Pickled results keyed by cache key and data version, shared through one SQLite file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_SECONDS)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('''
+                     CREATE TABLE IF NOT EXISTS results
+                     (
+                         key     TEXT PRIMARY KEY,
+                         version TEXT NOT NULL,
+                         value   BLOB NOT NULL
+                     )
+                     ''')
+        conn.commit()
+        conn.close()
+
+    def get_connection(self):
+        """One connection per thread and process (connections must not cross a fork)"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None or self.local.pid != os.getpid():
+            conn = self.local.conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS)
+            self.local.pid = os.getpid()
+        return conn
+
+    def get(self, key, version):
+        """(True, value) if key was cached for version, else (False, None)"""
+        try:
+            row = self.get_connection().execute('SELECT value FROM results WHERE key = ? AND version = ?',
+                                                (key, repr(version))).fetchone()
+            return (True, pickle.loads(row[0])) if row else (False, None)
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return False, None
+
+    def set(self, key, version, value):
+        try:
+            conn = self.get_connection()
+            conn.execute('INSERT OR REPLACE INTO results (key, version, value) VALUES (?, ?, ?)',
+                         (key, repr(version), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+            conn.commit()
+        except (sqlite3.Error, pickle.PicklingError, TypeError, AttributeError):
+            pass
+
+    def clear(self):
+        try:
+            conn = self.get_connection()
+            conn.execute('DELETE FROM results')
+            conn.commit()
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,305 @@
+"""
+SQL statement tracing
+Every connection TradingDatabase opens is a TracedConnection: each statement is timed
+(execute plus the fetches that read its rows) and aggregated per normalized statement
+(whitespace collapsed, literals replaced with ?) into counts, errors, rows and
+total/max duration. Statements slower than the threshold are written to the
+slow_queries table, with the parameter-expanded SQL captured through
+sqlite3.Connection.set_trace_callback and the TradingDatabase method that ran them.
+
+Slow statements are buffered and queued on the database's WriteQueue after the traced
+connection closes (or is flushed, for the writer queue's long-lived connection), so
+logging never runs inside (or commits) the caller's transaction, and closing a
+connection never waits for the write lock.
+
+Set the threshold with SLOW_QUERY_MS in config.py or TRADING_SLOW_QUERY_MS in the
+environment (default DEFAULT_SLOW_QUERY_MS).
+"""
+import bisect
+import functools
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from datetime import datetime
+
+DEFAULT_SLOW_QUERY_MS = 100
+
+# Histogram bucket upper bounds (ms) over all statements; the last bucket is everything slower
+QUERY_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# Slow statements kept in the table / buffered while the database is busy
+SLOW_QUERY_KEEP = 1000
+PENDING_LIMIT = 500
+
+# Expanded SQL stored with each slow statement is cut to this length
+MAX_SQL_LENGTH = 2000
+
+# How far up the stack to look for the TradingDatabase method that ran a statement
+CALLER_DEPTH = 12
+DATABASE_HELPERS = ('get_connection', 'get_read_only_connection', 'cached', 'compute')
+
+LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def get_configured_threshold():
+    """Read the slow query threshold (ms) from config.py or the environment"""
+    try:
+        from config import SLOW_QUERY_MS
+    except ImportError:
+        SLOW_QUERY_MS = None
+    return float(SLOW_QUERY_MS or os.environ.get('TRADING_SLOW_QUERY_MS') or DEFAULT_SLOW_QUERY_MS)
+
+
+@functools.lru_cache(maxsize=2048)
+def normalize_statement(sql):
+    """Statement text used to aggregate: whitespace collapsed, literals replaced with ?"""
+    return LITERAL_PATTERN.sub('?', WHITESPACE_PATTERN.sub(' ', sql).strip())
+
+
+def find_caller():
+    """Name of the nearest TradingDatabase method on the stack (or the nearest caller outside this module)"""
+    frame = sys._getframe(2)
+    fallback = None
+    for _ in range(CALLER_DEPTH):
+        if frame is None:
+            break
+        code = frame.f_code
+        if code.co_filename.endswith('database.py') and code.co_name not in DATABASE_HELPERS:
+            return f"TradingDatabase.{code.co_name}"
+        if fallback is None and not code.co_filename.endswith('sql_trace.py'):
+            fallback = code.co_name
+        frame = frame.f_back
+    return fallback
+
+
+def write_slow_queries(pending, conn):
+    """Writer queue operation inserting buffered slow statements and pruning old ones"""
+    # A plain cursor: the insert is not traced, so a slow one does not queue another
+    cursor = conn.cursor(sqlite3.Cursor)
+    try:
+        cursor.executemany('''
+                           INSERT INTO slow_queries (timestamp, duration_ms, statement, sql, source, rows, error)
+                           VALUES (?, ?, ?, ?, ?, ?, ?)
+                           ''', pending)
+        cursor.execute('DELETE FROM slow_queries WHERE id <= (SELECT MAX(id) FROM slow_queries) - ?',
+                       (SLOW_QUERY_KEEP,))
+    finally:
+        cursor.close()
+
+
+class StatementStats:
+    __slots__ = ('statement', 'count', 'errors', 'rows', 'total_ms', 'max_ms', 'source')
+
+    def __init__(self, statement):
+        self.statement = statement
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.source = None
+
+    def summary(self):
+        return {
+            'statement': self.statement,
+            'count': self.count,
+            'errors': self.errors,
+            'rows': self.rows,
+            'total_ms': self.total_ms,
+            'avg_ms': self.total_ms / self.count if self.count else None,
+            'max_ms': self.max_ms,
+            'source': self.source,
+        }
+
+
+class SQLTracer:
+    """Per-statement aggregates and the slow query buffer for one database file"""
+
+    def __init__(self, db_name, slow_ms=None):
+        self.db_name = db_name
+        self.slow_ms = get_configured_threshold() if slow_ms is None else slow_ms
+        self.stats = {}
+        self.pending = []
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.buckets = [0] * (len(QUERY_BUCKETS_MS) + 1)
+        self.slow_count = 0
+        # WriteQueue the slow statements are written through (set by TradingDatabase)
+        self.writer = None
+        self.writing = None
+
+    def connect(self, *args, **kwargs):
+        """Open a traced connection to the database"""
+        conn = sqlite3.connect(*args, factory=TracedConnection, **kwargs)
+        conn.attach(self)
+        return conn
+
+    def record(self, sql, elapsed_ms, rows=0, expanded=None, source=None, error=False):
+        statement = normalize_statement(sql)
+        with self.lock:
+            stats = self.stats.get(statement)
+            if stats is None:
+                stats = self.stats[statement] = StatementStats(statement)
+            stats.count += 1
+            stats.errors += error
+            stats.rows += max(rows, 0)
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.source = source or stats.source
+            self.buckets[bisect.bisect_left(QUERY_BUCKETS_MS, elapsed_ms)] += 1
+
+            if elapsed_ms >= self.slow_ms:
+                self.slow_count += 1
+            if elapsed_ms >= self.slow_ms and len(self.pending) < PENDING_LIMIT:
+                text = WHITESPACE_PATTERN.sub(' ', expanded or sql).strip()[:MAX_SQL_LENGTH]
+                self.pending.append((datetime.now().strftime('%Y-%m-%d %H:%M:%S'), round(elapsed_ms, 3),
+                                     statement, text, source, max(rows, 0), int(error)))
+
+    def flush(self):
+        """
+        Queue buffered slow statements for the writer (kept buffered if the write fails)
+
+        Returns:
+            Future of the queued write, or None if there was nothing to write
+        """
+        with self.lock:
+            if self.writer is None or not self.pending or self.writing is not None:
+                # A write already queued takes these with the next flush
+                return self.writing
+            pending, self.pending = self.pending, []
+            self.writing = future = self.writer.submit(functools.partial(write_slow_queries, pending))
+        future.add_done_callback(functools.partial(self.flushed, pending))
+        return future
+
+    def flushed(self, pending, future):
+        with self.lock:
+            self.writing = None
+            if future.cancelled() or future.exception() is not None:
+                self.pending = (pending + self.pending)[:PENDING_LIMIT]
+
+    def summaries(self, sort_by='total_ms', limit=None):
+        """Per-statement aggregates, most expensive first"""
+        with self.lock:
+            summaries = [stats.summary() for stats in self.stats.values()]
+        summaries.sort(key=lambda s: s[sort_by] or 0, reverse=True)
+        return summaries[:limit] if limit else summaries
+
+    def reset(self):
+        with self.lock:
+            self.stats = {}
+            self.started = time.time()
+            self.buckets = [0] * (len(QUERY_BUCKETS_MS) + 1)
+            self.slow_count = 0
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor that times each statement, including fetching its rows"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.active = None
+
+    def run(self, method, sql, params):
+        self.finish()
+        conn = self.connection
+        conn.traced.clear()
+        source = find_caller()
+        started = time.perf_counter()
+        try:
+            result = method(sql, params)
+        except Exception:
+            conn.tracer.record(sql, (time.perf_counter() - started) * 1000, 0,
+                               conn.traced[0] if conn.traced else None, source, error=True)
+            raise
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        # [sql, elapsed ms, rows, expanded sql, source]
+        self.active = [sql, elapsed_ms, self.rowcount if self.description is None else 0,
+                       conn.traced[0] if conn.traced else None, source]
+        if self.description is None:
+            self.finish()
+        return result
+
+    def execute(self, sql, parameters=()):
+        return self.run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.run(super().executemany, sql, seq_of_parameters)
+
+    def fetch(self, method, *args):
+        started = time.perf_counter()
+        rows = method(*args)
+        if self.active is not None:
+            self.active[1] += (time.perf_counter() - started) * 1000
+            if rows is None:
+                self.finish()
+            elif isinstance(rows, list):
+                self.active[2] += len(rows)
+                if not args or len(rows) < args[0]:
+                    self.finish()
+            else:
+                self.active[2] += 1
+        return rows
+
+    def fetchone(self):
+        return self.fetch(super().fetchone)
+
+    def fetchmany(self, size=None):
+        return self.fetch(super().fetchmany, size or self.arraysize)
+
+    def fetchall(self):
+        return self.fetch(super().fetchall)
+
+    def finish(self):
+        """Record the statement this cursor last ran, if not done yet"""
+        if self.active is not None:
+            sql, elapsed_ms, rows, expanded, source = self.active
+            self.active = None
+            self.connection.tracer.record(sql, elapsed_ms, rows, expanded, source)
+
+    def close(self):
+        self.finish()
+        super().close()
+
+
+class TracedConnection(sqlite3.Connection):
+    """Connection whose cursors are TracedCursors; flushes slow statements on close"""
+
+    def attach(self, tracer):
+        self.tracer = tracer
+        self.traced = []
+        self.cursors = weakref.WeakSet()
+        self.set_trace_callback(self.on_trace)
+
+    def on_trace(self, sql):
+        # Only the statement's own expanded SQL is kept (not implicit BEGINs or trigger statements)
+        if not self.traced and not sql.startswith(('BEGIN', 'COMMIT')):
+            self.traced.append(sql)
+
+    def cursor(self, factory=TracedCursor):
+        cursor = super().cursor(factory)
+        if isinstance(cursor, TracedCursor):
+            self.cursors.add(cursor)
+        return cursor
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def flush(self):
+        """Record statements still being fetched and write buffered slow ones (for connections kept open)"""
+        for cursor in list(self.cursors):
+            cursor.finish()
+        self.tracer.flush()
+
+    def close(self):
+        for cursor in list(self.cursors):
+            cursor.finish()
+        super().close()
+        self.tracer.flush()
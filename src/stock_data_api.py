@@ -5,13 +5,16 @@ Free tier: 250 requests/day
 import requests
 from datetime import datetime
 
+from api_quota import DailyQuota
+
+
+class StockDataAPI(DailyQuota):
+    provider = 'fmp'
+    max_requests = 250
 
-class StockDataAPI:
     def __init__(self, api_key):
         self.api_key = api_key
         self.base_url = "https://financialmodelingprep.com/stable"
-        self.requests_today = 0
-        self.max_requests = 250
 
     def get_stock_profile(self, ticker):
         """
@@ -0,0 +1,290 @@
+"""
+Synthetic trading history
+Deterministic, realistic-looking trade history for benchmarks and load testing: small-cap
+momentum trades clustered around the open, a Zipf-like ticker mix with per-ticker float,
+volume and price levels, fat-tailed returns, capital deposits/withdrawals and the action
+logs the app writes alongside them.
+
+The same (n_trades, seed, end_date) always produces the same rows. Generation is
+vectorized in NumPy; rows are inserted in executemany chunks inside one transaction and
+go through the normal triggers, so data versions, search indexes and the equity curve
+state stay consistent (the 1M scale takes a couple of minutes, mostly indexing).
+
+Usage:
+    python src/synthetic_data.py 100k --db synthetic_100k.db
+"""
+import os
+import sqlite3
+import sys
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+SCALES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+DEFAULT_SEED = 42
+DEFAULT_END_DATE = '2025-12-31'
+
+TRADES_PER_DAY = 4
+TICKER_POOL_SIZE = 600
+INSERT_CHUNK_SIZE = 50_000
+
+SECTORS = ['Healthcare', 'Technology', 'Consumer Cyclical', 'Financial Services', 'Energy',
+           'Industrials', 'Communication Services', 'Basic Materials', 'Real Estate', 'Utilities']
+NEWS_TYPES = ['None', 'Earnings Beat', 'Earnings Miss', 'Contract Win', 'Partnership', 'FDA Approval',
+              'Clinical Trial Results', 'Analyst Upgrade', 'Short Squeeze', 'Reverse Split', 'Offering',
+              'Merger/Acquisition', 'Sector Rotation']
+NOTES = ['Clean break of premarket high', 'Chased the first pullback', 'Halted up, sold the resume',
+         'Faded the open', 'Added on the dip, should have cut', 'Perfect flag setup',
+         'Stopped out on the wick', 'Low float squeeze', 'Red to green move', 'Sized too big']
+NOTE_RATE = 0.2
+
+# Entry times: most trades in the first hour after the open, the rest premarket (minutes after midnight)
+OPEN_SHARE = 0.7
+FIRST_ENTRY, LAST_EXIT = 4 * 60, 19 * 60 + 59
+
+STOCK_METRIC_COLUMNS = ['float', 'avg_volume', 'day_volume', 'market_cap', 'stock_type', 'exchange',
+                        'auto_sector', 'data_fetched']
+TRADE_COLUMNS = ['date', 'day_of_week', 'ticker', 'sector', 'news_type', 'entry_price', 'entry_time',
+                 'exit_price', 'exit_time', 'shares', 'position_size', 'hold_duration', 'profit_loss',
+                 'profit_loss_percent', 'is_win', 'notes', 'created_at'] + STOCK_METRIC_COLUMNS
+
+
+def parse_scale(scale):
+    """Trade count for a scale name ('10k') or number"""
+    return SCALES[scale.lower()] if str(scale).lower() in SCALES else int(scale)
+
+
+def trading_days(n_days, end_date):
+    """The last n_days weekdays up to end_date, oldest first (datetime64[D])"""
+    end = np.busday_offset(np.datetime64(end_date, 'D'), 0, roll='backward')
+    return np.busday_offset(end, np.arange(-(n_days - 1), 1))
+
+
+def ticker_universe(rng, size=TICKER_POOL_SIZE):
+    """Synthetic ticker symbols and their per-ticker attributes"""
+    letters = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
+    symbols = []
+    seen = set()
+    while len(symbols) < size:
+        symbol = ''.join(rng.choice(letters, size=rng.integers(3, 5)))
+        if symbol not in seen:
+            seen.add(symbol)
+            symbols.append(symbol)
+
+    float_shares = np.round(rng.lognormal(np.log(15e6), 1.0, size), -3)
+    return pd.DataFrame({
+        'ticker': symbols,
+        'sector': rng.choice(SECTORS, size=size),
+        'base_price': rng.lognormal(np.log(3.0), 0.9, size).clip(0.2, 80),
+        'float': float_shares,
+        'avg_volume': np.round(float_shares * rng.uniform(0.05, 0.6, size), -2),
+        'exchange': rng.choice(['NASDAQ', 'NYSE', 'AMEX'], size=size, p=[0.75, 0.1, 0.15]),
+    })
+
+
+def round_price(prices):
+    """Penny stocks keep 4 decimals, everything else 2"""
+    return np.where(prices < 1, np.round(prices, 4), np.round(prices, 2))
+
+
+def minutes_to_time(minutes):
+    """HH:MM strings for minutes after midnight"""
+    labels = np.array([f"{m // 60:02d}:{m % 60:02d}" for m in range(24 * 60)])
+    return labels[minutes]
+
+
+def generate_trades(n_trades, seed=DEFAULT_SEED, end_date=DEFAULT_END_DATE):
+    """
+    Generate a trade history
+
+    Args:
+        n_trades: Number of trades
+        seed: Random seed
+        end_date: Last trading day (YYYY-MM-DD)
+
+    Returns:
+        DataFrame with TRADE_COLUMNS, in date and entry time order
+    """
+    rng = np.random.default_rng(seed)
+    universe = ticker_universe(rng)
+
+    days = trading_days(max(1, -(-n_trades // TRADES_PER_DAY)), end_date)
+    day_index = np.sort(rng.integers(0, len(days), n_trades))
+
+    # Zipf-like ticker popularity: a few runners get traded over and over
+    weights = 1 / np.arange(1, len(universe) + 1) ** 1.1
+    ticker_index = rng.choice(len(universe), size=n_trades, p=weights / weights.sum())
+    tickers = universe.iloc[ticker_index].reset_index(drop=True)
+
+    at_open = rng.random(n_trades) < OPEN_SHARE
+    entry_minutes = np.where(at_open, rng.normal(9 * 60 + 45, 25, n_trades),
+                             rng.uniform(FIRST_ENTRY, 9 * 60 + 30, n_trades))
+    entry_minutes = entry_minutes.astype(int).clip(FIRST_ENTRY, LAST_EXIT - 1)
+    hold = (rng.exponential(7, n_trades) + 1).astype(int).clip(1, 120)
+    exit_minutes = np.minimum(entry_minutes + hold, LAST_EXIT)
+
+    # Keep each day's trades in entry time order
+    order = np.lexsort((entry_minutes, day_index))
+    day_index, entry_minutes, exit_minutes = day_index[order], entry_minutes[order], exit_minutes[order]
+
+    entry_price = round_price(tickers['base_price'].to_numpy() * rng.lognormal(0, 0.3, n_trades)).clip(0.01)
+    # Fat-tailed per-trade returns with a small positive edge (percent)
+    returns = rng.standard_t(3, n_trades) * 2.5 + 0.3
+    exit_price = round_price(entry_price * (1 + returns.clip(-60, 300) / 100)).clip(0.01)
+
+    position = rng.uniform(1_000, 20_000, n_trades)
+    shares = np.maximum(np.round(position / entry_price, -1), 1).astype(int)
+    profit_loss = (exit_price - entry_price) * shares
+
+    trade_dates = days[day_index]
+    date_labels = pd.DatetimeIndex(trade_dates)
+    notes = np.where(rng.random(n_trades) < NOTE_RATE, rng.choice(NOTES, size=n_trades), '')
+    day_volume = np.round(tickers['avg_volume'].to_numpy() * rng.lognormal(1.0, 0.8, n_trades), -2)
+    exit_times = minutes_to_time(exit_minutes)
+
+    return pd.DataFrame({
+        'date': date_labels.strftime('%Y-%m-%d'),
+        'day_of_week': date_labels.day_name(),
+        'ticker': tickers['ticker'].to_numpy(),
+        'sector': tickers['sector'].to_numpy(),
+        'news_type': rng.choice(NEWS_TYPES, size=n_trades),
+        'entry_price': entry_price,
+        'entry_time': minutes_to_time(entry_minutes),
+        'exit_price': exit_price,
+        'exit_time': exit_times,
+        'shares': shares,
+        'position_size': entry_price * shares,
+        'hold_duration': exit_minutes - entry_minutes,
+        'profit_loss': profit_loss,
+        'profit_loss_percent': (exit_price - entry_price) / entry_price * 100,
+        'is_win': (profit_loss > 0).astype(int),
+        'notes': notes,
+        'created_at': date_labels.strftime('%Y-%m-%d') + ' ' + exit_times + ':00',
+        'float': tickers['float'].to_numpy(),
+        'avg_volume': tickers['avg_volume'].to_numpy(),
+        'day_volume': day_volume,
+        'market_cap': np.round(tickers['float'].to_numpy() * entry_price * 1.5, -3),
+        'stock_type': 'Common Stock',
+        'exchange': tickers['exchange'].to_numpy(),
+        'auto_sector': tickers['sector'].to_numpy(),
+        'data_fetched': 1,
+    })[TRADE_COLUMNS]
+
+
+def generate_capital_transactions(trades, seed=DEFAULT_SEED):
+    """
+    Deposits and withdrawals over the span of a trade history
+
+    An opening deposit on the first day, then roughly monthly top-ups and occasional withdrawals.
+
+    Returns:
+        DataFrame with date, type, amount, notes
+    """
+    rng = np.random.default_rng([seed, 1])
+    if trades.empty:
+        return pd.DataFrame(columns=['date', 'type', 'amount', 'notes'])
+
+    months = pd.to_datetime(trades['date']).dt.to_period('M').unique()
+    rows = [(trades['date'].iloc[0], 'deposit', 25_000.0, 'Opening balance')]
+    for month in months[1:]:
+        day = str(month.start_time.date() + timedelta(days=int(rng.integers(0, 25))))
+        if rng.random() < 0.6:
+            rows.append((day, 'deposit', float(np.round(rng.uniform(500, 5_000), -1)), 'Monthly top-up'))
+        if rng.random() < 0.15:
+            rows.append((day, 'withdrawal', float(np.round(rng.uniform(1_000, 8_000), -1)), 'Withdrawal'))
+    return pd.DataFrame(rows, columns=['date', 'type', 'amount', 'notes'])
+
+
+def generate_logs(trades, transactions):
+    """
+    The action log the app writes alongside trades and capital changes
+
+    Returns:
+        DataFrame with timestamp, action_type, action_category, description, details, is_read
+    """
+    trade_logs = pd.DataFrame({
+        'timestamp': trades['created_at'],
+        'action_type': 'ADD_TRADE',
+        'action_category': 'TRADE',
+        'description': 'Added trade: ' + trades['ticker'] + ' - $' + trades['profit_loss'].map('{:.2f}'.format)
+                       + ' P/L',
+        'details': 'Entry: $' + trades['entry_price'].astype(str) + ', Exit: $' + trades['exit_price'].astype(str)
+                   + ', Shares: ' + trades['shares'].astype(str) + ', Date: ' + trades['date'],
+    })
+    capital_logs = pd.DataFrame({
+        'timestamp': transactions['date'] + ' 08:00:00',
+        'action_type': 'ADD_' + transactions['type'].str.upper(),
+        'action_category': 'CAPITAL',
+        'description': transactions['type'].str.capitalize() + ' added: $'
+                       + transactions['amount'].map('{:.2f}'.format),
+        'details': 'Date: ' + transactions['date'] + ', Notes: ' + transactions['notes'],
+    })
+    logs = pd.concat([trade_logs, capital_logs], ignore_index=True).sort_values('timestamp', kind='stable')
+    # Everything but the last day has been seen
+    logs['is_read'] = (logs['timestamp'].str[:10] < logs['timestamp'].max()[:10]).astype(int)
+    return logs.reset_index(drop=True)
+
+
+def insert_rows(cursor, table, frame, chunk_size=INSERT_CHUNK_SIZE):
+    """Insert a DataFrame into table in executemany chunks"""
+    columns = list(frame.columns)
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    for start in range(0, len(frame), chunk_size):
+        chunk = frame.iloc[start:start + chunk_size]
+        cursor.executemany(sql, zip(*(chunk[c].tolist() for c in columns)))
+
+
+def populate_database(db_name, n_trades, seed=DEFAULT_SEED, end_date=DEFAULT_END_DATE):
+    """
+    Create a database at db_name filled with a synthetic history
+
+    The file must not exist yet (the generator never touches a real history).
+
+    Returns:
+        {'trades': n, 'capital_transactions': n, 'logs': n}
+    """
+    if os.path.exists(db_name):
+        raise FileExistsError(f"{db_name} already exists")
+
+    from database import TradingDatabase
+    from database_migrations import migrate_add_stock_metrics
+
+    TradingDatabase(db_name)
+    migrate_add_stock_metrics(db_name)
+
+    trades = generate_trades(n_trades, seed, end_date)
+    transactions = generate_capital_transactions(trades, seed)
+    logs = generate_logs(trades, transactions)
+
+    conn = sqlite3.connect(db_name)
+    cursor = conn.cursor()
+    # Replace the 0 opening row create_tables inserts with the synthetic history
+    cursor.execute('DELETE FROM capital_transactions')
+    insert_rows(cursor, 'trades', trades)
+    insert_rows(cursor, 'capital_transactions', transactions)
+    insert_rows(cursor, 'logs', logs)
+    conn.commit()
+    conn.close()
+
+    return {'trades': len(trades), 'capital_transactions': len(transactions), 'logs': len(logs)}
+
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    parser = argparse.ArgumentParser(description='Generate a synthetic trading database')
+    parser.add_argument('scale', help=f"Trade count or one of: {', '.join(SCALES)}")
+    parser.add_argument('--db', help='Output database (default: synthetic_<scale>.db)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--end-date', default=DEFAULT_END_DATE, help='Last trading day, YYYY-MM-DD')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = populate_database(args.db or f'synthetic_{args.scale}.db', parse_scale(args.scale), args.seed,
+                               args.end_date)
+    print(f"✓ Generated {counts['trades']:,} trades, {counts['capital_transactions']:,} capital transactions "
+          f"and {counts['logs']:,} logs in {time.perf_counter() - started:.1f}s")
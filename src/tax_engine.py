@@ -0,0 +1,160 @@
+"""
+Bracket-aware tax engine
+Computes the federal + Georgia tax caused by trading income on top of W-2 income,
+vectorized with NumPy so whole what-if grids (filing status x household income x
+projected trading income) are evaluated in one pass.
+
+Short-term trading gains are taxed as ordinary income. Net trading losses reduce
+ordinary income by at most the capital loss limit ($3,000, $1,500 filing separately).
+"""
+import numpy as np
+
+# 2025 federal ordinary income brackets: (upper bound of bracket, rate)
+FEDERAL_BRACKETS = {
+    'single': [(11925, 0.10), (48475, 0.12), (103350, 0.22), (197300, 0.24), (250525, 0.32),
+               (626350, 0.35), (np.inf, 0.37)],
+    'married_jointly': [(23850, 0.10), (96950, 0.12), (206700, 0.22), (394600, 0.24), (501050, 0.32),
+                        (751600, 0.35), (np.inf, 0.37)],
+    'married_separately': [(11925, 0.10), (48475, 0.12), (103350, 0.22), (197300, 0.24), (250525, 0.32),
+                           (375800, 0.35), (np.inf, 0.37)],
+    'head_of_household': [(17000, 0.10), (64850, 0.12), (103350, 0.22), (197300, 0.24), (250500, 0.32),
+                          (626350, 0.35), (np.inf, 0.37)],
+}
+
+STANDARD_DEDUCTION = {
+    'single': 15750,
+    'married_jointly': 31500,
+    'married_separately': 15750,
+    'head_of_household': 23625,
+}
+
+CAPITAL_LOSS_LIMIT = {
+    'single': 3000,
+    'married_jointly': 3000,
+    'married_separately': 1500,
+    'head_of_household': 3000,
+}
+
+FILING_STATUS_LABELS = {
+    'single': 'Single',
+    'married_jointly': 'Married Filing Jointly',
+    'married_separately': 'Married Filing Separately',
+    'head_of_household': 'Head of Household',
+}
+
+# Georgia flat income tax rate
+GA_RATE = 0.0549
+
+
+def bracket_arrays(filing_statuses):
+    """
+    Stack bracket tables for several filing statuses
+
+    Returns:
+        (lower bounds, upper bounds, rates), each shaped (statuses, brackets)
+    """
+    upper = np.array([[bound for bound, _ in FEDERAL_BRACKETS[s]] for s in filing_statuses], dtype=float)
+    rates = np.array([[rate for _, rate in FEDERAL_BRACKETS[s]] for s in filing_statuses], dtype=float)
+    lower = np.concatenate([np.zeros((len(filing_statuses), 1)), upper[:, :-1]], axis=1)
+    return lower, upper, rates
+
+
+def federal_income_tax(taxable_income, lower, upper, rates):
+    """
+    Progressive federal tax on taxable income
+
+    Args:
+        taxable_income: Array shaped (statuses, ...)
+        lower, upper, rates: From bracket_arrays, shaped (statuses, brackets)
+
+    Returns:
+        Tax array shaped like taxable_income
+    """
+    income = np.maximum(taxable_income, 0)[..., np.newaxis]
+    extra_dims = (np.newaxis,) * (income.ndim - 2)
+    index = (slice(None),) + extra_dims
+    lower, upper, rates = lower[index], upper[index], rates[index]
+    in_bracket = np.clip(income - lower, 0, upper - lower)
+    return (in_bracket * rates).sum(axis=-1)
+
+
+def trading_tax_grid(filing_statuses, w2_incomes, trading_incomes):
+    """
+    Tax attributable to trading income for every scenario combination
+
+    Args:
+        filing_statuses: Filing status keys (S)
+        w2_incomes: Household W-2 incomes (W)
+        trading_incomes: Net trading income for the year, may be negative (T)
+
+    Returns:
+        dict of arrays shaped (S, W, T): 'federal', 'state', 'total' and 'effective_rate'
+        (total / trading income, 0 where trading income is 0)
+    """
+    filing_statuses = list(filing_statuses)
+    w2 = np.asarray(w2_incomes, dtype=float)[np.newaxis, :, np.newaxis]
+    trading = np.asarray(trading_incomes, dtype=float)[np.newaxis, np.newaxis, :]
+
+    deduction = np.array([STANDARD_DEDUCTION[s] for s in filing_statuses], dtype=float)[:, None, None]
+    loss_limit = np.array([CAPITAL_LOSS_LIMIT[s] for s in filing_statuses], dtype=float)[:, None, None]
+    lower, upper, rates = bracket_arrays(filing_statuses)
+
+    # Losses only offset ordinary income up to the capital loss limit
+    trading_adjustment = np.maximum(trading, -loss_limit)
+
+    base_taxable = np.broadcast_to(w2 - deduction, (len(filing_statuses), w2.shape[1], 1))
+    with_trading = base_taxable + trading_adjustment
+
+    federal = (federal_income_tax(with_trading, lower, upper, rates)
+               - federal_income_tax(base_taxable, lower, upper, rates))
+    state = GA_RATE * (np.maximum(with_trading, 0) - np.maximum(base_taxable, 0))
+    total = federal + state
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        effective_rate = np.where(trading != 0, total / trading, 0.0)
+
+    return {'federal': federal, 'state': state, 'total': total, 'effective_rate': effective_rate}
+
+
+def normalize_filing_status(filing_status):
+    """Fall back to married filing jointly for unknown or missing statuses"""
+    return filing_status if filing_status in FEDERAL_BRACKETS else 'married_jointly'
+
+
+def household_w2_income(settings, filing_status=None):
+    """W-2 income that trading income stacks on top of for a filing status"""
+    filing_status = filing_status or normalize_filing_status(settings['filing_status'])
+    if filing_status == 'married_jointly':
+        return (settings['user_income'] or 0) + (settings['spouse_income'] or 0)
+    # Filing alone: only the trader's (spouse's) own wages
+    return settings['spouse_income'] or 0
+
+
+def tax_on_trading(settings, trading_income, probe=1000):
+    """
+    Federal and Georgia tax on one year's trading income for the saved tax settings
+
+    Args:
+        settings: Result of TradingDatabase.get_tax_settings
+        trading_income: Net trading income for the year
+        probe: Extra income used to quote the marginal rates when there is no profit
+
+    Returns:
+        dict with federal, state, total (negative = loss deduction savings) and
+        federal_rate / state_rate (0-1, effective on the profit, or marginal)
+    """
+    filing_status = normalize_filing_status(settings['filing_status'])
+    grid = trading_tax_grid([filing_status], [household_w2_income(settings, filing_status)],
+                            [trading_income, probe])
+
+    federal = float(grid['federal'][0, 0, 0])
+    state = float(grid['state'][0, 0, 0])
+    rate_column = 0 if trading_income > 0 else 1
+    rate_base = trading_income if trading_income > 0 else probe
+    return {
+        'federal': federal,
+        'state': state,
+        'total': federal + state,
+        'federal_rate': float(grid['federal'][0, 0, rate_column]) / rate_base,
+        'state_rate': float(grid['state'][0, 0, rate_column]) / rate_base,
+    }
@@ -0,0 +1,297 @@
+"""
+Columnar in-memory trade store
+Keeps the trade columns the dashboard aggregates need as NumPy arrays, one store per
+database file shared by every TradingDatabase in the process:
+
+    id            int32
+    day           int32    days since 1970-01-01
+    ticker        int32    code into the tickers dictionary
+    sector        int32    code into the sectors dictionary
+    day_of_week   int8     code into the weekdays dictionary (Monday..Friday are 0..4)
+    entry_minutes int16    minutes since midnight
+    entry_price   float32
+    profit_loss   float64
+    is_win        int8
+
+The store loads on first use and TradingDatabase.add_trade appends to it, so the
+streak, hourly, price band, day-of-week and stats aggregates run on arrays without
+parsing SQL or building DataFrames. Each read checks the trades counter in
+data_versions; any change the store did not see itself (edits, deletes, other
+processes) triggers a reload.
+
+Selected with ANALYTICS_ENGINE = 'columnar' (the default, see analytics_engine.py).
+"""
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+from analytics_engine import PRICE_BANDS, WEEKDAYS
+
+STORE_COLUMNS = {
+    'id': np.int32,
+    'day': np.int32,
+    'ticker': np.int32,
+    'sector': np.int32,
+    'day_of_week': np.int8,
+    'entry_minutes': np.int16,
+    'entry_price': np.float32,
+    'profit_loss': np.float64,
+    'is_win': np.int8,
+}
+
+INITIAL_CAPACITY = 1024
+
+# Upper bounds of PRICE_BANDS (the last band is open-ended)
+PRICE_BAND_BOUNDS = np.array([upper for upper, _ in PRICE_BANDS if upper is not None], dtype=np.float32)
+
+# db path -> TradeStore
+stores = {}
+stores_lock = threading.Lock()
+
+
+def get_trade_store(db_name):
+    """The process-wide store for a database file"""
+    path = os.path.abspath(db_name)
+    with stores_lock:
+        store = stores.get(path)
+        if store is None:
+            store = stores[path] = TradeStore(db_name)
+        return store
+
+
+def entry_minutes(time_str):
+    """'H:MM' or 'HH:MM' -> minutes since midnight"""
+    parts = (time_str or '0').split(':')
+    return int(parts[0]) * 60 + (int(parts[1]) if len(parts) > 1 and parts[1] else 0)
+
+
+def to_day(date_str):
+    return int(np.datetime64(date_str, 'D').astype(np.int64))
+
+
+class Dictionary:
+    """Dictionary encoding for a string column (initial values get codes 0, 1, ... in order)"""
+
+    def __init__(self, initial=()):
+        self.values = []
+        self.codes = {}
+        for value in initial:
+            self.encode(value)
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode_all(self, values):
+        return np.fromiter((self.encode(v) for v in values), dtype=np.int32, count=len(values))
+
+
+def run_lengths(flags):
+    """(run of True ending at the last value, longest run of True) for a boolean array"""
+    if not len(flags):
+        return 0, 0
+    # Boundaries of the runs of True values: starts at even, ends at odd positions
+    padded = np.concatenate(([False], flags, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    runs = edges[1::2] - edges[::2]
+    best = int(runs.max()) if len(runs) else 0
+    current = int(runs[-1]) if len(runs) and flags[-1] else 0
+    return current, best
+
+
+class TradeStore:
+    """Trade columns as NumPy arrays, kept in sync with the trades table"""
+
+    def __init__(self, db_name):
+        self.db_name = db_name
+        self.lock = threading.Lock()
+        self.conn = None
+        self.conn_pid = None
+        self.version = None
+        self.size = 0
+        self.ordered = True
+        self.arrays = {name: np.empty(0, dtype) for name, dtype in STORE_COLUMNS.items()}
+        self.tickers = Dictionary()
+        self.sectors = Dictionary()
+        self.weekdays = Dictionary(WEEKDAYS)
+
+    def get_connection(self):
+        """Connection kept open for the version checks (only used under self.lock; reopened after a fork)"""
+        if self.conn is None or self.conn_pid != os.getpid():
+            self.conn = sqlite3.connect(self.db_name, check_same_thread=False)
+            self.conn_pid = os.getpid()
+        return self.conn
+
+    def trades_version(self):
+        row = self.get_connection().execute("SELECT version FROM data_versions WHERE name = 'trades'").fetchone()
+        return row[0] if row else 0
+
+    def load(self):
+        """Read the trade columns from SQLite (ordered by date, id)"""
+        conn = self.get_connection()
+        # Version and rows from one read transaction, so a concurrent write is seen by the next check
+        conn.execute('BEGIN')
+        try:
+            version = self.trades_version()
+            rows = conn.execute('''
+                                SELECT id, date, ticker, sector, day_of_week, entry_time, entry_price, profit_loss,
+                                       is_win
+                                FROM trades
+                                ORDER BY date, id
+                                ''').fetchall()
+        finally:
+            conn.rollback()
+
+        n = len(rows)
+        ids, dates, tickers, sectors, weekdays, times, prices, pnls, wins = zip(*rows) if rows else ([],) * 9
+        self.tickers = Dictionary()
+        self.sectors = Dictionary()
+        self.weekdays = Dictionary(WEEKDAYS)
+        capacity = max(INITIAL_CAPACITY, n * 2)
+        self.arrays = {name: np.zeros(capacity, dtype) for name, dtype in STORE_COLUMNS.items()}
+        self.arrays['id'][:n] = ids
+        self.arrays['day'][:n] = np.array(dates, dtype='datetime64[D]').astype(np.int32)
+        self.arrays['ticker'][:n] = self.tickers.encode_all(tickers)
+        self.arrays['sector'][:n] = self.sectors.encode_all(sectors)
+        self.arrays['day_of_week'][:n] = self.weekdays.encode_all(weekdays)
+        self.arrays['entry_minutes'][:n] = [entry_minutes(t) for t in times]
+        self.arrays['entry_price'][:n] = np.array(prices, dtype=float)
+        self.arrays['profit_loss'][:n] = np.array(pnls, dtype=float)
+        self.arrays['is_win'][:n] = np.nan_to_num(np.array(wins, dtype=float), nan=-1)
+        self.size = n
+        self.ordered = True
+        self.version = version
+
+    def invalidate(self):
+        """Drop the loaded columns' version so the next read reloads them from SQLite"""
+        with self.lock:
+            self.version = None
+
+    def append_trade(self, trade_id, trade):
+        """
+        Add a trade just inserted by TradingDatabase.add_trade
+
+        Args:
+            trade_id: Row id of the new trade
+            trade: dict with date, ticker, sector, day_of_week, entry_time, entry_price, profit_loss, is_win
+        """
+        with self.lock:
+            if self.version is None:
+                return
+            # Anything else written since the last sync means the arrays are stale: reload on next read
+            if self.trades_version() != self.version + 1:
+                self.version = None
+                return
+
+            if self.size == len(self.arrays['id']):
+                self.arrays = {name: np.concatenate([array, np.zeros(len(array), array.dtype)])
+                               for name, array in self.arrays.items()}
+            i = self.size
+            day = to_day(trade['date'])
+            self.arrays['id'][i] = trade_id
+            self.arrays['day'][i] = day
+            self.arrays['ticker'][i] = self.tickers.encode(trade['ticker'])
+            self.arrays['sector'][i] = self.sectors.encode(trade.get('sector'))
+            self.arrays['day_of_week'][i] = self.weekdays.encode(trade.get('day_of_week'))
+            self.arrays['entry_minutes'][i] = entry_minutes(trade['entry_time'])
+            self.arrays['entry_price'][i] = trade['entry_price']
+            self.arrays['profit_loss'][i] = trade['profit_loss']
+            self.arrays['is_win'][i] = trade['is_win']
+            self.ordered = self.ordered and (i == 0 or day >= self.arrays['day'][i - 1])
+            self.size += 1
+            self.version += 1
+
+    def columns(self):
+        """Current columns (views trimmed to the trade count), reloading or re-sorting first if needed"""
+        with self.lock:
+            if self.version is None or self.trades_version() != self.version:
+                self.load()
+            if not self.ordered:
+                # New arrays rather than sorting in place: earlier readers may still hold views
+                order = np.lexsort((self.arrays['id'][:self.size], self.arrays['day'][:self.size]))
+                self.arrays = {name: np.concatenate([array[:self.size][order], array[self.size:]])
+                               for name, array in self.arrays.items()}
+                self.ordered = True
+            return {name: array[:self.size] for name, array in self.arrays.items()}
+
+    def get_stats(self):
+        """Same result as TradingDatabase.get_stats"""
+        cols = self.columns()
+        pnl = cols['profit_loss']
+        if not len(pnl):
+            return None
+        win_mask = cols['is_win'] == 1
+        loss_mask = cols['is_win'] == 0
+        wins, losses = int(win_mask.sum()), int(loss_mask.sum())
+
+        return {
+            'total_trades': len(pnl),
+            'wins': wins,
+            'losses': losses,
+            'win_rate': (wins / len(pnl)) * 100,
+            'total_profit': float(np.nansum(pnl)),
+            'avg_win': float(np.nanmean(pnl[win_mask])) if wins > 0 else 0,
+            'avg_loss': float(np.nanmean(pnl[loss_mask])) if losses > 0 else 0,
+            'best_trade': float(np.nanmax(pnl)),
+            'worst_trade': float(np.nanmin(pnl))
+        }
+
+    def get_streak(self):
+        """Same result as TradingDatabase.get_streak"""
+        cols = self.columns()
+        day, pnl = cols['day'], cols['profit_loss']
+        if not len(day):
+            return {'net_positive_current': 0, 'net_positive_best': 0, 'zero_loss_current': 0, 'zero_loss_best': 0}
+
+        # Trades are ordered by day, so each day is one contiguous segment
+        starts = np.flatnonzero(np.concatenate(([True], day[1:] != day[:-1])))
+        daily_totals = np.add.reduceat(np.nan_to_num(pnl), starts)
+        daily_all_wins = np.logical_and.reduceat(pnl > 0, starts)
+
+        net_positive_current, net_positive_best = run_lengths(daily_totals > 0)
+        zero_loss_current, zero_loss_best = run_lengths(daily_all_wins)
+        return {
+            'net_positive_current': net_positive_current,
+            'net_positive_best': net_positive_best,
+            'zero_loss_current': zero_loss_current,
+            'zero_loss_best': zero_loss_best
+        }
+
+    def get_hourly_performance(self):
+        """Same result as TradingDatabase.get_hourly_performance"""
+        cols = self.columns()
+        minutes = cols['entry_minutes'].astype(np.int32)
+        if not len(minutes):
+            return []
+        # Round down to the 15-minute interval within the hour
+        slots = minutes // 60 * 60 + minutes % 60 // 15 * 15
+        values, inverse = np.unique(slots, return_inverse=True)
+        totals = np.bincount(inverse, weights=np.nan_to_num(cols['profit_loss']), minlength=len(values))
+        return [{'time': f"{v // 60:02d}:{v % 60:02d}", 'time_value': int(v), 'pnl': float(pnl)}
+                for v, pnl in zip(values, totals)]
+
+    def get_profits_by_price(self):
+        """Same result as TradingDatabase.get_profits_by_price"""
+        cols = self.columns()
+        if not len(cols['entry_price']):
+            return []
+        bands = np.searchsorted(PRICE_BAND_BOUNDS, cols['entry_price'], side='right')
+        totals = np.bincount(bands, weights=np.nan_to_num(cols['profit_loss']), minlength=len(PRICE_BANDS))
+        counts = np.bincount(bands, minlength=len(PRICE_BANDS))
+        return [{'price_band': label, 'pnl': float(totals[i])}
+                for i, (_, label) in enumerate(PRICE_BANDS) if counts[i]]
+
+    def get_win_rate_by_day(self):
+        """Same result as TradingDatabase.get_win_rate_by_day"""
+        cols = self.columns()
+        # Grouped on the stored day_of_week, like the SQL engines; WEEKDAYS are always codes 0..4
+        weekday = cols['day_of_week']
+        counts = np.bincount(weekday, minlength=len(WEEKDAYS))
+        wins = np.bincount(weekday, weights=cols['is_win'] == 1, minlength=len(WEEKDAYS))
+        return [{'day': name, 'win_rate': float(wins[i] / counts[i] * 100), 'trades': int(counts[i])}
+                for i, name in enumerate(WEEKDAYS) if counts[i]]
@@ -0,0 +1,114 @@
+"""
+Wash sale engine
+Matches losing trades against repurchases of the same ticker within 30 days, the way
+repeated day trades of the same small cap trigger the wash sale rule.
+
+Each ticker's trades are walked once in date order. The repurchase window of a loss is
+found with bisect on the sorted dates and replacement shares are consumed with a single
+forward pointer, so the whole pass is O(n log n) rather than comparing every pair.
+
+Every trade is a closed round trip, so the positions opened in the 30 days *before* a
+loss were already sold by then and cannot carry the basis adjustment; replacements are
+the positions opened after the losing one, up to 30 days after its sale.
+"""
+from bisect import bisect_right
+from datetime import date as date_cls
+
+WASH_SALE_DAYS = 30
+
+
+def time_sort_key(time_str):
+    """Minutes since midnight for 'HH:MM', 0 when missing or malformed"""
+    try:
+        hours, minutes = str(time_str).split(':')[:2]
+        return int(hours) * 60 + int(minutes)
+    except (ValueError, TypeError):
+        return 0
+
+
+def match_ticker(trades):
+    """
+    Find the wash sales within one ticker's trades
+
+    Args:
+        trades: [(id, date ordinal, shares, profit_loss), ...] sorted in trade order
+
+    Returns:
+        List of (loss index, replacement index, shares, disallowed loss) tuples
+    """
+    ordinals = [t[1] for t in trades]
+    remaining = [t[2] or 0 for t in trades]
+    basis_in = [0.0] * len(trades)
+    matches = []
+
+    pointer = 0
+    for i, (_, ordinal, shares, profit_loss) in enumerate(trades):
+        # Losses carried in from earlier wash sales can make this sale a loss too
+        loss = -((profit_loss or 0) - basis_in[i])
+        if loss <= 0:
+            continue
+
+        end = bisect_right(ordinals, ordinal + WASH_SALE_DAYS)
+        j = max(pointer, i + 1)
+        unmatched = shares or 0
+        while j < end:
+            if remaining[j] <= 0:
+                j += 1
+                continue
+
+            if shares:
+                matched = min(remaining[j], unmatched)
+                disallowed = loss * matched / shares
+            else:
+                # No share count recorded: the whole loss moves to the next purchase
+                matched, disallowed = remaining[j], loss
+
+            matches.append((i, j, matched, disallowed))
+            basis_in[j] += disallowed
+            remaining[j] -= matched
+            unmatched -= matched
+            if remaining[j] <= 0:
+                j += 1
+            if unmatched <= 0:
+                break
+        pointer = j
+
+    return matches
+
+
+def find_wash_sales(trades):
+    """
+    Find wash sales across all trades
+
+    Args:
+        trades: Iterable of (id, ticker, date 'YYYY-MM-DD', entry_time, shares, profit_loss)
+
+    Returns:
+        List of dicts with loss_trade_id, replacement_trade_id, ticker, loss_date,
+        replacement_date, shares, disallowed_loss and basis_adjustment (per share)
+    """
+    by_ticker = {}
+    for trade_id, ticker, trade_date, entry_time, shares, profit_loss in trades:
+        try:
+            ordinal = date_cls.fromisoformat(trade_date).toordinal()
+        except (TypeError, ValueError):
+            continue
+        by_ticker.setdefault((ticker or '').upper(), []).append(
+            (ordinal, time_sort_key(entry_time), trade_id, trade_date, shares, profit_loss))
+
+    wash_sales = []
+    for ticker, rows in by_ticker.items():
+        rows.sort()
+        matches = match_ticker([(row[2], row[0], row[4], row[5]) for row in rows])
+        for loss_index, replacement_index, shares, disallowed in matches:
+            wash_sales.append({
+                'loss_trade_id': rows[loss_index][2],
+                'replacement_trade_id': rows[replacement_index][2],
+                'ticker': ticker,
+                'loss_date': rows[loss_index][3],
+                'replacement_date': rows[replacement_index][3],
+                'shares': shares,
+                'disallowed_loss': disallowed,
+                'basis_adjustment': disallowed / shares if shares else disallowed,
+            })
+    return wash_sales
@@ -0,0 +1,245 @@
+"""
+Single-writer queue
+SQLite allows one writer at a time. With every Dash thread writing through its own
+connection, concurrent writes wait on the lock and fail with "database is locked" once
+the busy timeout runs out - or at once, when a transaction that started by reading
+cannot upgrade to a write lock.
+
+TradingDatabase sends its writes through a WriteQueue instead: a caller submits a
+function of a connection and gets a Future, and one writer thread per process runs
+the queued functions on its own connection:
+
+    - everything queued when the writer picks up work runs in one BEGIN IMMEDIATE
+      transaction (up to MAX_BATCH operations), so the write lock is taken once, up
+      front, and a batch never fails half-way on a lock upgrade
+    - each operation runs inside a savepoint: one that raises is rolled back alone and
+      its caller gets the exception, the rest of the batch still commits
+    - one COMMIT covers the batch (a single fsync), and futures resolve after it, so a
+      caller that got its result can read its write from any connection
+
+Operations submitted with isolated=True (Maintenance console writes, which can be
+interrupted - and an interrupted write rolls back the whole transaction) run in a
+batch of their own: the writer commits what is pending before them and starts a new
+transaction after them.
+
+Operations must not commit or roll back themselves. The database is switched to WAL
+so readers never wait for the writer, and every connection waits up to the busy
+timeout for other processes (BUSY_TIMEOUT_MS in config.py or TRADING_BUSY_TIMEOUT_MS,
+default DEFAULT_BUSY_TIMEOUT_MS).
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+# Operations committed together at most
+MAX_BATCH = 100
+
+# BEGIN IMMEDIATE attempts (each waiting up to the busy timeout) before a batch fails
+LOCK_ATTEMPTS = 3
+LOCK_RETRY_DELAY = 0.05
+
+# How long run() waits for its write to commit before giving up
+WRITE_TIMEOUT_SECONDS = 60
+
+
+def get_configured_busy_timeout():
+    """Read the busy timeout (ms) from config.py or the environment"""
+    try:
+        from config import BUSY_TIMEOUT_MS
+    except ImportError:
+        BUSY_TIMEOUT_MS = None
+    return float(BUSY_TIMEOUT_MS or os.environ.get('TRADING_BUSY_TIMEOUT_MS') or DEFAULT_BUSY_TIMEOUT_MS)
+
+
+def is_lock_error(error):
+    return isinstance(error, sqlite3.OperationalError) and ('locked' in str(error) or 'busy' in str(error))
+
+
+class WriteQueue:
+    """Runs write operations for one database on a dedicated thread, committing them in batches"""
+
+    def __init__(self, db_name, tracer, busy_timeout_ms=None):
+        self.db_name = db_name
+        self.tracer = tracer
+        self.timeout = (get_configured_busy_timeout() if busy_timeout_ms is None else busy_timeout_ms) / 1000
+        self.lock = threading.Lock()
+        self.queue = None
+        self.thread = None
+        self.pid = None
+        self.conn = None
+        self.held = None
+        self.batches = 0
+        self.operations = 0
+        self.failures = 0
+        self.max_batch = 0
+
+        conn = sqlite3.connect(db_name, timeout=self.timeout)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+        finally:
+            conn.close()
+
+    def start(self):
+        """Start the writer thread, again in a forked worker (threads do not survive fork) or if it died"""
+        with self.lock:
+            if self.pid == os.getpid() and self.thread.is_alive():
+                return
+            if self.pid != os.getpid():
+                self.queue = queue.Queue()
+                self.held = None
+            self.conn = None
+            self.thread = threading.Thread(target=self.work, name='sqlite-writer', daemon=True)
+            self.thread.start()
+            self.pid = os.getpid()
+
+    def submit(self, operation, isolated=False):
+        """
+        Queue a write
+
+        Args:
+            operation: Function taking the writer's connection; its return value is the result
+            isolated: Commit it in a batch of its own
+
+        Returns:
+            Future resolved with the result (or the exception) once the batch has committed
+        """
+        if self.pid != os.getpid() or not self.thread.is_alive():
+            self.start()
+        future = Future()
+        self.queue.put((operation, future, isolated))
+        return future
+
+    def run(self, operation, isolated=False):
+        """
+        Queue a write and wait for it to commit; exceptions from the operation propagate
+
+        Raises sqlite3.OperationalError if it has not committed within WRITE_TIMEOUT_SECONDS.
+        """
+        if threading.current_thread() is self.thread:
+            # An operation writing through another TradingDatabase method joins its own batch
+            return self.apply(operation)
+        future = self.submit(operation, isolated)
+        try:
+            return future.result(timeout=WRITE_TIMEOUT_SECONDS)
+        except FutureTimeoutError:
+            # Drop it if still queued, so it does not run after the caller gave up (one already
+            # picked up by the writer may still commit)
+            future.cancel()
+            raise sqlite3.OperationalError(f"write not committed within {WRITE_TIMEOUT_SECONDS}s "
+                                           f"({self.depth()} writes queued)") from None
+
+    def depth(self):
+        return self.queue.qsize() if self.queue is not None and self.pid == os.getpid() else 0
+
+    def stats(self):
+        return {'batches': self.batches, 'operations': self.operations, 'failures': self.failures,
+                'max_batch': self.max_batch, 'queued': self.depth()}
+
+    def next_batch(self):
+        """Everything queued (up to MAX_BATCH), stopping before an isolated operation, which runs alone"""
+        item, self.held = self.held or self.queue.get(), None
+        batch = [item]
+        while not item[2] and len(batch) < MAX_BATCH:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[2]:
+                self.held = item
+                break
+            batch.append(item)
+        return [(operation, future) for operation, future, _ in batch if future.set_running_or_notify_cancel()]
+
+    def work(self):
+        while True:
+            batch = self.next_batch()
+            try:
+                if self.conn is None:
+                    self.conn = self.tracer.connect(self.db_name, timeout=self.timeout, isolation_level=None)
+                self.commit_batch(batch)
+                # The connection stays open, so record its statements and slow queries here
+                self.conn.flush()
+            except BaseException as e:
+                # Never leave callers waiting on a dead writer: fail the batch, reconnect for the next one
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                self.close_connection()
+
+    def close_connection(self):
+        """Drop the writer's connection (rolling back anything uncommitted); reopened for the next batch"""
+        conn, self.conn = self.conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def begin(self):
+        """BEGIN IMMEDIATE, retrying while another process holds the write lock past the busy timeout"""
+        for attempt in range(LOCK_ATTEMPTS):
+            try:
+                self.conn.execute('BEGIN IMMEDIATE')
+                return
+            except sqlite3.OperationalError as e:
+                if not is_lock_error(e) or attempt == LOCK_ATTEMPTS - 1:
+                    raise
+                time.sleep(LOCK_RETRY_DELAY * (attempt + 1))
+
+    def apply(self, operation):
+        """Run one operation inside a savepoint, rolling back only its own changes if it raises"""
+        self.conn.execute('SAVEPOINT operation')
+        try:
+            result = operation(self.conn)
+        except BaseException:
+            # Errors such as SQLITE_FULL end the whole transaction, taking the savepoint with it
+            if self.conn.in_transaction:
+                self.conn.execute('ROLLBACK TO operation')
+                self.conn.execute('RELEASE operation')
+            raise
+        self.conn.execute('RELEASE operation')
+        return result
+
+    def commit_batch(self, batch):
+        if not batch:
+            return
+        outcomes = []
+        try:
+            for operation, future in batch:
+                if not self.conn.in_transaction:
+                    self.begin()
+                try:
+                    outcomes.append((future, self.apply(operation), None))
+                except Exception as e:
+                    if not self.conn.in_transaction:
+                        # The error rolled back the whole transaction, earlier operations included
+                        raise
+                    outcomes.append((future, None, e))
+            if self.conn.in_transaction:
+                self.conn.execute('COMMIT')
+        except Exception as e:
+            # Lock timeout, failed commit or lost transaction: nothing in the batch was written
+            try:
+                if self.conn.in_transaction:
+                    self.conn.execute('ROLLBACK')
+            except sqlite3.Error:
+                pass
+            self.failures += len(batch)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.operations += len(batch)
+        self.max_batch = max(self.max_batch, len(batch))
+        for future, result, error in outcomes:
+            if error is not None:
+                self.failures += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
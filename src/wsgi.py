@@ -0,0 +1,13 @@
+"""
+WSGI entry point for production servers
+Each worker process imports this module and gets its own app and database handle.
+With several workers, turn on the shared result cache (SHARED_CACHE = True in
+config.py or TRADING_SHARED_CACHE=1) so aggregates are computed once, not per worker.
+
+    gunicorn --chdir src --workers 4 --threads 4 --bind 0.0.0.0:8050 wsgi:server
+    waitress-serve --threads 8 --listen 0.0.0.0:8050 wsgi:server   (from src/)
+"""
+from app import create_app
+
+app = create_app()
+server = app.server
@@ -0,0 +1,95 @@
+"""
+Shared fixtures for the performance regression tests (test_performance.py)
+
+Synthetic databases are generated once per scale and session (synthetic_data.py, fixed
+seed and end date), and every measurement is collected so --update-perf-baseline can
+write them out in the same format as benchmarks.py --output.
+"""
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from benchmarks import REGRESSION_TOLERANCE, environment, load_baseline, write_baseline  # noqa: E402
+from synthetic_data import DEFAULT_END_DATE, DEFAULT_SEED, parse_scale, populate_database  # noqa: E402
+
+DEFAULT_PERF_SCALES = '1k,10k'
+DEFAULT_PERF_REPEAT = 5
+DEFAULT_PERF_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perf_baseline.json')
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('perf', 'performance regression tests')
+    group.addoption('--perf-scales', default=DEFAULT_PERF_SCALES,
+                    help='Comma-separated synthetic database scales (default: %(default)s)')
+    group.addoption('--perf-repeat', type=int, default=DEFAULT_PERF_REPEAT,
+                    help='Timed repeats per operation (default: %(default)s)')
+    group.addoption('--perf-baseline', default=DEFAULT_PERF_BASELINE,
+                    help='Baseline JSON to compare against (default: tests/perf_baseline.json)')
+    group.addoption('--perf-tolerance', type=float, default=REGRESSION_TOLERANCE,
+                    help='Allowed slowdown / allocation growth over the baseline as a fraction (default: %(default)s)')
+    group.addoption('--update-perf-baseline', action='store_true',
+                    help='Write this run\'s measurements to the baseline instead of comparing')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'perf: performance regression test (seeds synthetic databases)')
+
+
+def pytest_generate_tests(metafunc):
+    if 'scale' in metafunc.fixturenames:
+        scales = [s.strip() for s in metafunc.config.getoption('--perf-scales').split(',') if s.strip()]
+        metafunc.parametrize('scale', scales)
+
+
+@pytest.fixture(scope='session')
+def perf_workdir(tmp_path_factory):
+    return str(tmp_path_factory.mktemp('perf'))
+
+
+@pytest.fixture(scope='session')
+def perf_databases():
+    """scale -> TradingDatabase, so each scale is generated once however tests are ordered"""
+    return {}
+
+
+@pytest.fixture
+def perf_db(scale, perf_workdir, perf_databases):
+    """TradingDatabase over a synthetic history of the given scale"""
+    from database import TradingDatabase
+
+    if scale not in perf_databases:
+        db_name = os.path.join(perf_workdir, f'synthetic_{scale}.db')
+        populate_database(db_name, parse_scale(scale), DEFAULT_SEED, DEFAULT_END_DATE)
+        perf_databases[scale] = TradingDatabase(db_name, shared_cache=False)
+    return perf_databases[scale]
+
+
+@pytest.fixture(scope='session')
+def perf_baseline(request):
+    """Stored baseline, or None when there is none yet (or it is being rewritten)"""
+    path = request.config.getoption('--perf-baseline')
+    if request.config.getoption('--update-perf-baseline') or not os.path.exists(path):
+        return None
+    return load_baseline(path)
+
+
+@pytest.fixture(scope='session')
+def perf_results(request):
+    """Measurements of this session as {scale: {'trades', 'benchmarks': {name: timings}}}"""
+    scales = {}
+    yield scales
+
+    if request.config.getoption('--update-perf-baseline') and scales:
+        path = request.config.getoption('--perf-baseline')
+        write_baseline({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'seed': DEFAULT_SEED,
+            'end_date': DEFAULT_END_DATE,
+            'repeat': request.config.getoption('--perf-repeat'),
+            'environment': environment(),
+            'scales': scales,
+        }, path)
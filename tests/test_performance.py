@@ -0,0 +1,136 @@
+"""
+Performance regression tests
+
+Seeds an on-disk database per scale and, for each operation below, asserts:
+
+    - an absolute budget: cold median time (caches cleared) and peak allocation
+      (tracemalloc) under BUDGETS[operation][scale], which catches full-table scans and
+      quadratic loops even without a baseline
+    - no regression against the stored baseline beyond --perf-tolerance, when one exists
+
+test_concurrent_writes checks that writes from many threads all commit through the
+writer queue (write_queue.py) in batches, without "database is locked" errors.
+
+Run with:
+    python -m pytest tests -m perf
+    python -m pytest tests -m perf --perf-scales 1k,10k,100k
+    python -m pytest tests -m perf --update-perf-baseline   # after an intended change
+
+Timings are machine dependent: record the baseline on the machine that compares against it.
+"""
+import threading
+import time
+
+import pytest
+
+from benchmarks import REGRESSION_MIN_KB, compare_results, render_benchmarks, serialized, time_benchmark
+from synthetic_data import DEFAULT_END_DATE
+
+YEAR, MONTH = int(DEFAULT_END_DATE[:4]), int(DEFAULT_END_DATE[5:7])
+
+DB_OPERATIONS = {
+    'get_streak': lambda db: db.get_streak(),
+    'get_monthly_calendar': lambda db: db.get_monthly_calendar(YEAR, MONTH),
+    'calculate_taxes_simple': lambda db: db.calculate_taxes_simple(YEAR),
+    'get_stats': lambda db: db.get_stats(),
+    'get_hourly_performance': lambda db: db.get_hourly_performance(),
+    'get_profits_by_price': lambda db: db.get_profits_by_price(),
+}
+
+# Slowdowns smaller than this never fail against the baseline (scheduler noise on short calls)
+PERF_MIN_MS = 5.0
+
+# Concurrent writers for test_concurrent_writes: threads x writes each, and the wall-clock budget (s)
+WRITE_THREADS = 16
+WRITES_PER_THREAD = 50
+WRITE_BUDGET_SECONDS = 5
+
+UI_OPERATIONS = ('render_dashboard', 'render_calendar', 'render_hourly_chart', 'render_profits_by_price')
+
+# operation -> {scale: (cold ms, peak KB)}; roughly 5x today's numbers so that only
+# complexity changes, not machine noise, break them
+BUDGETS = {
+    'get_streak': {'1k': (150, 2_048), '10k': (1_500, 16_384), '100k': (15_000, 131_072)},
+    'get_monthly_calendar': {'1k': (50, 1_024), '10k': (100, 1_024), '100k': (500, 4_096)},
+    'calculate_taxes_simple': {'1k': (100, 1_024), '10k': (500, 2_048), '100k': (5_000, 16_384)},
+    'get_stats': {'1k': (150, 16_384), '10k': (1_000, 131_072), '100k': (10_000, 1_048_576)},
+    'get_hourly_performance': {'1k': (300, 2_048), '10k': (3_000, 16_384), '100k': (30_000, 131_072)},
+    'get_profits_by_price': {'1k': (100, 2_048), '10k': (250, 16_384), '100k': (2_500, 131_072)},
+    'render_dashboard': {'1k': (2_000, 65_536), '10k': (8_000, 262_144), '100k': (60_000, 2_097_152)},
+    'render_calendar': {'1k': (250, 8_192), '10k': (500, 16_384), '100k': (2_500, 65_536)},
+    'render_hourly_chart': {'1k': (500, 8_192), '10k': (4_000, 32_768), '100k': (40_000, 262_144)},
+    'render_profits_by_price': {'1k': (250, 8_192), '10k': (2_500, 32_768), '100k': (25_000, 262_144)},
+}
+
+
+def check_performance(request, name, scale, db, fn, perf_results, perf_baseline):
+    """Measure fn, record it for the baseline and assert its budget and the baseline"""
+    operation = name.split('.', 1)[1]
+    timings = time_benchmark(db, fn, request.config.getoption('--perf-repeat'))
+    run = perf_results.setdefault(scale, {'trades': db.get_stats()['total_trades'], 'benchmarks': {}})
+    run['benchmarks'][name] = timings
+
+    failures = []
+    budget = BUDGETS.get(operation, {}).get(scale)
+    if budget:
+        max_ms, max_kb = budget
+        if timings['cold_ms'] > max_ms:
+            failures.append(f"cold {timings['cold_ms']:,.1f} ms over the {max_ms:,} ms budget")
+        if timings['peak_kb'] > max_kb:
+            failures.append(f"peak {timings['peak_kb']:,.0f} KB over the {max_kb:,} KB budget")
+
+    if perf_baseline:
+        tolerance = request.config.getoption('--perf-tolerance')
+        current = {'scales': {scale: {'benchmarks': {name: timings}}}}
+        for key, unit, min_change in (('cold_ms', 'ms', PERF_MIN_MS), ('peak_kb', 'KB', REGRESSION_MIN_KB)):
+            for r in compare_results(perf_baseline, current, tolerance, min_change, key):
+                failures.append(f"{key} {r['baseline']:,.1f} -> {r['current']:,.1f} {unit} "
+                                f"(+{r['change']:.0%}, tolerance {tolerance:.0%})")
+
+    assert not failures, f"{name} [{scale}]: " + '; '.join(failures)
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize('operation', list(DB_OPERATIONS))
+def test_database_performance(request, operation, scale, perf_db, perf_results, perf_baseline):
+    check_performance(request, f'db.{operation}', scale, perf_db, lambda: DB_OPERATIONS[operation](perf_db),
+                      perf_results, perf_baseline)
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize('operation', UI_OPERATIONS)
+def test_render_performance(request, operation, scale, perf_db, perf_results, perf_baseline):
+    pytest.importorskip('dash')
+    render = render_benchmarks(perf_db)[operation]
+    check_performance(request, f'ui.{operation}', scale, perf_db, serialized(render), perf_results, perf_baseline)
+
+
+@pytest.mark.perf
+def test_concurrent_writes(tmp_path):
+    """Writes from many threads all commit through the writer queue, grouped into batches"""
+    from database import TradingDatabase
+
+    db = TradingDatabase(str(tmp_path / 'writes.db'), shared_cache=False)
+    errors = []
+
+    def write(thread):
+        try:
+            for i in range(WRITES_PER_THREAD):
+                db.add_log('TEST', 'TEST', f'write {thread}-{i}')
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(t,)) for t in range(WRITE_THREADS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    total = WRITE_THREADS * WRITES_PER_THREAD
+    stats = db.writer.stats()
+    assert not errors, errors[:3]
+    assert db.execute_query("SELECT COUNT(*) FROM logs WHERE action_type = 'TEST'")['rows'][0][0] == total
+    assert stats['operations'] == total and stats['batches'] < total
+    assert elapsed < WRITE_BUDGET_SECONDS, f"{total} writes took {elapsed:.1f} s"
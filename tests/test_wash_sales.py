@@ -0,0 +1,48 @@
+"""
+Wash sale totals in the tax breakdown
+
+A chain of wash sales carries the first loss's basis into every later link, so the
+year's disallowed loss must count those dollars once, not once per link.
+"""
+import sqlite3
+
+import pytest
+
+# (date, exit price) of 100-share ABC trades entered at $10
+CHAIN = [('2024-12-10', 9.0), ('2024-12-20', 9.5), ('2025-01-05', 10.1)]
+
+
+@pytest.fixture
+def chain_db(tmp_path):
+    """-$100, then -$50 (wash sale of the first), then +$10 in January (wash sale of the second)"""
+    from database import TradingDatabase
+
+    db_name = str(tmp_path / 'wash.db')
+    db = TradingDatabase(db_name, shared_cache=False)
+    conn = sqlite3.connect(db_name)
+    conn.executemany('''
+                     INSERT INTO trades (date, ticker, entry_price, entry_time, exit_price, exit_time, shares,
+                                         profit_loss, is_win)
+                     VALUES (?, 'ABC', 10.0, '09:30', ?, '09:45', 100, ?, ?)
+                     ''', [(date, price, round((price - 10.0) * 100, 2), int(price > 10.0)) for date, price in CHAIN])
+    conn.commit()
+    conn.close()
+    return db
+
+
+def test_wash_sale_chain(chain_db):
+    matches = sorted(chain_db.get_wash_sales(), key=lambda w: w['loss_date'])
+    assert [round(w['disallowed_loss'], 2) for w in matches] == [100.0, 150.0]
+
+    taxes_2024 = chain_db.calculate_taxes_simple(2024)
+    # $100 from the first loss plus the second trade's own $50, not 100 + 150
+    assert taxes_2024['wash_disallowed'] == pytest.approx(150.0)
+    assert taxes_2024['wash_deferred'] == pytest.approx(150.0)
+    assert taxes_2024['wash_count'] == 2
+    assert taxes_2024['total_losses'] == pytest.approx(0.0)
+
+    # The replacement carries the whole $150: its $10 gain becomes a $140 loss
+    taxes_2025 = chain_db.calculate_taxes_simple(2025)
+    assert taxes_2025['total_gains'] == pytest.approx(0.0)
+    assert taxes_2025['total_losses'] == pytest.approx(140.0)
+    assert taxes_2025['wash_count'] == 0